@@ -0,0 +1,111 @@
+from SolarSystem import *
+from StandInEngine import *
+import json
+import timeit
+
+
+class Benchmark(object):
+
+    """ Misst die Logik der Simulation ohne Fenster. Das Solarsystem wird mit einer StandInEngine aufgebaut, dadurch
+    wird nur die Logik gemessen und nicht das Rendern. Jede Messung ruft eine Funktion number Mal auf und wird
+    repeat Mal wiederholt, ausgegeben wird die schnellste Wiederholung in Mikrosekunden pro Aufruf.
+
+    :ivar StandInEngine engine: Ersatz fuer die Engine
+    :ivar SolarSystem system: das gemessene Solarsystem
+    :ivar int number: Anzahl der Aufrufe pro Wiederholung
+    :ivar int repeat: Anzahl der Wiederholungen
+    :ivar list benchmarks: Liste der Namen und Funktionen, die gemessen werden
+
+    """
+
+    def __init__(self, asteroidCount=0, number=1000, repeat=5):
+
+        """ Baut das Solarsystem auf und legt die Messungen fest
+
+        :param asteroidCount: die Anzahl der kuenstlichen Asteroiden im Asteroidenguertel
+        :param number: Anzahl der Aufrufe pro Wiederholung
+        :param repeat: Anzahl der Wiederholungen
+        """
+
+        self.engine = StandInEngine()
+        self.system = SolarSystem(self.engine, asteroidCount)
+        self.number = number
+        self.repeat = repeat
+
+        runtime = self.system.runtime
+        camera = self.system.camera
+        eventHandler = self.system.eventHandler
+        self.benchmarks = [
+            ("addLuminary", self.addLuminaries),
+            ("editSpeedPlaying", lambda: runtime.editSpeedPlaying(1)),
+            ("placeLuminaries", self.placeLuminaries),
+            ("checkArea", lambda: camera.checkArea(camera.size)),
+            ("togglePlaying", runtime.togglePlaying),
+            ("toggleTexture", eventHandler.toggleTexture),
+            ("toggleLight", eventHandler.toggleLight),
+            ("frame", self.engine.step),
+        ]
+
+    def addLuminaries(self):
+
+        """ Baut die gesamte Hierarchie der Himmelskoerper in einer neuen Runtime auf und entfernt sie wieder
+
+        """
+
+        root = self.engine.render.attachNewNode("benchmark")
+        runtime = RuntimeHandler(FloatingOrigin(), self.engine)
+        runtime.addLuminary(root, self.system.catalog.createLuminaries())
+        root.removeNode()
+
+    def placeLuminaries(self):
+
+        """ Schreitet die Zeit um einen Frame fort und setzt alle Himmelskoerper neu
+
+        """
+
+        runtime = self.system.runtime
+        runtime.setTime(runtime.time + self.engine.getDt())
+        runtime.placeLuminaries()
+
+    def run(self, names=None):
+
+        """ Fuehrt die Messungen aus
+
+        :param names: Namen der Messungen, ohne Angabe alle
+        :return: Dictionary mit Mikrosekunden pro Aufruf zu jedem Namen
+        """
+
+        results = {}
+        for name, function in self.benchmarks:
+            if names and name not in names:
+                continue
+            best = min(timeit.Timer(function).repeat(self.repeat, self.number))
+            results[name] = best / self.number * 1e6
+        return results
+
+
+def parseArguments(argv=None):
+
+    """ Liest die Kommandozeilenparameter ein
+
+    :param argv: Liste der Parameter, ohne Angabe werden jene des Programmaufrufs verwendet
+    :return: die eingelesenen Parameter
+    """
+
+    parser = argparse.ArgumentParser(description="Misst die Logik des Solarsystems ohne Fenster")
+    parser.add_argument("names", nargs="*", help="Namen der Messungen, ohne Angabe alle")
+    parser.add_argument("--asteroids", type=int, default=0, help="Anzahl der kuenstlichen Asteroiden")
+    parser.add_argument("--number", type=int, default=1000, help="Anzahl der Aufrufe pro Wiederholung")
+    parser.add_argument("--repeat", type=int, default=5, help="Anzahl der Wiederholungen")
+    parser.add_argument("--stats", help="Datei, in die die Ergebnisse als JSON geschrieben werden")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parseArguments()
+    results = json.dumps(Benchmark(args.asteroids, args.number, args.repeat).run(args.names), indent=2, sort_keys=True)
+    if args.stats:
+        with open(args.stats, "w") as output:
+            output.write(results + "\n")
+    else:
+        sys.stdout.write(results + "\n")
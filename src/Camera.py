@@ -8,7 +8,10 @@ class Camera(object):
 
     """ Ermoeglich die Bewegung im dreidimensionalen Raum
 
+    :ivar Engine engine: Dienste der Engine (Kamera, Linse, Fenster und Taskmanager)
     :ivar int size: Groesse des Weltraums
+    :ivar FloatingOrigin origin: Ursprung der dargestellten Szene, der mit der Kamera mitwandert
+    :ivar float speed: Strecke, um die sich die Kamera pro Sekunde bewegt
     :ivar Vec3 focus: Definiert die Position der Kamera
     :ivar int heading: Der aktuelle Drehwinkel
     :ivar int pitch: Der aktuelle Neigungswinkel
@@ -16,25 +19,49 @@ class Camera(object):
     :ivar int mousey: Die Position der Maus auf der y-Achse
     :ivar int lastTime: Gibt die Zeit an, wann die Methode controlCamera zuletzt ausgefuehrt wurde
     :ivar list mousebtn: Liste in der die getaetigten Tastendruecke festgehalten werden
+    :ivar boolean mouseLook: gibt an, ob die Kamera der Maus folgt
+    :ivar int zoomDelta: Summe der Zoomschritte, die im naechsten Frame ausgefuehrt werden
     :ivar int lastX: Letzte Position auf der x-Achse
     :ivar int lastY: Letzte Position auf der y-Achse
     :ivar int lastZ: Letzte Position auf der z-Achse
 
     """
 
-    def __init__(self, render, size):
+    #: Namen der Bewegungen in der Reihenfolge der Eintraege von mousebtn
+    MOVES = ["forward", "backward", "left", "right", "up", "down"]
+
+    #: Strecke, um die sich die Kamera pro Zoomschritt bewegt
+    ZOOM_STEP = 2
+
+    #: Geschwindigkeit der Kamera pro Einheit der Groesse des Weltraums, bei Groesse 80 also 30 pro Sekunde
+    SPEED = 30 / 80.0
+
+    #: Naechste und weiteste Entfernung, die dargestellt wird. Die Tiefe wird im Shader logarithmisch gespeichert,
+    #: deshalb reicht die Genauigkeit von Monden bis zu den aeussersten Planeten
+    NEAR = 0.01
+    FAR = 1e7
+
+    def __init__(self, engine, size, origin):
 
 
         """ Definiert die Mouseposition und den Startpunkt der Kamera
 
-        :param render: Gesamte Umgebung des Raumes
+        :param engine: Dienste der Engine
         :param size: Groesse des Weltraums
+        :param origin: Ursprung der dargestellten Szene
         """
 
 
-        base.win.movePointer(0, 0, 0)
-        base.disableMouse()
+        self.engine = engine
+        # Offscreen-Puffer (z.B. im Headless-Modus) besitzen keinen Mauszeiger
+        self.mouseLook = hasattr(self.engine.win, "movePointer")
+        if self.mouseLook:
+            self.engine.win.movePointer(0, 0, 0)
+        self.engine.disableMouse()
         self.size = size
+        self.origin = origin
+        self.origin.addListener(self.shiftOrigin)
+        self.speed = self.SPEED * size
         self.focus = Vec3(-14, -31, 10)
         self.heading = -45
         self.pitch = -35
@@ -42,15 +69,17 @@ class Camera(object):
         self.mousey = 0
         self.lastTime = 0
         self.mousebtn = [0, 0, 0, 0, 0, 0]
+        self.zoomDelta = 0
         self.lastX = -14
         self.lastY = -31
         self.lastZ = 10
         # base.camera.setPos(-14, -31, 10)
-        base.camera.reparentTo(render)
-        base.camera.setHpr(0, 0, 0)
+        self.engine.camera.reparentTo(self.engine.render)
+        self.engine.camera.setHpr(0, 0, 0)
+        self.engine.camLens.setNearFar(self.NEAR, self.FAR)
         WindowProperties().setCursorHidden(True)
 
-        taskMgr.add(self.controlCamera, "camera-task")
+        self.engine.taskMgr.add(self.controlCamera, "camera-task")
 
     def controlCamera(self, task):
 
@@ -60,38 +89,43 @@ class Camera(object):
         :param task: Gibt an, welche Funktion diese Methode uebernehmen soll
         """
 
-        md = base.win.getPointer(0)
-        x = md.getX()
-        y = md.getY()
-        if base.win.movePointer(0, 100, 100):
-            self.heading = self.heading - (x - 100) * 0.2
-            self.pitch = self.pitch - (y - 100) * 0.2
+        if self.mouseLook:
+            md = self.engine.win.getPointer(0)
+            x = md.getX()
+            y = md.getY()
+            if self.engine.win.movePointer(0, 100, 100):
+                self.heading = self.heading - (x - 100) * 0.2
+                self.pitch = self.pitch - (y - 100) * 0.2
         if (self.pitch < -90): self.pitch = -90
         if (self.pitch > 90): self.pitch = 90
-        base.camera.setHpr(self.heading, self.pitch, 0)
-        dir = base.camera.getMat().getRow3(1)
+        self.engine.camera.setHpr(self.heading, self.pitch, 0)
+        dir = self.engine.camera.getMat().getRow3(1)
         elapsed = task.time - self.lastTime
         if (self.lastTime == 0): elapsed = 0
 
         if (self.mousebtn[0]):
-            self.focus = self.focus + dir * elapsed * 30
+            self.focus = self.focus + dir * elapsed * self.speed
         if self.mousebtn[1]:
-            self.focus = self.focus - dir * elapsed * 30
+            self.focus = self.focus - dir * elapsed * self.speed
+        if self.zoomDelta:
+            self.focus = self.focus + dir * self.zoomDelta * self.ZOOM_STEP
+            self.zoomDelta = 0
 
-        base.camera.setPos(self.focus - (dir * 5))
+        self.engine.camera.setPos(self.focus - (dir * 5))
 
         if self.mousebtn[2]:
-            base.camera.setX(base.camera, -elapsed * 30)
+            self.engine.camera.setX(self.engine.camera, -elapsed * self.speed)
         if self.mousebtn[3]:
-            base.camera.setX(base.camera, elapsed * 30)
+            self.engine.camera.setX(self.engine.camera, elapsed * self.speed)
         if self.mousebtn[4]:
-            base.camera.setZ(base.camera, elapsed * 30)
+            self.engine.camera.setZ(self.engine.camera, elapsed * self.speed)
         if self.mousebtn[5]:
-            base.camera.setZ(base.camera, -elapsed * 30)
+            self.engine.camera.setZ(self.engine.camera, -elapsed * self.speed)
 
-        self.focus = base.camera.getPos() + (dir * 5)
+        self.focus = self.engine.camera.getPos() + (dir * 5)
 
         self.checkArea(self.size)
+        self.origin.recenter(self.engine.camera.getX(), self.engine.camera.getY(), self.engine.camera.getZ())
 
         self.lastTime = task.time
         return Task.cont
@@ -104,7 +138,20 @@ class Camera(object):
         """
 
         self.pitch = -90
-        self.focus = Vec3(0, 0, self.size-10)
+        self.focus = Vec3(*self.origin.toScene((0, 0, self.size-10)))
+
+    def lookAt(self, x, y, z, distance=3):
+
+        """ Setzt den Fokus so, dass die Kamera mit der aktuellen Blickrichtung auf eine Position schaut
+
+        :param x: Position in der Szene auf der x-Achse
+        :param y: Position in der Szene auf der y-Achse
+        :param z: Position in der Szene auf der z-Achse
+        :param distance: zusaetzlicher Abstand der Kamera zur Position
+        """
+
+        dir = self.engine.camera.getMat().getRow3(1)
+        self.focus = Vec3(x, y, z) - dir * distance
 
     def setMouseBtn(self, btn, value):
 
@@ -116,23 +163,58 @@ class Camera(object):
 
         self.mousebtn[btn] = value
 
+    def setMove(self, move, value):
+
+        """ Ermoeglicht das setzen von Tastendruecken ueber den Namen der Bewegung
+
+        :param move: welche Bewegung betroffen ist (siehe MOVES)
+        :param value: welcher Wert (0 oder 1) die Bewegung haben soll
+        """
+
+        self.setMouseBtn(self.MOVES.index(move), value)
+
+    def zoom(self, delta):
+
+        """ Merkt Zoomschritte vor, die im naechsten Frame entlang der Blickrichtung ausgefuehrt werden
+
+        :param delta: Anzahl der Zoomschritte (positiv nach vorne, negativ nach hinten)
+        """
+
+        self.zoomDelta += delta
+
+    def shiftOrigin(self, delta):
+
+        """ Verschiebt die Kamera, ihren Fokus und die letzte gueltige Position, wenn der Ursprung der Szene
+        verschoben wurde. Die absolute Position der Kamera bleibt dabei gleich.
+
+        :param delta: Verschiebung des Ursprungs
+        """
+
+        shift = Vec3(*delta)
+        self.engine.camera.setPos(self.engine.camera.getPos() - shift)
+        self.focus = self.focus - shift
+        self.lastX -= delta[0]
+        self.lastY -= delta[1]
+        self.lastZ -= delta[2]
+
     def checkArea(self, size):
 
         """ Ueberprueft ob sich die Camera aus dem eingeschraengtem Raum bewegt. Der Radius wird als size uebergeben.
-        Sollte sich die Camera hinausbewegen wird sie auf den letzten gueltigen Wert gesetzt
+        Sollte sich die Camera hinausbewegen wird sie auf den letzten gueltigen Wert gesetzt. Der Abstand wird in
+        absoluten Koordinaten berechnet, damit er unabhaengig vom Ursprung der Szene ist.
 
         :param size: Groesse des zu ueberpruefenden Raumes
         :return:
         """
 
-        xy = sqrt(base.camera.getX() ** 2 + base.camera.getY() ** 2)
-        xyz = sqrt(xy ** 2 + base.camera.getZ() ** 2)
+        x, y, z = self.origin.toWorld(self.engine.camera.getX(), self.engine.camera.getY(), self.engine.camera.getZ())
+        xyz = sqrt(x ** 2 + y ** 2 + z ** 2)
 
         if xyz > size:
-            base.camera.setX(self.lastX)
-            base.camera.setY(self.lastY)
-            base.camera.setZ(self.lastZ)
+            self.engine.camera.setX(self.lastX)
+            self.engine.camera.setY(self.lastY)
+            self.engine.camera.setZ(self.lastZ)
         else:
-            self.lastX = base.camera.getX()
-            self.lastY = base.camera.getY()
-            self.lastZ = base.camera.getZ()
+            self.lastX = self.engine.camera.getX()
+            self.lastY = self.engine.camera.getY()
+            self.lastZ = self.engine.camera.getZ()
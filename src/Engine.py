@@ -0,0 +1,122 @@
+from panda3d.core import ClockObject, SamplerState
+from pandac.PandaModules import WindowProperties
+from ProceduralTexture import *
+
+
+class Engine(object):
+
+    """ Stellt die Dienste von Panda3D zur Verfuegung, die DirectStart sonst als globale Variablen (base, render,
+    loader, taskMgr, globalClock) anlegt. Die Klassen der Simulation greifen nur ueber ein solches Objekt auf die
+    Engine zu. Dadurch koennen sie auch mit der StandInEngine verwendet werden, die ohne Fenster auskommt.
+
+    :ivar ShowBase base: die laufende Instanz von Panda3D
+    :ivar NodePath render: Gesamte Umgebung des Raumes
+    :ivar NodePath aspect2d: Ebene fuer Texte am Bildschirm
+    :ivar NodePath camera: Knoten der Kamera
+    :ivar Lens camLens: Linse der Kamera
+    :ivar GraphicsOutput win: Fenster oder Offscreen-Puffer, in den gerendert wird
+    :ivar Loader loader: ladet Modelle und Texturen
+    :ivar TaskManager taskMgr: fuehrt die Tasks in jedem Frame aus
+    :ivar ClockObject clock: Uhr der Simulation
+    :ivar ProceduralTexture textureFactory: erzeugt die Texturen der kuenstlichen Himmelskoerper und legt sie im Cache ab
+    :ivar float renderScale: Anteil der Fensteraufloesung pro Achse, mit dem die Szene gerendert wird
+    :ivar GraphicsOutput scaleBuffer: Offscreen-Puffer fuer die verringerte Aufloesung, None bei voller Aufloesung
+    :ivar NodePath scaleCamera: Kamera, die in den Offscreen-Puffer rendert, None bei voller Aufloesung
+    :ivar NodePath scaleCard: Karte, die den Offscreen-Puffer im Fenster anzeigt, None bei voller Aufloesung
+
+    """
+
+    def __init__(self, base):
+
+        """ Uebernimmt die Dienste einer laufenden Instanz von Panda3D
+
+        :param base: die laufende Instanz von Panda3D
+        """
+
+        self.base = base
+        self.render = base.render
+        self.aspect2d = base.aspect2d
+        self.camera = base.camera
+        self.camLens = base.camLens
+        self.win = base.win
+        self.loader = base.loader
+        self.taskMgr = base.taskMgr
+        self.clock = ClockObject.getGlobalClock()
+        self.textureFactory = ProceduralTexture()
+        self.renderScale = 1.0
+        self.scaleBuffer = None
+        self.scaleCamera = None
+        self.scaleCard = None
+
+    def setTitle(self, title):
+
+        """ Setzt den Titel des Fensters. Offscreen-Puffer (z.B. im Headless-Modus) haben keinen Titel.
+
+        :param title: Titel des Fensters
+        """
+
+        if hasattr(self.win, "requestProperties"):
+            props = WindowProperties()
+            props.setTitle(title)
+            self.win.requestProperties(props)
+
+    def setBackgroundColor(self, r, g, b):
+
+        """ Setzt die Hintergrundfarbe
+
+        :param r: Rotanteil
+        :param g: Gruenanteil
+        :param b: Blauanteil
+        """
+
+        self.base.setBackgroundColor(r, g, b)
+
+    def disableMouse(self):
+
+        """ Schaltet die Standardsteuerung der Kamera mit der Maus aus
+
+        """
+
+        self.base.disableMouse()
+
+    def exit(self):
+
+        """ Beendet das Programm
+
+        """
+
+        self.base.userExit()
+
+    def setRenderScale(self, scale):
+
+        """ Rendert die Szene mit einem Anteil der Fensteraufloesung. Dazu rendert eine zweite Kamera mit derselben
+        Linse in einen kleineren Offscreen-Puffer, der auf einer Karte ueber das ganze Fenster gestreckt wird; die
+        Kamera des Fensters wird so lange abgeschaltet. Texte in aspect2d bleiben in voller Aufloesung. Der Puffer
+        wird mit der Groesse des Fensters beim Aufruf erstellt.
+
+        :param scale: Anteil der Fensteraufloesung pro Achse, 1 fuer volle Aufloesung
+        """
+
+        if scale == self.renderScale:
+            return
+        if self.scaleBuffer is not None:
+            self.scaleCard.removeNode()
+            self.scaleCamera.removeNode()
+            self.base.graphicsEngine.removeWindow(self.scaleBuffer)
+            self.scaleBuffer = self.scaleCamera = self.scaleCard = None
+        self.renderScale = scale
+        self.base.cam.node().setActive(scale == 1)
+        if scale == 1:
+            return
+
+        width = max(1, int(self.win.getXSize() * scale))
+        height = max(1, int(self.win.getYSize() * scale))
+        self.scaleBuffer = self.win.makeTextureBuffer("render-scale", width, height)
+        self.scaleBuffer.setClearColor(self.win.getClearColor())
+        self.scaleCamera = self.base.makeCamera(self.scaleBuffer, lens=self.camLens, camName="render-scale")
+        self.scaleCard = self.scaleBuffer.getTextureCard()
+        self.scaleCard.getTexture().setMagfilter(SamplerState.FTLinear)
+        self.scaleCard.reparentTo(self.base.render2d)
+        # Die Karte wird vor allen anderen Elementen in render2d gezeichnet
+        self.scaleCard.setBin("background", 0)
+        self.scaleCard.setDepthWrite(False)
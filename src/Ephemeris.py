@@ -0,0 +1,244 @@
+from KeplerSolver import *
+import numpy as np
+
+
+class Ephemeris(object):
+
+    """ Berechnet die Positionen aller Himmelskoerper zu einem Zeitpunkt. Die Himmelskoerper bilden dieselbe
+    Hierarchie wie im RuntimeHandler: jeder Himmelskoerper kreist auf einer Keplerbahn um seinen Elternkoerper. Alle
+    Werte werden in NumPy-Arrays mit doppelter Genauigkeit gehalten und fuer alle Himmelskoerper auf einmal
+    berechnet. Diese Klasse benoetigt kein Panda3D.
+
+    Die Bahnelemente sind die grosse Halbachse, die Exzentrizitaet, die Inklination, die Laenge des aufsteigenden
+    Knotens, das Argument der Periapsis und die mittlere Anomalie zum Zeitpunkt 0. Winkel werden in Grad angegeben.
+
+    :ivar list names: Namen der Himmelskoerper in der Reihenfolge, in der sie hinzugefuegt wurden
+    :ivar dictionary index: Position jedes Himmelskoerpers in den Arrays
+    :ivar list parents: Index des Elternkoerpers, -1 fuer Himmelskoerper ohne Elternkoerper
+    :ivar list radii: grosse Halbachse der Umlaufbahn
+    :ivar list eccentricities: Exzentrizitaet der Umlaufbahn
+    :ivar list inclinations: Inklination der Umlaufbahn
+    :ivar list nodes: Laenge des aufsteigenden Knotens
+    :ivar list periapses: Argument der Periapsis
+    :ivar list meanAnomalies: mittlere Anomalie zum Zeitpunkt 0
+    :ivar list orbitPeriods: Dauer einer Umrundung des Elternkoerpers, 0 fuer keine Bewegung
+    :ivar list selfPeriods: Dauer einer Umdrehung um sich selbst, 0 fuer keine Drehung
+    :ivar dictionary arrays: aus den Listen erstellte Arrays, None solange sie nicht erstellt wurden
+    :ivar KeplerSolver solver: loest die Kepler-Gleichung und merkt sich die Loesung fuer den naechsten Frame
+
+    """
+
+    def __init__(self):
+
+        """ Initialisiert eine leere Ephemeride
+
+        """
+
+        self.names = []
+        self.index = {}
+        self.parents = []
+        self.radii = []
+        self.eccentricities = []
+        self.inclinations = []
+        self.nodes = []
+        self.periapses = []
+        self.meanAnomalies = []
+        self.orbitPeriods = []
+        self.selfPeriods = []
+        self.arrays = None
+        self.solver = KeplerSolver()
+
+    def __len__(self):
+
+        """ Gibt die Anzahl der Himmelskoerper zurueck
+
+        :return: Anzahl der Himmelskoerper
+        """
+
+        return len(self.names)
+
+    def addBody(self, name, parent, radius, orbitPeriod, selfPeriod, eccentricity=0, inclination=0, node=0,
+                periapsis=0, meanAnomaly=0):
+
+        """ Fuegt einen Himmelskoerper hinzu. Der Elternkoerper muss bereits hinzugefuegt worden sein.
+
+        :param name: Name des Himmelskoerpers
+        :param parent: Name des Elternkoerpers oder None
+        :param radius: grosse Halbachse der Umlaufbahn um den Elternkoerper
+        :param orbitPeriod: Dauer einer Umrundung des Elternkoerpers, None oder 0 fuer keine Bewegung
+        :param selfPeriod: Dauer einer Umdrehung um sich selbst, None oder 0 fuer keine Drehung
+        :param eccentricity: Exzentrizitaet der Umlaufbahn
+        :param inclination: Inklination der Umlaufbahn in Grad
+        :param node: Laenge des aufsteigenden Knotens in Grad
+        :param periapsis: Argument der Periapsis in Grad
+        :param meanAnomaly: mittlere Anomalie zum Zeitpunkt 0 in Grad
+        :return: Index des Himmelskoerpers
+        """
+
+        self.index[name] = len(self.names)
+        self.names.append(name)
+        self.parents.append(self.index[parent] if parent is not None else -1)
+        self.radii.append(radius or 0)
+        self.eccentricities.append(eccentricity)
+        self.inclinations.append(inclination)
+        self.nodes.append(node)
+        self.periapses.append(periapsis)
+        self.meanAnomalies.append(meanAnomaly)
+        self.orbitPeriods.append(orbitPeriod or 0)
+        self.selfPeriods.append(selfPeriod or 0)
+        self.arrays = None
+        return self.index[name]
+
+    def getArrays(self):
+
+        """ Erstellt die Arrays aus den Listen, falls seit dem letzten Hinzufuegen noetig. Zusaetzlich werden die
+        Himmelskoerper nach ihrer Tiefe in der Hierarchie gruppiert, damit die Positionen Ebene fuer Ebene
+        zusammengesetzt werden koennen, und die Achsen der Bahnebenen (P zur Periapsis, Q senkrecht dazu)
+        vorberechnet.
+
+        :return: Dictionary mit den Arrays
+        """
+
+        if self.arrays is None:
+            parents = np.array(self.parents, dtype=np.int64)
+            depth = np.zeros(len(parents), dtype=np.int64)
+            for i, parent in enumerate(parents):
+                if parent >= 0:
+                    depth[i] = depth[parent] + 1
+            levels = []
+            for level in range(1, depth.max() + 1 if len(depth) else 1):
+                children = np.nonzero(depth == level)[0]
+                levels.append((children, parents[children]))
+
+            inclination = np.radians(self.inclinations)
+            node = np.radians(self.nodes)
+            periapsis = np.radians(self.periapses)
+            cosI, sinI = np.cos(inclination), np.sin(inclination)
+            cosN, sinN = np.cos(node), np.sin(node)
+            cosP, sinP = np.cos(periapsis), np.sin(periapsis)
+            axisP = np.stack([cosN * cosP - sinN * sinP * cosI, sinN * cosP + cosN * sinP * cosI, sinP * sinI], axis=-1)
+            axisQ = np.stack([-cosN * sinP - sinN * cosP * cosI, -sinN * sinP + cosN * cosP * cosI, cosP * sinI], axis=-1)
+
+            self.arrays = {
+                "parents": parents,
+                "levels": levels,
+                "radii": np.array(self.radii, dtype=np.float64),
+                "eccentricities": np.array(self.eccentricities, dtype=np.float64),
+                "meanAnomalies": np.radians(np.array(self.meanAnomalies, dtype=np.float64)),
+                "axisP": axisP.reshape(-1, 3),
+                "axisQ": axisQ.reshape(-1, 3),
+                "orbitPeriods": np.array(self.orbitPeriods, dtype=np.float64),
+                "selfPeriods": np.array(self.selfPeriods, dtype=np.float64),
+            }
+        return self.arrays
+
+    def getAngles(self, t, periods):
+
+        """ Berechnet den Winkel einer gleichmaessigen Drehung zu einem Zeitpunkt
+
+        :param t: Zeitpunkt oder Array von Zeitpunkten
+        :param periods: Dauer einer Umdrehung pro Himmelskoerper, 0 fuer keine Drehung
+        :return: Winkel im Bogenmass mit der Form (..., Anzahl der Himmelskoerper)
+        """
+
+        t = np.asarray(t, dtype=np.float64)[..., np.newaxis]
+        moving = periods > 0
+        return 2 * np.pi * t / np.where(moving, periods, 1.0) * moving
+
+    def getLocalPositions(self, t, warmStart=False):
+
+        """ Berechnet die Positionen relativ zum jeweiligen Elternkoerper. Dazu wird die Kepler-Gleichung fuer alle
+        Himmelskoerper gleichzeitig geloest und die Position in der Bahnebene auf die Achsen P und Q abgebildet.
+
+        :param t: Zeitpunkt oder Array von Zeitpunkten
+        :param warmStart: gibt an, ob die Loesung des letzten Aufrufs als Startwert verwendet wird. Sinnvoll, wenn
+            die Zeitpunkte aufeinanderfolgender Aufrufe nahe beieinander liegen (z.B. pro Frame)
+        :return: Positionen mit der Form (..., Anzahl der Himmelskoerper, 3)
+        """
+
+        arrays = self.getArrays()
+        mean = arrays["meanAnomalies"] + self.getAngles(t, arrays["orbitPeriods"])
+        return self.getOrbitPositions(mean, slice(None), warmStart)
+
+    def getOrbitPositions(self, mean, bodies, warmStart=False):
+
+        """ Berechnet die Positionen auf der Umlaufbahn relativ zum Elternkoerper aus den mittleren Anomalien
+
+        :param mean: mittlere Anomalien im Bogenmass
+        :param bodies: Indizes der Himmelskoerper passend zur Form von mean, slice(None) fuer alle
+        :param warmStart: gibt an, ob die Loesung des letzten Aufrufs als Startwert verwendet wird
+        :return: Positionen mit der Form (..., 3)
+        """
+
+        arrays = self.getArrays()
+        eccentricity = arrays["eccentricities"][bodies]
+        eccentric = self.solver.solve(mean, eccentricity, warmStart)
+
+        radii = arrays["radii"][bodies]
+        x = radii * (np.cos(eccentric) - eccentricity)
+        y = radii * np.sqrt(1 - eccentricity ** 2) * np.sin(eccentric)
+        return x[..., np.newaxis] * arrays["axisP"][bodies] + y[..., np.newaxis] * arrays["axisQ"][bodies]
+
+    def composePositions(self, local):
+
+        """ Setzt relative Positionen Ebene fuer Ebene zu absoluten Positionen zusammen
+
+        :param local: Positionen relativ zum Elternkoerper mit der Form (..., Anzahl der Himmelskoerper, 3)
+        :return: absolute Positionen mit derselben Form
+        """
+
+        world = local
+        for children, parents in self.getArrays()["levels"]:
+            world[..., children, :] += world[..., parents, :]
+        return world
+
+    def getPositions(self, t, warmStart=False):
+
+        """ Berechnet die absoluten Positionen aller Himmelskoerper
+
+        :param t: Zeitpunkt oder Array von Zeitpunkten
+        :param warmStart: gibt an, ob die Loesung des letzten Aufrufs als Startwert verwendet wird
+        :return: Positionen mit der Form (..., Anzahl der Himmelskoerper, 3)
+        """
+
+        return self.composePositions(self.getLocalPositions(t, warmStart))
+
+    def getBodyPositions(self, t, bodies):
+
+        """ Berechnet die absoluten Positionen einzelner Himmelskoerper zu jeweils eigenen Zeitpunkten. Es werden nur
+        diese Himmelskoerper und ihre Elternkoerper berechnet, nicht die gesamte Hierarchie. Dadurch lassen sich
+        viele Paare aus Zeitpunkt und Himmelskoerper auf einmal auswerten (z.B. beim Eingrenzen von Ereignissen).
+        Die letzte Loesung der Kepler-Gleichung wird dabei nicht veraendert.
+
+        :param t: Array von Zeitpunkten
+        :param bodies: Array von Indizes der Himmelskoerper, muss sich mit t auf eine gemeinsame Form erweitern lassen
+        :return: Positionen mit der Form (..., 3)
+        """
+
+        arrays = self.getArrays()
+        t, bodies = np.broadcast_arrays(np.asarray(t, dtype=np.float64), np.asarray(bodies, dtype=np.intp))
+        world = np.zeros(t.shape + (3,))
+        current = bodies
+        while True:
+            valid = current >= 0
+            if not valid.any():
+                break
+            # Himmelskoerper ohne Umlaufbahn (z.B. die Sonne) liegen im Elternkoerper
+            placed = valid & (arrays["radii"][np.maximum(current, 0)] > 0)
+            index = current[placed]
+            periods = arrays["orbitPeriods"][index]
+            moving = periods > 0
+            mean = arrays["meanAnomalies"][index] + 2 * np.pi * t[placed] / np.where(moving, periods, 1.0) * moving
+            world[placed] += self.getOrbitPositions(mean, index)
+            current = np.where(valid, arrays["parents"][np.maximum(current, 0)], -1)
+        return world
+
+    def getHeadings(self, t):
+
+        """ Berechnet den Drehwinkel aller Himmelskoerper um sich selbst
+
+        :param t: Zeitpunkt oder Array von Zeitpunkten
+        :return: Drehwinkel in Grad zwischen 0 und 360 mit der Form (..., Anzahl der Himmelskoerper)
+        """
+
+        return np.degrees(self.getAngles(t, self.getArrays()["selfPeriods"])) % 360
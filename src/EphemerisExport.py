@@ -0,0 +1,360 @@
+from RuntimeHandler import *
+from LuminaryCatalog import *
+from FloatingOrigin import *
+from collections import deque
+import argparse
+import csv
+import multiprocessing
+import os
+import sys
+import time
+
+#: Ephemeride des Arbeitsprozesses, wird von initWorker erstellt
+workerEphemeris = None
+
+
+def createEphemeris(asteroidCount):
+
+    """ Baut die Hierarchie der Himmelskoerper wie im Solarsystem auf, ohne ein Fenster zu oeffnen oder Modelle zu
+    laden
+
+    :param asteroidCount: die Anzahl der kuenstlichen Asteroiden im Asteroidenguertel
+    :return: die Ephemeride mit allen Himmelskoerpern
+    """
+
+    runtime = RuntimeHandler(FloatingOrigin())
+    runtime.addLuminary(None, LuminaryCatalog(asteroidCount).createLuminaries())
+    return runtime.ephemeris
+
+
+def initWorker(asteroidCount):
+
+    """ Erstellt die Ephemeride einmal pro Arbeitsprozess
+
+    :param asteroidCount: die Anzahl der kuenstlichen Asteroiden im Asteroidenguertel
+    """
+
+    global workerEphemeris
+    workerEphemeris = createEphemeris(asteroidCount)
+
+
+def computeChunk(first, count, start, step):
+
+    """ Berechnet die Positionen eines Abschnitts im Arbeitsprozess. Die Zeitpunkte werden aus ihrem Index
+    berechnet, damit sich bei langen Zeitraeumen keine Rundungsfehler aufsummieren.
+
+    :param first: Index des ersten Zeitpunkts
+    :param count: Anzahl der Zeitpunkte
+    :param start: erster Zeitpunkt des gesamten Exports
+    :param step: Abstand zwischen zwei Zeitpunkten
+    :return: Index des ersten Zeitpunkts, die Zeitpunkte und die Positionen mit der Form (count, Anzahl der
+        Himmelskoerper, 3)
+    """
+
+    times = start + step * np.arange(first, first + count, dtype=np.float64)
+    return first, times, workerEphemeris.getPositions(times)
+
+
+class EphemerisExport(object):
+
+    """ Exportiert die Positionen aller Himmelskoerper ueber einen langen Zeitraum, ohne ein Fenster zu oeffnen. Die
+    Hierarchie der Himmelskoerper wird wie im Solarsystem ueber den RuntimeHandler aufgebaut.
+
+    Der Zeitraum wird in Abschnitte geteilt, die in einem Pool von Prozessen vektorisiert berechnet werden. Es sind
+    hoechstens window Abschnitte gleichzeitig in Arbeit, die fertigen Abschnitte werden der Reihe nach in die Datei
+    geschrieben. Der Speicherbedarf haengt dadurch nur von der Groesse der Abschnitte ab und nicht von der Laenge
+    des Zeitraums. Der Durchsatz wird laufend auf stderr ausgegeben.
+
+    Unterstuetzte Formate:
+
+    * csv: eine Zeile pro Zeitpunkt und Himmelskoerper (time, body, x, y, z)
+    * npy: ein strukturiertes Array mit einem Feld time und einem Feld (x, y, z) pro Himmelskoerper
+    * parquet: dieselben Spalten wie csv, benoetigt pyarrow
+
+    :ivar int asteroidCount: die Anzahl der kuenstlichen Asteroiden im Asteroidenguertel
+    :ivar int workers: Anzahl der Prozesse, 1 rechnet im eigenen Prozess
+    :ivar int chunkSize: Anzahl der Zeitpunkte pro Abschnitt
+    :ivar int window: hoechstens gleichzeitig berechnete Abschnitte
+    :ivar float reportInterval: Abstand in Sekunden, in dem der Durchsatz ausgegeben wird
+    :ivar Ephemeris ephemeris: Ephemeride des eigenen Prozesses, liefert die Namen und rechnet bei einem Prozess
+    :ivar dictionary writers: Funktion zum Schreiben pro Format
+    :ivar int samples: Anzahl der bisher geschriebenen Zeitpunkte
+    :ivar float startClock: Zeitpunkt, zu dem der Export gestartet wurde
+    :ivar float lastReport: Zeitpunkt, zu dem der Durchsatz zuletzt ausgegeben wurde
+
+    """
+
+    #: Anzahl der Nachkommastellen in der CSV-Datei
+    CSV_PRECISION = 12
+
+    def __init__(self, asteroidCount=0, workers=None, chunkSize=4096, window=None, reportInterval=1.0):
+
+        """ Initialisiert den Export
+
+        :param asteroidCount: die Anzahl der kuenstlichen Asteroiden im Asteroidenguertel
+        :param workers: Anzahl der Prozesse, ohne Angabe die Anzahl der CPUs
+        :param chunkSize: Anzahl der Zeitpunkte pro Abschnitt
+        :param window: hoechstens gleichzeitig berechnete Abschnitte, ohne Angabe doppelt so viele wie Prozesse
+        :param reportInterval: Abstand in Sekunden, in dem der Durchsatz ausgegeben wird
+        """
+
+        self.asteroidCount = asteroidCount
+        self.workers = workers or multiprocessing.cpu_count()
+        self.chunkSize = chunkSize
+        self.window = window or 2 * self.workers
+        self.reportInterval = reportInterval
+        self.ephemeris = createEphemeris(asteroidCount)
+        self.writers = {"csv": self.writeCsv, "npy": self.writeNpy, "parquet": self.writeParquet}
+        self.samples = 0
+        self.startClock = None
+        self.lastReport = None
+
+    def getFormat(self, path, format=None):
+
+        """ Bestimmt das Format aus der Angabe oder der Dateiendung
+
+        :param path: Pfad der Ausgabedatei
+        :param format: Format oder None
+        :return: Name des Formats
+        """
+
+        format = (format or os.path.splitext(path)[1].lstrip(".")).lower()
+        if format not in self.writers:
+            raise ValueError("unbekanntes Format %r, moeglich sind %s" % (format, ", ".join(sorted(self.writers))))
+        return format
+
+    def getSampleCount(self, start, end, step):
+
+        """ Gibt die Anzahl der Zeitpunkte von start bis einschliesslich end zurueck
+
+        :param start: erster Zeitpunkt
+        :param end: letzter Zeitpunkt
+        :param step: Abstand zwischen zwei Zeitpunkten
+        :return: Anzahl der Zeitpunkte
+        """
+
+        if step <= 0:
+            raise ValueError("der Abstand muss groesser als 0 sein")
+        if end < start:
+            raise ValueError("das Ende liegt vor dem Anfang")
+        # Kleine Toleranz, damit end trotz Rundung enthalten ist
+        return int(np.floor((end - start) / step + 1e-9)) + 1
+
+    def getChunks(self, total):
+
+        """ Teilt die Zeitpunkte in Abschnitte
+
+        :param total: Anzahl der Zeitpunkte
+        :return: Generator mit Index des ersten Zeitpunkts und Anzahl der Zeitpunkte pro Abschnitt
+        """
+
+        for first in range(0, total, self.chunkSize):
+            yield first, min(self.chunkSize, total - first)
+
+    def computeLocal(self, total, start, step):
+
+        """ Berechnet alle Abschnitte der Reihe nach im eigenen Prozess
+
+        :param total: Anzahl der Zeitpunkte
+        :param start: erster Zeitpunkt
+        :param step: Abstand zwischen zwei Zeitpunkten
+        :return: Generator mit den berechneten Abschnitten
+        """
+
+        for first, count in self.getChunks(total):
+            times = start + step * np.arange(first, first + count, dtype=np.float64)
+            yield first, times, self.ephemeris.getPositions(times)
+
+    def computeParallel(self, pool, total, start, step):
+
+        """ Berechnet die Abschnitte im Pool. Es werden nur so viele Abschnitte vergeben, wie das Fenster erlaubt;
+        ein neuer Abschnitt wird erst vergeben, wenn der aelteste abgeholt wurde. Die Abschnitte kommen dadurch in
+        der richtigen Reihenfolge zurueck.
+
+        :param pool: Pool der Arbeitsprozesse
+        :param total: Anzahl der Zeitpunkte
+        :param start: erster Zeitpunkt
+        :param step: Abstand zwischen zwei Zeitpunkten
+        :return: Generator mit den berechneten Abschnitten
+        """
+
+        pending = deque()
+        for first, count in self.getChunks(total):
+            if len(pending) >= self.window:
+                yield pending.popleft().get()
+            pending.append(pool.apply_async(computeChunk, (first, count, start, step)))
+        while pending:
+            yield pending.popleft().get()
+
+    def export(self, path, start, end, step, format=None):
+
+        """ Exportiert die Positionen aller Himmelskoerper von start bis einschliesslich end
+
+        :param path: Pfad der Ausgabedatei
+        :param start: erster Zeitpunkt in Zeiteinheiten der Simulation
+        :param end: letzter Zeitpunkt in Zeiteinheiten der Simulation
+        :param step: Abstand zwischen zwei Zeitpunkten
+        :param format: Format der Ausgabe, ohne Angabe aus der Dateiendung bestimmt
+        :return: Anzahl der geschriebenen Zeitpunkte
+        """
+
+        writer = self.writers[self.getFormat(path, format)]
+        total = self.getSampleCount(start, end, step)
+
+        self.samples = 0
+        self.startClock = self.lastReport = time.time()
+        if self.workers == 1:
+            writer(path, self.computeLocal(total, start, step), total)
+        else:
+            pool = multiprocessing.Pool(self.workers, initWorker, (self.asteroidCount,))
+            try:
+                writer(path, self.computeParallel(pool, total, start, step), total)
+                pool.close()
+            except BaseException:
+                pool.terminate()
+                raise
+            finally:
+                pool.join()
+        self.report(total, True)
+        return self.samples
+
+    def count(self, times, total):
+
+        """ Zaehlt einen geschriebenen Abschnitt und gibt den Durchsatz aus, falls das Intervall vergangen ist
+
+        :param times: Zeitpunkte des Abschnitts
+        :param total: Anzahl aller Zeitpunkte
+        """
+
+        self.samples += len(times)
+        if time.time() - self.lastReport >= self.reportInterval:
+            self.report(total)
+
+    def report(self, total, final=False):
+
+        """ Gibt den Fortschritt und den Durchsatz auf stderr aus. Ein Sample ist ein Zeitpunkt mit den Positionen
+        aller Himmelskoerper.
+
+        :param total: Anzahl aller Zeitpunkte
+        :param final: gibt an, ob der Export abgeschlossen ist
+        """
+
+        self.lastReport = time.time()
+        elapsed = max(self.lastReport - self.startClock, 1e-9)
+        rate = self.samples / elapsed
+        sys.stderr.write("%s%d/%d Samples, %.0f Samples/s, %.0f Positionen/s, %.1f s\n" % (
+            "fertig: " if final else "", self.samples, total, rate, rate * len(self.ephemeris), elapsed))
+
+    def writeCsv(self, path, chunks, total):
+
+        """ Schreibt die Abschnitte als CSV-Datei mit einer Zeile pro Zeitpunkt und Himmelskoerper
+
+        :param path: Pfad der Ausgabedatei
+        :param chunks: berechnete Abschnitte
+        :param total: Anzahl aller Zeitpunkte
+        """
+
+        names = np.array(self.ephemeris.names)
+        precision = "%%.%dg" % self.CSV_PRECISION
+        with open(path, "w") as output:
+            writer = csv.writer(output, lineterminator="\n")
+            writer.writerow(["time", "body", "x", "y", "z"])
+            for first, times, positions in chunks:
+                rows = positions.reshape(-1, 3)
+                timeColumn = np.repeat(times, len(names))
+                bodyColumn = np.tile(names, len(times))
+                writer.writerows([precision % t, body, precision % x, precision % y, precision % z]
+                                 for t, body, (x, y, z) in zip(timeColumn, bodyColumn, rows))
+                self.count(times, total)
+
+    def writeNpy(self, path, chunks, total):
+
+        """ Schreibt die Abschnitte in eine NPY-Datei. Die Datei wird mit der vollen Groesse angelegt und ueber
+        eine Memory-Map abschnittsweise befuellt.
+
+        :param path: Pfad der Ausgabedatei
+        :param chunks: berechnete Abschnitte
+        :param total: Anzahl aller Zeitpunkte
+        """
+
+        dtype = np.dtype([("time", np.float64)] + [(name, np.float64, (3,)) for name in self.ephemeris.names])
+        output = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(total,))
+        try:
+            for first, times, positions in chunks:
+                block = output[first:first + len(times)]
+                block["time"] = times
+                for i, name in enumerate(self.ephemeris.names):
+                    block[name] = positions[:, i]
+                output.flush()
+                self.count(times, total)
+        finally:
+            del output
+
+    def writeParquet(self, path, chunks, total):
+
+        """ Schreibt die Abschnitte als Parquet-Datei mit einer Zeile pro Zeitpunkt und Himmelskoerper. Jeder
+        Abschnitt wird als eigene Row Group geschrieben.
+
+        :param path: Pfad der Ausgabedatei
+        :param chunks: berechnete Abschnitte
+        :param total: Anzahl aller Zeitpunkte
+        """
+
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise RuntimeError("fuer das Format parquet wird pyarrow benoetigt")
+
+        names = self.ephemeris.names
+        bodies = pyarrow.DictionaryArray.from_arrays(pyarrow.array(np.arange(len(names), dtype=np.int32)),
+                                                     pyarrow.array(names))
+        schema = pyarrow.schema([("time", pyarrow.float64()), ("body", bodies.type), ("x", pyarrow.float64()),
+                                 ("y", pyarrow.float64()), ("z", pyarrow.float64())])
+        writer = pyarrow.parquet.ParquetWriter(path, schema)
+        try:
+            for first, times, positions in chunks:
+                x, y, z = np.ascontiguousarray(positions.reshape(-1, 3).T)
+                indices = pyarrow.array(np.tile(np.arange(len(names), dtype=np.int32), len(times)))
+                table = pyarrow.Table.from_arrays([
+                    pyarrow.array(np.repeat(times, len(names))),
+                    pyarrow.DictionaryArray.from_arrays(indices, bodies.dictionary),
+                    pyarrow.array(x), pyarrow.array(y), pyarrow.array(z)], schema=schema)
+                writer.write_table(table)
+                self.count(times, total)
+        finally:
+            writer.close()
+
+
+def parseArguments(argv=None):
+
+    """ Liest die Kommandozeilenparameter ein
+
+    :param argv: Liste der Parameter, ohne Angabe werden jene des Programmaufrufs verwendet
+    :return: die eingelesenen Parameter
+    """
+
+    parser = argparse.ArgumentParser(description="Exportiert die Positionen aller Himmelskoerper ohne Fenster")
+    parser.add_argument("output", help="Ausgabedatei (.csv, .npy oder .parquet)")
+    parser.add_argument("--format", choices=["csv", "npy", "parquet"], help="Format, ohne Angabe aus der Dateiendung")
+    parser.add_argument("--start", type=float, default=0.0, help="erster Zeitpunkt")
+    parser.add_argument("--end", type=float, required=True, help="letzter Zeitpunkt")
+    parser.add_argument("--step", type=float, required=True, help="Abstand zwischen zwei Zeitpunkten")
+    parser.add_argument("--unit", choices=["time", "day", "year"], default="year",
+                        help="Einheit von start, end und step: Zeiteinheiten der Simulation, Tage oder Jahre")
+    parser.add_argument("--workers", type=int, help="Anzahl der Prozesse, ohne Angabe die Anzahl der CPUs")
+    parser.add_argument("--chunk", type=int, default=4096, help="Anzahl der Zeitpunkte pro Abschnitt")
+    parser.add_argument("--asteroids", type=int, default=0, help="Anzahl der kuenstlichen Asteroiden")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parseArguments()
+    yearscale = LuminaryCatalog().yearscale
+    unit = {"time": 1.0, "day": yearscale / 365.0, "year": yearscale}[args.unit]
+
+    exporter = EphemerisExport(args.asteroids, args.workers, args.chunk)
+    try:
+        exporter.export(args.output, args.start * unit, args.end * unit, args.step * unit, args.format)
+    except (ValueError, RuntimeError) as error:
+        sys.exit(str(error))
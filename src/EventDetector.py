@@ -0,0 +1,449 @@
+from collections import namedtuple
+import numpy as np
+
+#: Ein gefundenes Ereignis: Zeitpunkt, Art ("closeApproach", "conjunction" oder "eclipse"), beteiligte
+#: Himmelskoerper und ein Wert (kleinster Abstand, kleinster Winkel in Grad bzw. Dauer der Finsternis)
+Event = namedtuple("Event", ["time", "kind", "bodies", "value"])
+
+
+class EventDetector(object):
+
+    """ Sucht auf der Zeitachse der Simulation nach besonderen Ereignissen: Annaeherungen zweier Himmelskoerper,
+    Konjunktionen (zwei Himmelskoerper stehen von einem Zentrum aus gesehen in einer Linie) und Finsternisse (ein
+    Mond tritt in den Schatten seines Planeten).
+
+    Die Zeitachse wird in Fenster geteilt und die Positionen aller Himmelskoerper pro Fenster auf einmal ueber die
+    Ephemeride berechnet. Um nicht alle Paare pruefen zu muessen, werden pro Fenster die Bahnabschnitte in Boxen
+    gefasst und mit Sweep-and-Prune nur Paare mit ueberlappenden Boxen weiter untersucht. Fuer diese wird das
+    Ereignis zwischen zwei Abtastpunkten eingeschlossen und dann mit Goldenem Schnitt bzw. Bisektion genau bestimmt.
+    Alle eingeschlossenen Ereignisse eines Fensters werden gemeinsam bestimmt: jede Iteration wertet die Ephemeride
+    einmal fuer alle Kandidaten aus, und zwar nur fuer die beteiligten Himmelskoerper und deren Elternkoerper.
+
+    searchEvents liefert die Ereignisse Fenster fuer Fenster, damit die Suche auf mehrere Frames verteilt werden
+    kann, ohne die Simulation anzuhalten.
+
+    :ivar Ephemeris ephemeris: berechnet die Positionen aller Himmelskoerper
+    :ivar ndarray radii: Radius jedes Himmelskoerpers in der Reihenfolge der Ephemeride
+    :ivar list moving: Indizes der Himmelskoerper, die sich auf einer Umlaufbahn bewegen
+    :ivar int windowSize: Anzahl der Abtastpunkte pro Fenster
+    :ivar int refineIterations: Anzahl der Iterationen bei der genauen Bestimmung eines Zeitpunkts
+
+    """
+
+    def __init__(self, ephemeris, radii, windowSize=64, refineIterations=60):
+
+        """ Initialisiert die Suche
+
+        :param ephemeris: berechnet die Positionen aller Himmelskoerper
+        :param radii: Radius jedes Himmelskoerpers in der Reihenfolge der Ephemeride
+        :param windowSize: Anzahl der Abtastpunkte pro Fenster
+        :param refineIterations: Anzahl der Iterationen bei der genauen Bestimmung eines Zeitpunkts
+        """
+
+        self.ephemeris = ephemeris
+        self.radii = np.asarray(radii, dtype=np.float64)
+        arrays = ephemeris.getArrays()
+        self.moving = [i for i in range(len(ephemeris)) if arrays["orbitPeriods"][i] > 0]
+        self.windowSize = windowSize
+        self.refineIterations = refineIterations
+
+    def getDefaultStep(self):
+
+        """ Gibt einen Abstand der Abtastpunkte zurueck, der die schnellste Umlaufbahn mit 32 Punkten abtastet
+
+        :return: Abstand der Abtastpunkte
+        """
+
+        periods = self.ephemeris.getArrays()["orbitPeriods"]
+        return periods[periods > 0].min() / 32.0
+
+    def getWindows(self, start, end, step):
+
+        """ Teilt die Zeitachse in Fenster. Benachbarte Fenster ueberlappen um einen Abtastpunkt auf jeder Seite,
+        damit Minima an den Fenstergrenzen eingeschlossen werden.
+
+        :param start: Beginn der Suche
+        :param end: Ende der Suche
+        :param step: Abstand der Abtastpunkte
+        :return: Generator der Abtastzeitpunkte und Positionen (Zeitpunkte, Himmelskoerper, 3) pro Fenster
+        """
+
+        count = int(np.ceil((end - start) / step)) + 1
+        for first in range(0, count, self.windowSize):
+            indices = np.arange(max(first - 1, 0), min(first + self.windowSize + 1, count))
+            times = start + indices * step
+            yield times, self.ephemeris.getPositions(times), indices[0] < first
+
+    def sweepAndPrune(self, lower, upper, candidates):
+
+        """ Findet alle Paare, deren Boxen sich ueberlappen. Die Boxen werden nach ihrer Untergrenze auf der x-Achse
+        sortiert und der Reihe nach durchlaufen, dabei werden nur Boxen verglichen, die sich auf der x-Achse
+        ueberlappen.
+
+        :param lower: Untergrenzen der Boxen (Himmelskoerper, 3)
+        :param upper: Obergrenzen der Boxen (Himmelskoerper, 3)
+        :param candidates: Indizes der Himmelskoerper, die beruecksichtigt werden
+        :return: Liste der Paare (i, j) mit i < j
+        """
+
+        pairs = []
+        active = []
+        for i in sorted(candidates, key=lambda index: lower[index, 0]):
+            active = [j for j in active if upper[j, 0] >= lower[i, 0]]
+            for j in active:
+                if np.all(lower[i, 1:] <= upper[j, 1:]) and np.all(lower[j, 1:] <= upper[i, 1:]):
+                    pairs.append((min(i, j), max(i, j)))
+            active.append(i)
+        return pairs
+
+    def isRelated(self, i, j):
+
+        """ Ueberprueft, ob einer der beiden Himmelskoerper den anderen umkreist
+
+        :param i: Index des ersten Himmelskoerpers
+        :param j: Index des zweiten Himmelskoerpers
+        :return: True, wenn i der Elternkoerper von j ist oder umgekehrt
+        """
+
+        parents = self.ephemeris.getArrays()["parents"]
+        return parents[i] == j or parents[j] == i
+
+    def minimize(self, function, low, high):
+
+        """ Sucht die Minima einer Funktion in vielen Intervallen gleichzeitig mit dem Goldenen Schnitt. Jede
+        Iteration ruft die Funktion einmal mit einem Zeitpunkt pro Intervall auf.
+
+        :param function: Funktion, die ein Array von Zeitpunkten (ein Eintrag pro Intervall) auf Werte abbildet
+        :param low: Array mit dem Beginn der Intervalle
+        :param high: Array mit dem Ende der Intervalle
+        :return: Arrays der Zeitpunkte und Werte der Minima
+        """
+
+        ratio = (np.sqrt(5) - 1) / 2
+        a, b = np.asarray(low, dtype=np.float64), np.asarray(high, dtype=np.float64)
+        c, d = b - ratio * (b - a), a + ratio * (b - a)
+        fc, fd = function(c), function(d)
+        for _ in range(self.refineIterations):
+            left = fc < fd
+            a = np.where(left, a, c)
+            b = np.where(left, d, b)
+            probe = np.where(left, b - ratio * (b - a), a + ratio * (b - a))
+            fProbe = function(probe)
+            c, d, fc, fd = (np.where(left, probe, d), np.where(left, c, probe),
+                            np.where(left, fProbe, fd), np.where(left, fc, fProbe))
+        t = 0.5 * (a + b)
+        return t, function(t)
+
+    def bisect(self, function, low, high):
+
+        """ Sucht Vorzeichenwechsel einer Funktion in vielen Intervallen gleichzeitig mit dem Bisektionsverfahren
+
+        :param function: Funktion, die ein Array von Zeitpunkten (ein Eintrag pro Intervall) auf Werte abbildet,
+            deren Vorzeichen sich zwischen low und high aendert
+        :param low: Array mit dem Beginn der Intervalle
+        :param high: Array mit dem Ende der Intervalle
+        :return: Array der Zeitpunkte der Vorzeichenwechsel
+        """
+
+        low, high = np.asarray(low, dtype=np.float64), np.asarray(high, dtype=np.float64)
+        lowNegative = function(low) < 0
+        for _ in range(self.refineIterations):
+            middle = 0.5 * (low + high)
+            same = (function(middle) < 0) == lowNegative
+            low = np.where(same, middle, low)
+            high = np.where(same, high, middle)
+        return 0.5 * (low + high)
+
+    def findMinima(self, times, values):
+
+        """ Sucht lokale Minima abgetasteter Funktionen und schliesst sie zwischen den benachbarten Abtastpunkten ein.
+        Der erste und letzte Abtastpunkt gehoeren zu den benachbarten Fenstern, dort wird nicht gesucht.
+
+        :param times: Abtastzeitpunkte des Fensters
+        :param values: abgetastete Werte mit der Form (Zeitpunkte, Paare)
+        :return: Indizes der Paare und Arrays mit Beginn und Ende der Intervalle
+        """
+
+        middle = values[1:-1]
+        samples, pairs = np.nonzero((middle <= values[:-2]) & (middle < values[2:]))
+        return pairs, times[samples], times[samples + 2]
+
+    def getPairs(self, pairs):
+
+        """ Wandelt eine Liste von Paaren in zwei Arrays von Indizes um
+
+        :param pairs: Liste der Paare (i, j)
+        :return: Arrays der ersten und zweiten Himmelskoerper
+        """
+
+        pairs = np.array(pairs, dtype=np.intp).reshape(-1, 2)
+        return pairs[:, 0], pairs[:, 1]
+
+    def getPositions(self, t, *bodies):
+
+        """ Berechnet die Positionen mehrerer Gruppen von Himmelskoerpern zu denselben Zeitpunkten mit einem
+        einzigen Aufruf der Ephemeride
+
+        :param t: Array von Zeitpunkten
+        :param bodies: pro Gruppe ein Index oder ein Array von Indizes passend zur Form von t
+        :return: Liste der Positionen pro Gruppe mit der Form (..., 3)
+        """
+
+        t = np.asarray(t, dtype=np.float64)
+        groups = [np.broadcast_to(np.asarray(group, dtype=np.intp), t.shape) for group in bodies]
+        positions = self.ephemeris.getBodyPositions(np.concatenate([t] * len(groups)), np.concatenate(groups))
+        return np.split(positions, len(groups))
+
+    def getDirections(self, relative):
+
+        """ Normiert Richtungsvektoren
+
+        :param relative: Vektoren mit der Form (..., 3)
+        :return: Einheitsvektoren derselben Form
+        """
+
+        return relative / np.maximum(np.linalg.norm(relative, axis=-1, keepdims=True), 1e-300)
+
+    def getShadowDistance(self, light, occluder, target, radius):
+
+        """ Berechnet den Abstand eines Mondes zum Schatten seines Planeten. Der Schatten wird als Zylinder mit dem
+        Radius des Planeten hinter dem Planeten angenaehert.
+
+        :param light: Positionen der Lichtquelle mit der Form (..., 3)
+        :param occluder: Positionen des Planeten mit der Form (..., 3)
+        :param target: Positionen des Mondes mit der Form (..., 3)
+        :param radius: Radius des Planeten
+        :return: Abstand, negativ wenn der Mond im Schatten liegt
+        """
+
+        axis = self.getDirections(occluder - light)
+        offset = target - occluder
+        along = np.sum(offset * axis, axis=-1)
+        across = np.linalg.norm(offset - along[..., np.newaxis] * axis, axis=-1)
+        return np.where(along > 0, across - radius, np.linalg.norm(offset, axis=-1))
+
+    def getCloseApproaches(self, times, positions, distance):
+
+        """ Sucht Annaeherungen innerhalb eines Fensters (siehe findCloseApproaches)
+
+        :param times: Abtastzeitpunkte des Fensters
+        :param positions: Positionen aller Himmelskoerper mit der Form (Zeitpunkte, Himmelskoerper, 3)
+        :param distance: Abstand, ab dem eine Annaeherung gemeldet wird
+        :return: Liste der Ereignisse
+        """
+
+        lower = positions.min(axis=0) - distance / 2.0
+        upper = positions.max(axis=0) + distance / 2.0
+        first, second = self.getPairs([(i, j) for i, j in self.sweepAndPrune(lower, upper, self.moving)
+                                       if not self.isRelated(i, j)])
+        values = np.linalg.norm(positions[:, first] - positions[:, second], axis=-1)
+        pairs, low, high = self.findMinima(times, values)
+
+        def function(t):
+            a, b = self.getPositions(t, first[pairs], second[pairs])
+            return np.linalg.norm(a - b, axis=-1)
+
+        names = self.ephemeris.names
+        t, value = self.minimize(function, low, high)
+        return [Event(float(t[k]), "closeApproach", (names[first[pair]], names[second[pair]]), float(value[k]))
+                for k, pair in enumerate(pairs) if value[k] < distance]
+
+    def getConjunctions(self, times, positions, centerIndex, angle):
+
+        """ Sucht Konjunktionen innerhalb eines Fensters (siehe findConjunctions)
+
+        :param times: Abtastzeitpunkte des Fensters
+        :param positions: Positionen aller Himmelskoerper mit der Form (Zeitpunkte, Himmelskoerper, 3)
+        :param centerIndex: Index des Himmelskoerpers, von dem aus gesehen wird
+        :param angle: Winkel in Grad, ab dem eine Konjunktion gemeldet wird
+        :return: Liste der Ereignisse
+        """
+
+        parents = self.ephemeris.getArrays()["parents"]
+        candidates = [i for i in self.moving if parents[i] == centerIndex]
+        chord = 2 * np.sin(np.radians(angle) / 2)
+
+        directions = self.getDirections(positions - positions[:, centerIndex:centerIndex + 1])
+        lower = directions.min(axis=0) - chord / 2
+        upper = directions.max(axis=0) + chord / 2
+        first, second = self.getPairs(self.sweepAndPrune(lower, upper, candidates))
+        values = np.degrees(np.arccos(np.clip(np.sum(directions[:, first] * directions[:, second], axis=-1), -1, 1)))
+        pairs, low, high = self.findMinima(times, values)
+
+        def function(t):
+            center, a, b = self.getPositions(t, centerIndex, first[pairs], second[pairs])
+            a, b = self.getDirections(a - center), self.getDirections(b - center)
+            return np.degrees(np.arccos(np.clip(np.sum(a * b, axis=-1), -1, 1)))
+
+        names = self.ephemeris.names
+        t, value = self.minimize(function, low, high)
+        return [Event(float(t[k]), "conjunction", (names[first[pair]], names[second[pair]]), float(value[k]))
+                for k, pair in enumerate(pairs) if value[k] < angle]
+
+    def getShadowCrossings(self, times, positions, overlapping, lightIndex):
+
+        """ Sucht die Zeitpunkte innerhalb eines Fensters, zu denen ein Mond in den Schatten seines Planeten ein- oder
+        austritt. Liegt ein Mond schon beim ersten Abtastpunkt der Suche im Schatten, zaehlt dieser als Eintritt.
+
+        :param times: Abtastzeitpunkte des Fensters
+        :param positions: Positionen aller Himmelskoerper mit der Form (Zeitpunkte, Himmelskoerper, 3)
+        :param overlapping: gibt an, ob der erste Abtastpunkt zum vorherigen Fenster gehoert
+        :param lightIndex: Index des Himmelskoerpers, der das Licht aussendet
+        :return: nach der Zeit sortierte Liste von (Zeitpunkt, Planet, Mond, Eintritt)
+        """
+
+        parents = self.ephemeris.getArrays()["parents"]
+        occluders, targets = self.getPairs([(parents[i], i) for i in self.moving
+                                            if parents[i] != lightIndex and parents[i] in self.moving])
+        radii = self.radii[occluders]
+        inside = self.getShadowDistance(positions[:, lightIndex:lightIndex + 1], positions[:, occluders],
+                                        positions[:, targets], radii) < 0
+
+        # Der Wechsel zwischen den ersten beiden Abtastpunkten wurde schon im vorherigen Fenster gefunden
+        changed = inside[1:] != inside[:-1]
+        if overlapping:
+            changed[0] = False
+        samples, pairs = np.nonzero(changed)
+
+        def function(t):
+            light, occluder, target = self.getPositions(t, lightIndex, occluders[pairs], targets[pairs])
+            return self.getShadowDistance(light, occluder, target, radii[pairs])
+
+        t = self.bisect(function, times[samples], times[samples + 1])
+        crossings = [(float(t[k]), occluders[pair], targets[pair], bool(inside[samples[k] + 1, pair]))
+                     for k, pair in enumerate(pairs)]
+        if not overlapping:
+            crossings += [(float(times[0]), occluders[pair], targets[pair], True) for pair in np.nonzero(inside[0])[0]]
+        return sorted(crossings, key=lambda crossing: crossing[0])
+
+    def getEclipses(self, crossings, begins):
+
+        """ Setzt Ein- und Austritte in den Schatten zu Finsternissen zusammen
+
+        :param crossings: nach der Zeit sortierte Ein- und Austritte (siehe getShadowCrossings)
+        :param begins: Dictionary der noch nicht beendeten Finsternisse mit dem Paar (Planet, Mond) als Schluessel und
+            dem Beginn als Wert, wird veraendert
+        :return: Liste der beendeten Finsternisse
+        """
+
+        names = self.ephemeris.names
+        events = []
+        for t, occluder, target, entering in crossings:
+            if entering:
+                begins[(occluder, target)] = t
+            elif (occluder, target) in begins:
+                begin = begins.pop((occluder, target))
+                events.append(Event(begin, "eclipse", (names[occluder], names[target]), t - begin))
+        return events
+
+    def getOpenEclipses(self, begins):
+
+        """ Gibt die Finsternisse zurueck, die bis zum Ende der Suche nicht beendet wurden
+
+        :param begins: Dictionary der noch nicht beendeten Finsternisse (siehe getEclipses)
+        :return: Liste der Finsternisse mit None als Dauer
+        """
+
+        names = self.ephemeris.names
+        return [Event(begin, "eclipse", (names[occluder], names[target]), None)
+                for (occluder, target), begin in begins.items()]
+
+    def findCloseApproaches(self, start, end, distance, step=None):
+
+        """ Sucht Zeitpunkte, zu denen sich zwei Himmelskoerper naeher als distance kommen. Paare, bei denen ein
+        Himmelskoerper den anderen umkreist, werden nicht beruecksichtigt.
+
+        :param start: Beginn der Suche
+        :param end: Ende der Suche
+        :param distance: Abstand, ab dem eine Annaeherung gemeldet wird
+        :param step: Abstand der Abtastpunkte
+        :return: Liste der Ereignisse mit dem kleinsten Abstand als Wert
+        """
+
+        events = []
+        for times, positions, overlapping in self.getWindows(start, end, step or self.getDefaultStep()):
+            events += self.getCloseApproaches(times, positions, distance)
+        return sorted(events, key=lambda event: event.time)
+
+    def findConjunctions(self, start, end, center, angle, step=None):
+
+        """ Sucht Zeitpunkte, zu denen zwei Himmelskoerper, die das Zentrum umkreisen, von diesem aus gesehen
+        weniger als angle Grad auseinander stehen. Im Sweep-and-Prune werden dafuer die Richtungsvektoren vom
+        Zentrum verwendet.
+
+        :param start: Beginn der Suche
+        :param end: Ende der Suche
+        :param center: Name des Himmelskoerpers, von dem aus gesehen wird
+        :param angle: Winkel in Grad, ab dem eine Konjunktion gemeldet wird
+        :param step: Abstand der Abtastpunkte
+        :return: Liste der Ereignisse mit dem kleinsten Winkel in Grad als Wert
+        """
+
+        centerIndex = self.ephemeris.index[center]
+        events = []
+        for times, positions, overlapping in self.getWindows(start, end, step or self.getDefaultStep()):
+            events += self.getConjunctions(times, positions, centerIndex, angle)
+        return sorted(events, key=lambda event: event.time)
+
+    def findEclipses(self, start, end, light, step=None):
+
+        """ Sucht Zeitpunkte, zu denen ein Mond in den Schatten seines Planeten tritt. Da nur Monde mit ihrem eigenen
+        Planeten verglichen werden, ist kein Sweep-and-Prune noetig.
+
+        :param start: Beginn der Suche
+        :param end: Ende der Suche
+        :param light: Name des Himmelskoerpers, der das Licht aussendet
+        :param step: Abstand der Abtastpunkte
+        :return: Liste der Ereignisse mit dem Beginn der Finsternis als Zeitpunkt und der Dauer als Wert (None,
+            falls die Finsternis nach dem Ende der Suche endet)
+        """
+
+        lightIndex = self.ephemeris.index[light]
+        begins = {}
+        events = []
+        for times, positions, overlapping in self.getWindows(start, end, step or self.getDefaultStep()):
+            events += self.getEclipses(self.getShadowCrossings(times, positions, overlapping, lightIndex), begins)
+        return sorted(events + self.getOpenEclipses(begins), key=lambda event: event.time)
+
+    def searchEvents(self, start, end, center, distance, angle, step=None):
+
+        """ Sucht alle Arten von Ereignissen Fenster fuer Fenster. Nach jedem Fenster werden die neu gefundenen
+        Ereignisse geliefert und der Zeitpunkt, bis zu dem alle Ereignisse gefunden wurden. Spaetere Fenster koennen
+        nur noch Ereignisse nach diesem Zeitpunkt liefern.
+
+        :param start: Beginn der Suche
+        :param end: Ende der Suche
+        :param center: Name des Himmelskoerpers im Zentrum, der auch das Licht aussendet
+        :param distance: Abstand, ab dem eine Annaeherung gemeldet wird
+        :param angle: Winkel in Grad, ab dem eine Konjunktion gemeldet wird
+        :param step: Abstand der Abtastpunkte
+        :return: Generator der Listen neuer Ereignisse und des vollstaendig durchsuchten Zeitpunkts pro Fenster
+        """
+
+        centerIndex = self.ephemeris.index[center]
+        begins = {}
+        for times, positions, overlapping in self.getWindows(start, end, step or self.getDefaultStep()):
+            events = (self.getCloseApproaches(times, positions, distance) +
+                      self.getConjunctions(times, positions, centerIndex, angle) +
+                      self.getEclipses(self.getShadowCrossings(times, positions, overlapping, centerIndex), begins))
+            # Das naechste Fenster findet Minima ab dem vorletzten Abtastpunkt, offene Finsternisse ab ihrem Beginn
+            yield events, min([times[max(len(times) - 2, 0)]] + list(begins.values()))
+        yield self.getOpenEclipses(begins), end
+
+    def findEvents(self, start, end, center, distance, angle, step=None):
+
+        """ Sucht alle Arten von Ereignissen und gibt sie nach der Zeit sortiert zurueck
+
+        :param start: Beginn der Suche
+        :param end: Ende der Suche
+        :param center: Name des Himmelskoerpers im Zentrum, der auch das Licht aussendet
+        :param distance: Abstand, ab dem eine Annaeherung gemeldet wird
+        :param angle: Winkel in Grad, ab dem eine Konjunktion gemeldet wird
+        :param step: Abstand der Abtastpunkte
+        :return: Liste der Ereignisse
+        """
+
+        events = []
+        for found, searched in self.searchEvents(start, end, center, distance, angle, step):
+            events += found
+        return sorted(events, key=lambda event: event.time)
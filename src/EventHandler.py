@@ -1,7 +1,12 @@
-from panda3d.core import AmbientLight, PointLight, VBase4, TextNode
+from panda3d.core import TextNode
 from direct.gui.OnscreenText import OnscreenText
 from direct.showbase.DirectObject import DirectObject
 from pandac.PandaModules import WindowProperties
+from MaterialHandler import *
+from InputHandler import *
+from EventDetector import *
+from direct.stdpy.threading import Lock
+from direct.task.Task import Task
 import sys
 
 class EventHandler(DirectObject):
@@ -9,23 +14,37 @@ class EventHandler(DirectObject):
     Diese Klasse ist fuer das Verwalten der Events zustaendig. Sobald eine bestimmte Taste gedrueckt beziehungsweise
     der Mauszeiger bewegt wurde, wird ein bestimmtes Event ausgefuehrt.
 
+    :ivar Engine engine: Dienste der Engine
     :ivar RuntimeHandler runtime: beinhaltet alle Himmelskoerper
     :ivar Camera camera: ermoeglicht den Umgang mit einer Kamera
     :ivar Luminary middle: stellt die Sonne dar
+    :ivar MaterialHandler material: steuert Licht und Textur ueber den gemeinsamen Shader
+    :ivar InputHandler input: verarbeitet die Tastendruecke laut der Tastenbelegung
+    :ivar list legendText: Liste der dargestellten Legendentexte
+    :ivar EventDetector detector: sucht Ereignisse auf der Zeitachse, None bis zum ersten Sprung
+    :ivar list events: noch nicht angesprungene Ereignisse, nach der Zeit sortiert
+    :ivar search: laufende Suche (siehe EventDetector.searchEvents), None wenn keine Suche laeuft
+    :ivar float searched: Zeitpunkt, bis zu dem die laufende Suche alle Ereignisse gefunden hat
+    :ivar float jumpAfter: Zeitpunkt, nach dem das naechste Ereignis angesprungen wird, None wenn kein Sprung
+        aussteht
+    :ivar Lock eventLock: schuetzt events, search und searched vor gleichzeitigem Zugriff durch die Suche
+    :ivar OnscreenText eventText: beschreibt das zuletzt angesprungene Ereignis
     :ivar boolean pointlightOn: Punktlichtquelle wird im Konstruktor auf "true" gesetzt
     :ivar boolean textureOn: Textur wird im Konstruktor auf "true" gesetzt
     :ivar boolean lightOn: dient zum Togglen des Lichts
     """
-    def __init__(self, runtime, camera, middle):
+    def __init__(self, engine, runtime, camera, middle):
         """
         Hier werden alle Attribute, welche zum Verwalten der Events benoetigt werden, initialisiert. Als Parameter
         werden Objekte vom RuntimeHandler, Camera und Luminary uebergeben. Ebenfalls werden die Methoden "setEvents"
         und "setLegend" aufgerufen.
 
+        :param engine: Dienste der Engine
         :param runtime: beinhaltet alle Himmelskoerper
         :param camera: ermoeglicht den Umgang mit einer Kamera
         :param middle: stellt die Sonne dar
         """
+        self.engine = engine
         self.runtime = runtime
         self.camera = camera
         self.middle = middle
@@ -33,74 +52,45 @@ class EventHandler(DirectObject):
         self.textureOn = True
         self.initializeLight()
         self.lightOn = True
+        self.detector = None
+        self.events = []
+        self.search = None
+        self.searched = None
+        self.jumpAfter = None
+        self.eventLock = Lock()
+        # Die Suche laeuft in einem eigenen Thread, damit die Darstellung nicht angehalten wird
+        self.engine.taskMgr.setupTaskChain("event-chain", numThreads=1)
+        self.eventText = None
 
         self.setEvents()
         self.setLegend()
 
     def initializeLight(self):
         """
-        In dieser Methode werden 3 Lichtarten initialisiert. Es wird ein AmbientLight auf die Sonne gesetzt und ebenfalls
-        ein AmbientLight und ein PointLight auf das gesamte System. Mittels "Vase4" wird hier eingestellt, wie stark
-        das Licht das jeweilige Objekt beleuchten soll (je hoeher die Zahl, desto staerker wird beleuchtet).
+        In dieser Methode wird das Licht initialisiert. Licht und Textur werden nicht ueber Lichtknoten im
+        Szenengraphen, sondern ueber einen gemeinsamen Shader dargestellt (siehe MaterialHandler). Die Sonne leuchtet
+        dabei selbst, alle anderen Himmelskoerper werden von einer Punktlichtquelle in der Sonne beleuchtet.
         """
-        self.sunLight = AmbientLight('slight')
-        self.sunLight.setColor(VBase4(1, 1, 1, 1))
-        sun = self.middle
-        slnp = sun.model.attachNewNode(self.sunLight)
-        sun.model.setLight(slnp)
-
-        alight = AmbientLight('alight')
-        alight.setColor(VBase4(0.2, 0.2, 0.2, 1))
-        self.alnp = render.attachNewNode(alight)
-
-        plight = PointLight('plight')
-        plight.setColor(VBase4(1, 1, 1, 1))
-        self.plnp = render.attachNewNode(plight)
-        self.plnp.setPos(0, 0, 0)
-        render.setLight(self.plnp)
+        self.material = MaterialHandler(self.engine.render, self.runtime.getAllLuminaries(), self.middle,
+                                        self.runtime.origin, self.engine.camLens.getFar())
 
     def setEvents(self):
         """
-        In dieser Methode wird explizit beschrieben, welche Funktion aufgerufen werden soll nachdem eine bestimmte
-        Taste gedrueckt wurde (z.B.: "sys.exit" soll nach Druecken von "escape" ausgefuehrt werden, um das Programm
-        zu beenden).
-        """
-        self.accept("escape", sys.exit)
-        self.accept("space", self.toggleSimulation)
-        self.accept("t", self.toggleTexture)
-        self.accept("l", self.toggleLight)
-        self.accept("+", self.fasterSimulation)
-        self.accept("-", self.slowerSimulation)
-        self.accept("r", self.restartSimulation)
-        self.accept("b", self.camera.birdPerspective)
-
-        self.accept("w", self.camera.setMouseBtn, [0, 1])
-        self.accept("arrow_up", self.camera.setMouseBtn, [0, 1])
-        self.accept("w-up", self.camera.setMouseBtn, [0, 0])
-        self.accept("arrow_up-up", self.camera.setMouseBtn, [0, 0])
-
-        self.accept("s", self.camera.setMouseBtn, [1, 1])
-        self.accept("arrow_down", self.camera.setMouseBtn, [1, 1])
-        self.accept("s-up", self.camera.setMouseBtn, [1, 0])
-        self.accept("arrow_down-up", self.camera.setMouseBtn, [1, 0])
-
-        self.accept("a", self.camera.setMouseBtn, [2, 1])
-        self.accept("arrow_left", self.camera.setMouseBtn, [2, 1])
-        self.accept("a-up", self.camera.setMouseBtn, [2, 0])
-        self.accept("arrow_left-up", self.camera.setMouseBtn, [2, 0])
-
-        self.accept("d", self.camera.setMouseBtn, [3, 1])
-        self.accept("arrow_right", self.camera.setMouseBtn, [3, 1])
-        self.accept("d-up", self.camera.setMouseBtn, [3, 0])
-        self.accept("arrow_right-up", self.camera.setMouseBtn, [3, 0])
-
-        self.accept("u", self.camera.setMouseBtn, [4, 1])
-        self.accept("u-up", self.camera.setMouseBtn, [4, 0])
-        self.accept("wheel_up", self.camera.setMouseBtn, [4, 1])
-
-        self.accept("j", self.camera.setMouseBtn, [5, 1])
-        self.accept("j-up", self.camera.setMouseBtn, [5, 0])
-        self.accept("wheel_down", self.camera.setMouseBtn, [5, 1])
+        In dieser Methode wird beschrieben, welche Funktion zu welcher Aktion der Tastenbelegung gehoert (z.B.: "quit"
+        fuehrt "sys.exit" aus, um das Programm zu beenden). Welche Taste welche Aktion ausloest, steht in der Datei
+        "keymap.cfg". Bewegungen und Zoom werden direkt vom InputHandler an die Kamera weitergegeben.
+        """
+        self.input = InputHandler(self.engine, self.camera, {
+            "quit": sys.exit,
+            "toggle": self.toggleSimulation,
+            "texture": self.toggleTexture,
+            "light": self.toggleLight,
+            "faster": self.fasterSimulation,
+            "slower": self.slowerSimulation,
+            "restart": self.restartSimulation,
+            "bird": self.camera.birdPerspective,
+            "nextEvent": self.nextEvent,
+        })
 
     def genLabelText(self, text, i):
         """
@@ -112,75 +102,33 @@ class EventHandler(DirectObject):
         :return: stellt die Beschreibung am Programm dar
         """
         return OnscreenText(text=text, pos=(-1.3, .95 - .05 * i), fg=(1, 1, 1, 1),
-                            align=TextNode.ALeft, scale=.05, mayChange=1)
+                            align=TextNode.ALeft, scale=.05, mayChange=1, parent=self.engine.aspect2d)
 
     def setLegend(self):
         """
         Hier werden die jeweiligen Hilfestellungen zum Verwalten der Events beschrieben und an einer bestimmten Position
-        gesetzt (in diesem Fall handelt es sich lediglich um eine fortlaufende Nummer). Fuer jede einzelne
-        Textbeschreibung muss die Methode "genLabelText" aufgerufen werden.
-        """
-        self.escEventText = self.genLabelText(
-            "ESC: Quit program", 0)
-        self.spaceEventText = self.genLabelText(
-            "Space: Toggle entire Solar System", 1)
-        self.tEventText = self.genLabelText(
-            "T: Toggle the Texture", 2)
-        self.lEventText = self.genLabelText(
-            "L: Toggle the Point-Light Source", 3)
-        self.nEventText = self.genLabelText(
-            "+: Make the simulation faster", 4)
-        self.mEventText = self.genLabelText(
-            "-: Make the simulation slower", 5)
-        self.lEventText = self.genLabelText(
-            "W|Arrow-up: Go forward", 6)
-        self.bEventText = self.genLabelText(
-            "B: Bird's-eye view", 7)
-        self.lEventText = self.genLabelText(
-            "S|Arrow-down: Go backward", 8)
-        self.lEventText = self.genLabelText(
-            "A|Arrow-left: Go left", 9)
-        self.lEventText = self.genLabelText(
-            "D|Arrow-right: Go right", 10)
-        self.lEventText = self.genLabelText(
-            "U: Go upward", 11)
-        self.lEventText = self.genLabelText(
-            "J: Go downward", 12)
+        gesetzt (in diesem Fall handelt es sich lediglich um eine fortlaufende Nummer). Die Texte werden aus der
+        Tastenbelegung erzeugt, fuer jeden Text wird die Methode "genLabelText" aufgerufen.
+        """
+        self.legendText = [self.genLabelText(text, i) for i, text in enumerate(self.input.getLegend())]
 
     def toggleLight(self):
         """
         Diese Methode dient zum Verwalten der Punktlichtquelle. Je nachdem, ob das Attribut "lightOn" true oder false
-        ist, wird entweder das AmbientLight von der Sonne staerker oder schwaecher gesetzt. Ebenfalls wird entweder
-        ein AmbientLight oder ein PointLight auf das gesamte System gesetzt.
-        """
-        if self.lightOn == True:
-            self.sunLight.setColor(VBase4(0.2, 0.2, 0.2, 1))
-            render.setLightOff()
-            render.setLight(self.alnp)
-            self.lightOn = False
-        else:
-            self.sunLight.setColor(VBase4(1, 1, 1, 1))
-            render.setLightOff()
-            render.setLight(self.plnp)
-            self.lightOn = True
+        ist, wird entweder die Punktlichtquelle oder das Umgebungslicht aktiviert und die Sonne leuchtet staerker
+        oder schwaecher. Dabei wird nur ein Shader-Input geaendert.
+        """
+        self.lightOn = not self.lightOn
+        self.material.setLight(self.lightOn)
 
     def toggleTexture(self):
         """
         Diese Methode dient zum Verwalten der Textur. Je nachdem, ob das Attribut "textureOn" true oder false ist,
-        wird die Textur entweder ein- oder ausgeschaltet. Davor werden alle Himmelskoerper geholt, damit die
-        Aenderungen fuer jeden Himmelskoerper aktiv werden.
-        """
-        luminaries = self.runtime.getAllLuminaries()
-        if self.textureOn == True:
-            for luminary in luminaries:
-                if luminaries[luminary].textureToggle==True:
-                    luminaries[luminary].model.clearTexture()
-            self.textureOn = False
-        else:
-            for luminary in luminaries:
-                if luminaries[luminary].textureToggle==True:
-                    luminaries[luminary].model.setTexture(loader.loadTexture(luminaries[luminary].texturePath), 1)
-            self.textureOn = True
+        wird die Textur entweder ein- oder ausgeschaltet. Himmelskoerper, deren Textur nicht togglen soll, behalten
+        ihre Textur. Dabei wird nur ein Shader-Input geaendert.
+        """
+        self.textureOn = not self.textureOn
+        self.material.setTexture(self.textureOn)
 
     def restartSimulation(self):
         """
@@ -207,3 +155,78 @@ class EventHandler(DirectObject):
         """
         self.runtime.slowerPlaying()
 
+    def nextEvent(self, horizon=120, distance=1.0, angle=2.0):
+        """
+        Moechte man zum naechsten Ereignis (Annaeherung, Konjunktion oder Finsternis) springen (mittels der Taste "N"),
+        wird diese Funktion aufgerufen. Die Ereignisse werden beim ersten Aufruf bzw. wenn alle angesprungen wurden
+        fuer die naechsten "horizon" Sekunden Simulationszeit gesucht. Die Suche laeuft Fenster fuer Fenster als Task
+        in der "event-chain" (siehe searchEvents), gesprungen wird, sobald das naechste Ereignis sicher feststeht
+        (siehe jumpToEvent). Die Simulation wird am Ereignis angehalten und die Kamera schaut auf den zuletzt
+        genannten Himmelskoerper.
+
+        :param horizon: Zeitraum, in dem Ereignisse gesucht werden
+        :param distance: Abstand, ab dem eine Annaeherung gemeldet wird
+        :param angle: Winkel in Grad, ab dem eine Konjunktion gemeldet wird
+        """
+        now = self.runtime.time
+        with self.eventLock:
+            self.events = [event for event in self.events if event.time > now]
+            if not self.events and self.search is None:
+                if self.detector is None:
+                    self.detector = EventDetector(self.runtime.ephemeris, self.runtime.getRadii())
+                self.search = self.detector.searchEvents(now, now + horizon, self.middle.name, distance, angle)
+                self.searched = now
+                self.engine.taskMgr.add(self.searchEvents, "event-search-task", taskChain="event-chain")
+        if self.jumpAfter is None:
+            self.engine.taskMgr.add(self.jumpToEvent, "event-jump-task")
+        self.jumpAfter = now
+
+    def searchEvents(self, task):
+        """
+        Durchsucht pro Aufruf ein Fenster der Zeitachse und fuegt die gefundenen Ereignisse zu "events" hinzu. Laeuft
+        in der "event-chain", also neben der Darstellung.
+
+        :param task: Gibt an, welche Funktion diese Methode uebernehmen soll
+        """
+        found, searched = next(self.search, ([], None))
+        with self.eventLock:
+            self.events = sorted(self.events + found, key=lambda event: event.time)
+            if searched is None:
+                self.search = None
+                return Task.done
+            self.searched = searched
+        return Task.cont
+
+    def jumpToEvent(self, task):
+        """
+        Springt zum ersten Ereignis nach "jumpAfter", sobald die Suche kein frueheres Ereignis mehr finden kann. Ist
+        die Suche ohne passendes Ereignis beendet, wird nicht gesprungen.
+
+        :param task: Gibt an, welche Funktion diese Methode uebernehmen soll
+        """
+        with self.eventLock:
+            self.events = [event for event in self.events if event.time > self.jumpAfter]
+            if self.search is not None and not (self.events and self.events[0].time <= self.searched):
+                return Task.cont
+            event = self.events.pop(0) if self.events else None
+        self.jumpAfter = None
+        if event is not None:
+            self.showEvent(event)
+        return Task.done
+
+    def showEvent(self, event):
+        """
+        Setzt die Simulation auf den Zeitpunkt eines Ereignisses, haelt sie an und beschreibt das Ereignis am
+        Bildschirm.
+
+        :param event: das Ereignis
+        """
+        self.runtime.setTime(event.time)
+        self.runtime.playing = False
+        self.camera.lookAt(*self.runtime.getScenePosition(event.bodies[-1]))
+
+        if self.eventText:
+            self.eventText.destroy()
+        self.eventText = OnscreenText(text="%s: %s (t = %.2f)" % (event.kind, " / ".join(event.bodies), event.time),
+                                      pos=(1.3, -.95), fg=(1, 1, 1, 1), align=TextNode.ARight, scale=.05,
+                                      parent=self.engine.aspect2d)
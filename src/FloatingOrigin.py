@@ -0,0 +1,83 @@
+import numpy as np
+
+
+class FloatingOrigin(object):
+
+    """ Verschiebt den Ursprung der dargestellten Szene mit der Kamera mit. Die Simulation rechnet mit absoluten
+    Positionen in doppelter Genauigkeit, dargestellt wird aber nur die Position relativ zum Ursprung. Entfernt sich
+    die Kamera zu weit vom Ursprung, wird der Ursprung auf die Kamera gesetzt. So bleiben die Werte im Szenengraphen
+    klein und die einfache Genauigkeit von Panda3D reicht aus.
+
+    :ivar ndarray origin: absolute Position des Ursprungs der Szene
+    :ivar float threshold: Abstand der Kamera zum Ursprung, ab dem der Ursprung verschoben wird
+    :ivar list listeners: Funktionen, die bei einer Verschiebung mit der Verschiebung aufgerufen werden
+
+    """
+
+    def __init__(self, threshold=100):
+
+        """ Initialisiert den Ursprung im absoluten Nullpunkt
+
+        :param threshold: Abstand der Kamera zum Ursprung, ab dem der Ursprung verschoben wird
+        """
+
+        self.origin = np.zeros(3)
+        self.threshold = threshold
+        self.listeners = []
+
+    def addListener(self, listener):
+
+        """ Registriert eine Funktion, die bei jeder Verschiebung aufgerufen wird
+
+        :param listener: Funktion, die die Verschiebung als Array erhaelt
+        """
+
+        self.listeners.append(listener)
+
+    def toWorld(self, x, y, z):
+
+        """ Rechnet eine Position der Szene in eine absolute Position um
+
+        :param x: Position in der Szene auf der x-Achse
+        :param y: Position in der Szene auf der y-Achse
+        :param z: Position in der Szene auf der z-Achse
+        :return: absolute Position
+        """
+
+        return self.origin + (x, y, z)
+
+    def toScene(self, position):
+
+        """ Rechnet absolute Positionen in Positionen der Szene um
+
+        :param position: absolute Position oder Array von Positionen
+        :return: Positionen relativ zum Ursprung
+        """
+
+        return np.asarray(position, dtype=np.float64) - self.origin
+
+    def recenter(self, x, y, z):
+
+        """ Verschiebt den Ursprung auf die Position der Kamera, falls diese zu weit entfernt ist
+
+        :param x: Position der Kamera in der Szene auf der x-Achse
+        :param y: Position der Kamera in der Szene auf der y-Achse
+        :param z: Position der Kamera in der Szene auf der z-Achse
+        :return: True, wenn der Ursprung verschoben wurde
+        """
+
+        if x * x + y * y + z * z <= self.threshold * self.threshold:
+            return False
+        self.shift(np.array([x, y, z], dtype=np.float64))
+        return True
+
+    def shift(self, delta):
+
+        """ Verschiebt den Ursprung und benachrichtigt alle registrierten Funktionen
+
+        :param delta: Verschiebung relativ zum aktuellen Ursprung
+        """
+
+        self.origin = self.origin + delta
+        for listener in self.listeners:
+            listener(delta)
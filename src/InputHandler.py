@@ -0,0 +1,177 @@
+from direct.task.Task import Task
+from direct.showbase.DirectObject import DirectObject
+import os
+
+try:
+    from configparser import RawConfigParser
+except ImportError:
+    from ConfigParser import RawConfigParser
+
+
+class InputHandler(DirectObject):
+
+    """ Liest die Tastenbelegung aus einer Konfigurationsdatei und reiht alle Tastendruecke als Aktionen in eine
+    Warteschlange ein. Die Warteschlange wird einmal pro Frame abgearbeitet und dabei zusammengefasst, bevor die
+    Aktionen an die Kamera bzw. die Befehle weitergegeben werden. Aktionen koennen auch direkt ueber pushAction
+    eingereiht werden, z.B. um Eingaben automatisiert abzuspielen.
+
+    :ivar Engine engine: Dienste der Engine
+    :ivar Camera camera: ermoeglicht den Umgang mit einer Kamera
+    :ivar dictionary commands: Befehle, die einer Aktion zugeordnet sind
+    :ivar list keymap: Liste der Tasten mit der jeweils zugeordneten Aktion
+    :ivar list legend: Liste der Aktionen mit der jeweiligen Beschreibung
+    :ivar list queue: Liste der noch nicht abgearbeiteten Aktionen
+
+    """
+
+    #: Aktionen, die einer Zoomrichtung entsprechen
+    ZOOM_ACTIONS = {"zoomIn": 1, "zoomOut": -1}
+
+    #: Anzeigenamen von Tasten, die nicht aus dem Tastennamen abgeleitet werden koennen
+    KEY_NAMES = {"escape": "ESC"}
+
+    def __init__(self, engine, camera, commands, keymapPath=None):
+
+        """ Ladet die Tastenbelegung, registriert die Tasten und startet die Abarbeitung der Warteschlange. Diese
+        wird vor der Steuerung der Kamera ausgefuehrt.
+
+        :param engine: Dienste der Engine
+        :param camera: ermoeglicht den Umgang mit einer Kamera
+        :param commands: Befehle, die einer Aktion zugeordnet sind
+        :param keymapPath: gibt den Pfad zur Tastenbelegung an, ohne Angabe keymap.cfg neben diesem Modul
+        """
+
+        self.engine = engine
+        self.camera = camera
+        self.commands = commands
+        self.queue = []
+        self.loadKeymap(keymapPath or os.path.join(os.path.dirname(os.path.abspath(__file__)), "keymap.cfg"))
+        self.setEvents()
+
+        self.engine.taskMgr.add(self.processActions, "input-task", sort=-1)
+
+    def loadKeymap(self, path):
+
+        """ Ladet die Tastenbelegung und die Legende aus der angegebenen Datei
+
+        :param path: gibt den Pfad zur Tastenbelegung an
+        """
+
+        config = RawConfigParser()
+        config.optionxform = str
+        if not config.read(path):
+            raise IOError("Tastenbelegung %s konnte nicht geladen werden" % path)
+
+        self.keymap = config.items("keys")
+        self.legend = config.items("legend") if config.has_section("legend") else []
+
+        for key, action in self.keymap:
+            if not self.isKnownAction(action):
+                raise ValueError("Unbekannte Aktion '%s' fuer die Taste '%s'" % (action, key))
+
+    def isKnownAction(self, action):
+
+        """ Ueberprueft, ob eine Aktion verarbeitet werden kann
+
+        :param action: Name der Aktion
+        :return: True, wenn die Aktion bekannt ist
+        """
+
+        return action in self.camera.MOVES or action in self.ZOOM_ACTIONS or action in self.commands
+
+    def setEvents(self):
+
+        """ Registriert alle Tasten der Tastenbelegung. Bei Bewegungen wird auch das Loslassen der Taste
+        registriert.
+
+        """
+
+        for key, action in self.keymap:
+            if action in self.camera.MOVES:
+                self.accept(key, self.pushAction, [action, 1])
+                self.accept(key + "-up", self.pushAction, [action, 0])
+            else:
+                self.accept(key, self.pushAction, [action, 1])
+
+    def pushAction(self, action, value=1):
+
+        """ Reiht eine Aktion in die Warteschlange ein
+
+        :param action: Name der Aktion
+        :param value: Wert der Aktion (bei Bewegungen 1 fuer gedrueckt und 0 fuer losgelassen)
+        """
+
+        self.queue.append((action, value))
+
+    def coalesceActions(self, actions):
+
+        """ Fasst die Aktionen eines Frames zusammen. Bei Bewegungen zaehlt nur der letzte Zustand, Zoomschritte
+        werden zu einem Wert aufsummiert und Befehle bleiben in ihrer Reihenfolge erhalten.
+
+        :param actions: Liste der Aktionen eines Frames
+        :return: Bewegungszustaende, Zoomwert und Liste der Befehle
+        """
+
+        moves = {}
+        zoom = 0
+        commands = []
+        for action, value in actions:
+            if action in self.camera.MOVES:
+                moves[action] = value
+            elif action in self.ZOOM_ACTIONS:
+                zoom += self.ZOOM_ACTIONS[action] * value
+            else:
+                commands.append(action)
+        return moves, zoom, commands
+
+    def processQueue(self):
+
+        """ Arbeitet alle eingereihten Aktionen zusammengefasst ab
+
+        """
+
+        actions, self.queue = self.queue, []
+        moves, zoom, commands = self.coalesceActions(actions)
+
+        for action in moves:
+            self.camera.setMove(action, moves[action])
+        if zoom:
+            self.camera.zoom(zoom)
+        for action in commands:
+            self.commands[action]()
+
+    def processActions(self, task):
+
+        """ Arbeitet die Warteschlange einmal pro Frame ab
+
+        :param task: Gibt an, welche Funktion diese Methode uebernehmen soll
+        """
+
+        self.processQueue()
+        return Task.cont
+
+    def getKeyName(self, key):
+
+        """ Gibt den Anzeigenamen einer Taste zurueck (z.B. "Arrow-up" fuer "arrow_up")
+
+        :param key: Name der Taste
+        :return: Anzeigename der Taste
+        """
+
+        if key in self.KEY_NAMES:
+            return self.KEY_NAMES[key]
+        return key.replace("_", "-").capitalize()
+
+    def getLegend(self):
+
+        """ Erzeugt die Legende aus der Tastenbelegung. Aktionen ohne Taste werden nicht angezeigt.
+
+        :return: Liste der Legendentexte
+        """
+
+        lines = []
+        for action, text in self.legend:
+            keys = [self.getKeyName(key) for key, keyAction in self.keymap if keyAction == action]
+            if keys:
+                lines.append("%s: %s" % ("|".join(keys), text))
+        return lines
@@ -0,0 +1,125 @@
+import numpy as np
+
+
+class KeplerSolver(object):
+
+    """ Loest die Kepler-Gleichung E - e * sin(E) = M fuer viele Himmelskoerper gleichzeitig mit dem
+    Newton-Verfahren. Die Loesung des letzten Aufrufs wird gespeichert und beim naechsten Aufruf als Startwert
+    verwendet. Da sich die mittlere Anomalie zwischen zwei Frames kaum aendert, genuegen dann ein bis zwei
+    Iterationen.
+
+    Die Iteration bricht ab, sobald der nach dem letzten Schritt verbleibende Fehler unter tolerance liegt. Weil das
+    Newton-Verfahren quadratisch konvergiert, laesst sich dieser Fehler aus der Schrittweite abschaetzen, ohne einen
+    weiteren Schritt nur zur Bestaetigung auszufuehren.
+
+    :ivar float tolerance: maximaler geschaetzter Fehler von E, ab dem die Iteration abbricht
+    :ivar int maxIterations: maximale Anzahl der Iterationen
+    :ivar float maxWarmStep: groesste Aenderung der mittleren Anomalie, bei der die letzte Loesung als Startwert
+        verwendet wird
+    :ivar ndarray lastMean: mittlere Anomalien des letzten Aufrufs mit Startwert
+    :ivar ndarray lastEccentric: exzentrische Anomalien des letzten Aufrufs mit Startwert
+    :ivar int iterations: Anzahl der Iterationen des letzten Aufrufs
+
+    """
+
+    def __init__(self, tolerance=1e-12, maxIterations=30, maxWarmStep=0.5):
+
+        """ Initialisiert den Solver ohne Startwert
+
+        :param tolerance: maximaler geschaetzter Fehler von E, ab dem die Iteration abbricht
+        :param maxIterations: maximale Anzahl der Iterationen
+        :param maxWarmStep: groesste Aenderung der mittleren Anomalie, bei der die letzte Loesung als Startwert
+            verwendet wird
+        """
+
+        self.tolerance = tolerance
+        self.maxIterations = maxIterations
+        self.maxWarmStep = maxWarmStep
+        self.lastMean = None
+        self.lastEccentric = None
+        self.iterations = 0
+
+    def normalize(self, angle):
+
+        """ Bringt Winkel in den Bereich von -pi bis pi
+
+        :param angle: Winkel im Bogenmass
+        :return: normalisierte Winkel
+        """
+
+        return (angle + np.pi) % (2 * np.pi) - np.pi
+
+    def getColdStart(self, mean, eccentricity):
+
+        """ Gibt einen Startwert ohne Kenntnis einer frueheren Loesung zurueck. Bei grosser Exzentrizitaet wird pi
+        verwendet, weil das Newton-Verfahren dort sonst langsam konvergiert.
+
+        :param mean: normalisierte mittlere Anomalien
+        :param eccentricity: Exzentrizitaeten
+        :return: Startwerte fuer E
+        """
+
+        return np.where(eccentricity < 0.8, mean + eccentricity * np.sin(mean), np.pi * np.sign(mean))
+
+    def getWarmStart(self, mean, eccentricity):
+
+        """ Gibt einen Startwert aus der letzten Loesung zurueck. Die Aenderung der mittleren Anomalie wird mit der
+        ersten und zweiten Ableitung von E nach M auf E uebertragen, der Fehler des Startwerts waechst also nur mit
+        der dritten Potenz der Aenderung. Damit die Iteration nicht ueber die Grenze bei pi springt,
+        wird die mittlere Anomalie relativ zur letzten Loesung fortgesetzt statt neu normalisiert. Hat sich die
+        mittlere Anomalie zu stark geaendert (z.B. nach einem Zuruecksetzen), wird der Startwert ohne letzte
+        Loesung verwendet.
+
+        :param mean: normalisierte mittlere Anomalien
+        :param eccentricity: Exzentrizitaeten
+        :return: Startwerte fuer E und die dazu passenden mittleren Anomalien, None falls keine passende letzte
+            Loesung existiert
+        """
+
+        if self.lastEccentric is None or self.lastEccentric.shape != mean.shape:
+            return None
+        delta = self.normalize(mean - self.lastMean)
+        near = np.abs(delta) < self.maxWarmStep
+        # dE/dM = 1 / (1 - e cos E) und d2E/dM2 = -e sin E / (1 - e cos E)^3
+        slope = 1 / (1 - eccentricity * np.cos(self.lastEccentric))
+        curvature = -eccentricity * np.sin(self.lastEccentric) * slope ** 3
+        start = np.where(near, self.lastEccentric + delta * slope + 0.5 * curvature * delta ** 2,
+                         self.getColdStart(mean, eccentricity))
+        return start, np.where(near, self.lastMean + delta, mean)
+
+    def solve(self, mean, eccentricity, warmStart=False):
+
+        """ Loest die Kepler-Gleichung fuer alle Eintraege
+
+        :param mean: mittlere Anomalien im Bogenmass
+        :param eccentricity: Exzentrizitaeten zwischen 0 und 1, muss sich auf die Form von mean erweitern lassen
+        :param warmStart: gibt an, ob die letzte Loesung als Startwert verwendet und die neue Loesung gespeichert wird
+        :return: exzentrische Anomalien im Bereich von -pi bis pi
+        """
+
+        mean = self.normalize(np.asarray(mean, dtype=np.float64))
+        eccentricity = np.broadcast_to(np.asarray(eccentricity, dtype=np.float64), mean.shape)
+
+        warm = self.getWarmStart(mean, eccentricity) if warmStart else None
+        if warm is None:
+            eccentric = self.getColdStart(mean, eccentricity)
+        else:
+            eccentric, mean = warm
+
+        # Lokal gezaehlt, weil dieselbe Ephemeride auch von der Suche nach Ereignissen verwendet wird
+        iterations = 0
+        while iterations < self.maxIterations:
+            iterations += 1
+            derivative = 1 - eccentricity * np.cos(eccentric)
+            step = (eccentric - eccentricity * np.sin(eccentric) - mean) / derivative
+            eccentric = eccentric - step
+            # Nach einem Newton-Schritt bleibt hoechstens etwa f''/(2 f') * step^2 als Fehler, mit |f''| <= e
+            if not step.size or np.max(eccentricity / (2 * derivative) * step * step) < self.tolerance:
+                break
+
+        self.iterations = iterations
+        eccentric = self.normalize(eccentric)
+        if warmStart:
+            self.lastMean = self.normalize(mean)
+            self.lastEccentric = eccentric
+        return eccentric
@@ -1,32 +1,61 @@
 class Luminary(object):
     """
     Diese Klasse stellt einen bestimmten Himmelskoerper dar. Dabei werden alle Eigenschaften, die zum Initialisieren
-    eines Himmelskoerpers angegeben werden muessen, als Parameter uebergeben.
+    eines Himmelskoerpers angegeben werden muessen, als Parameter uebergeben. Das Modell wird erst mit loadModel
+    geladen, damit die Himmelskoerper auch ohne Fenster beschrieben werden koennen.
     """
-    def __init__(self, name, texturePath, modelPath, initPosition, scale, children, selfRotate, orbitRotate, textureToggle):
+    def __init__(self, name, texturePath, modelPath, initPosition, scale, children, selfRotate, orbitRotate, textureToggle, atlas=None,
+                 eccentricity=0, inclination=0, node=0, periapsis=0, meanAnomaly=0):
         """
         Hier werden alle Attribute, welche zum Erzeugen eines Himmelskoerpers benoetigt werden, initialisiert.
 
         :param name: Name des Himmelskoerpers
         :param texturePath: gibt den Pfad an, wo sich die Textur befindet
         :param modelPath: gibt den Pfad zum Objekt an, welche die Form des Himmelskoerpers angibt
-        :param initPosition: initiale Position des Himmelskoerpers
+        :param initPosition: grosse Halbachse der Umlaufbahn um den Elternkoerper
         :param scale: gibt die Groesse des Himmelskoerpers an
         :param children: dient zur Definition der Kinder, die der jeweilige Himmelskoerper besitzt
         :param selfRotate: gibt an, wie schnell sich der Himmelskoerper um sich selbst drehen soll
         :param orbitRotate: gibt an, wie schnell sich der Himmelskoerper um die Laufbahn drehen soll
         :param textureToggle: dient zur Definition, welche Texturen von Himmelskoerpern togglen sollen und welche nicht
+        :param atlas: gemeinsame Textur, in der die Textur unter dem Namen texturePath liegt. Ohne Atlas wird die
+            Textur von texturePath geladen
+        :param eccentricity: Exzentrizitaet der Umlaufbahn (0 fuer eine Kreisbahn)
+        :param inclination: Neigung der Umlaufbahn gegenueber der xy-Ebene in Grad
+        :param node: Laenge des aufsteigenden Knotens in Grad
+        :param periapsis: Argument der Periapsis in Grad
+        :param meanAnomaly: mittlere Anomalie zum Zeitpunkt 0 in Grad
         """
         self.orbitRotate = orbitRotate
         self.selfRotate = selfRotate
         self.children = children
         self.name = name
+        self.scale = scale
         self.initPosition = initPosition
         self.texturePath = texturePath
+        self.modelPath = modelPath
         self.textureToggle = textureToggle
+        self.atlas = atlas
+        self.eccentricity = eccentricity
+        self.inclination = inclination
+        self.node = node
+        self.periapsis = periapsis
+        self.meanAnomaly = meanAnomaly
+        self.model = None
 
-        self.model = loader.loadModel(modelPath)
-        self.model.setTexture(loader.loadTexture(texturePath), 1)
-        self.model.setScale(scale)
-        if (initPosition):
-            self.model.setPos(initPosition, 0, 0)
+    def loadModel(self, loader):
+        """
+        Ladet das Modell und die Textur des Himmelskoerpers, falls das noch nicht geschehen ist.
+
+        :param loader: ladet Modelle und Texturen
+        :return: das geladene Modell
+        """
+        if self.model is None:
+            self.model = loader.loadModel(self.modelPath)
+            if self.atlas:
+                self.model.setTexture(self.atlas.getTexture(), 1)
+                self.model.setShaderInput("atlasRegion", self.atlas.getRegion(self.texturePath))
+            else:
+                self.model.setTexture(loader.loadTexture(self.texturePath), 1)
+            self.model.setScale(self.scale)
+        return self.model
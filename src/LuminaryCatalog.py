@@ -0,0 +1,101 @@
+from Luminary import *
+import random
+
+
+class LuminaryCatalog(object):
+
+    """ Definiert alle Himmelskoerper des Solarsystems und ihre Hierarchie. Die Himmelskoerper werden nur
+    beschrieben, ihre Modelle werden erst beim Hinzufuegen zum RuntimeHandler geladen. Dadurch kann die Hierarchie
+    auch ohne Fenster verwendet werden (z.B. fuer den Export der Positionen).
+
+    :ivar int yearscale: die Dauer einer Umdrehung um den Mittelpunkt
+    :ivar int dayscale: die Dauer fuer eine Umdrehung um sich selbst
+    :ivar int orbitscale: die Groesse der Umlaufbahn
+    :ivar int sizescale: die Groesse des Himmelskoerpers
+    :ivar int skySize: die Groesse des Weltraums
+    :ivar float originThreshold: Abstand der Kamera zum Ursprung der Szene, ab dem dieser verschoben wird
+    :ivar int asteroidCount: die Anzahl der kuenstlichen Asteroiden im Asteroidenguertel
+    :ivar ProceduralTexture textureFactory: erzeugt die Texturen der kuenstlichen Asteroiden, None fuer keine Texturen
+
+    """
+
+    #: Verhaeltnis einer astronomischen Einheit zum Radius der Erde
+    AU_PER_EARTH_RADIUS = 149597870.7 / 6371.0
+
+    def __init__(self, asteroidCount=0, textureFactory=None, realistic=False):
+
+        """ Initialisiert die Groessen und Geschwindigkeiten des Solarsystems. Im realistischen Massstab ist eine
+        Einheit der Umlaufbahn (orbitscale) eine astronomische Einheit im richtigen Verhaeltnis zur Groesse der Erde
+        (sizescale), der Weltraum waechst entsprechend mit.
+
+        :param asteroidCount: die Anzahl der kuenstlichen Asteroiden im Asteroidenguertel
+        :param textureFactory: erzeugt die Texturen der kuenstlichen Asteroiden (siehe ProceduralTexture), None fuer
+            keine Texturen
+        :param realistic: gibt an, ob die Umlaufbahnen im realistischen Massstab erstellt werden
+        """
+
+        # The global variables we used to control the speed and size of objects
+        self.yearscale = 60
+        self.dayscale = self.yearscale / 365.0 * 5
+        self.orbitscale = 10
+        self.sizescale = 0.6
+        self.skySize = 80
+        if realistic:
+            self.orbitscale = self.sizescale * self.AU_PER_EARTH_RADIUS
+            self.skySize = 8 * self.orbitscale
+        # Der Ursprung wandert nach jeder astronomischen Einheit mit, damit Positionen nahe der Kamera klein bleiben
+        self.originThreshold = self.orbitscale
+        self.asteroidCount = asteroidCount
+        self.textureFactory = textureFactory
+
+    def createLuminaries(self):
+
+        """ Erstellt die definierten Himmelskoerper und stellt Assoziationen zwischen diesen dar. Die Bahnelemente der
+        inneren Planeten und des Mondes entsprechen gerundet den realen Werten (J2000)
+
+        :return: der Weltraum, der alle anderen Himmelskoerper enthaelt
+        """
+
+        mercury = Luminary("mercury", "models/mercury_1k_tex.jpg", "models/planet_sphere", 0.38 * self.orbitscale, 0.385 * self.sizescale, None, 59 * self.dayscale, 0.241 * self.yearscale, True, eccentricity=0.206, inclination=7.0, node=48.3, periapsis=29.1, meanAnomaly=174.8)
+        venus = Luminary("venus", "models/venus_1k_tex.jpg", "models/planet_sphere", 0.72 * self.orbitscale, 0.923 * self.sizescale, None, 243 * self.dayscale, 0.615 * self.yearscale, True, eccentricity=0.007, inclination=3.4, node=76.7, periapsis=54.9, meanAnomaly=50.1)
+        mars = Luminary("mars", "models/mars_1k_tex.jpg", "models/planet_sphere", 1.52 * self.orbitscale, 0.515 * self.sizescale, None, 1.03 * self.dayscale, 1.881 * self.yearscale, True, eccentricity=0.093, inclination=1.85, node=49.6, periapsis=286.5, meanAnomaly=19.4)
+        moon = Luminary("moon", "models/moon_1k_tex.jpg", "models/planet_sphere", 0.1 * self.orbitscale, 0.1 * self.sizescale, None, .0749 * self.yearscale, .0749 * self.yearscale, True, eccentricity=0.055, inclination=5.1)
+        asteroid = Luminary("asteroid", "models/asteroid.jpg", "models/planet_sphere", 0.3 * self.orbitscale, 0.5 * self.sizescale, None, .0749 * self.yearscale, .0749 * self.yearscale, True)
+        earth = Luminary("earth", "models/earth_1k_tex.jpg", "models/planet_sphere", self.orbitscale, self.sizescale, [moon], self.dayscale, self.yearscale, True, eccentricity=0.017, periapsis=102.9, meanAnomaly=358.6)
+        gas = Luminary("gas", "models/gas-planet.png", "models/planet_sphere", 2 * self.orbitscale, 1.5 * self.sizescale, [asteroid], 300*self.dayscale, 3*self.yearscale, True)
+        ice = Luminary("ice", "models/ice.jpg", "models/planet_sphere", 1.4 * self.orbitscale, 3 * self.sizescale, None, 0.5*self.dayscale, 4*self.yearscale, True)
+        brown = Luminary("brown", "models/brown.jpg", "models/planet_sphere", 2.5 * self.orbitscale, 0.7 * self.sizescale, None, self.dayscale, 0.5*self.yearscale, True)
+        belt = self.createAsteroidBelt(self.asteroidCount)
+        sun = Luminary("sun", "models/sun_1k_tex.jpg", "models/planet_sphere", 0, 3 * self.sizescale, [mercury, venus, mars, earth, gas, ice, brown] + belt, 20, None, True)
+
+        sky = Luminary("sky", "models/stars_1k_tex.jpg", "models/solar_sky_sphere", 0, self.skySize, [sun], None, None, False)
+        return sky
+
+    def createAsteroidBelt(self, count):
+
+        """ Erzeugt kuenstliche Asteroiden zwischen Mars und dem Gasplaneten. Die Texturen werden aus wenigen
+        Varianten erzeugt und in einen gemeinsamen Atlas gepackt, damit alle Asteroiden nur eine Textur binden.
+        Die Zufallswerte sind fest, damit das Asteroidenguertel bei jedem Start gleich aussieht.
+
+        :param count: die Anzahl der Asteroiden
+        :return: Liste der Asteroiden
+        """
+
+        if not count:
+            return []
+
+        atlas = None
+        variants = ["belt%d" % seed for seed in range(8)]
+        if self.textureFactory:
+            greys = [0.25 + 0.05 * seed for seed in range(len(variants))]
+            atlas = self.textureFactory.getAtlas("belt", [(name, seed, (grey * 0.5, grey * 0.45, grey * 0.4), (grey + 0.3, grey + 0.25, grey + 0.2), 0.25)
+                                                          for seed, (name, grey) in enumerate(zip(variants, greys))])
+
+        rnd = random.Random(0)
+        belt = []
+        for i in range(count):
+            distance = rnd.uniform(1.7, 1.9)
+            belt.append(Luminary("belt-%d" % i, variants[i % len(variants)], "models/planet_sphere", distance * self.orbitscale, rnd.uniform(0.03, 0.08) * self.sizescale, None, rnd.uniform(0.2, 2) * self.dayscale, distance ** 1.5 * self.yearscale, True, atlas,
+                                 eccentricity=rnd.uniform(0, 0.2), inclination=rnd.uniform(0, 10), node=rnd.uniform(0, 360),
+                                 periapsis=rnd.uniform(0, 360), meanAnomaly=rnd.uniform(0, 360)))
+        return belt
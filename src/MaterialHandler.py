@@ -0,0 +1,114 @@
+from panda3d.core import Shader, PTAFloat, PTALVecBase3f, LVecBase3f, LVecBase4f, Filename
+from math import log
+import os
+
+
+class MaterialHandler(object):
+
+    """ Stellt Licht und Textur aller Himmelskoerper ueber einen gemeinsamen Shader dar. Die Schalter liegen in
+    geteilten Arrays, die als Shader-Inputs gebunden sind. Ein Umschalten aendert daher nur einen Wert und
+    nicht den Zustand des Szenengraphen, unabhaengig davon wie viele Himmelskoerper existieren.
+
+    :ivar PTAFloat lightMode: 1 fuer die Punktlichtquelle, 0 fuer das Umgebungslicht
+    :ivar PTAFloat textureOn: 1 wenn die Texturen angezeigt werden, sonst 0
+    :ivar PTAFloat sunEmission: Eigenleuchten der Sonne
+    :ivar PTAFloat textureBias: Verschiebung der Mipmap-Stufe, groessere Werte verwenden kleinere Stufen
+    :ivar PTALVecBase3f lightPos: Position der Punktlichtquelle in der Szene
+    :ivar FloatingOrigin origin: Ursprung der dargestellten Szene
+    :ivar float ambient: Staerke des Umgebungslichts
+
+    """
+
+    def __init__(self, render, luminaries, sun, origin, far, ambient=0.2):
+
+        """ Ladet den Shader, setzt ihn auf die gesamte Umgebung und bindet die gemeinsamen Shader-Inputs. Die
+        Punktlichtquelle sitzt im absoluten Nullpunkt und wandert mit dem Ursprung der Szene mit.
+
+        :param render: Gesamte Umgebung des Raumes
+        :param luminaries: alle Himmelskoerper, die dargestellt werden
+        :param sun: der Himmelskoerper, der selbst leuchtet
+        :param origin: Ursprung der dargestellten Szene
+        :param far: weiteste Entfernung, die dargestellt wird, fuer die logarithmische Tiefe
+        :param ambient: Staerke des Umgebungslichts
+        """
+
+        self.ambient = ambient
+        self.origin = origin
+        self.lightMode = self.createFlag(1)
+        self.textureOn = self.createFlag(1)
+        self.sunEmission = self.createFlag(1)
+        self.textureBias = self.createFlag(0)
+        self.lightPos = PTALVecBase3f.emptyArray(1)
+        self.lightPos[0] = LVecBase3f(*origin.toScene((0, 0, 0)))
+        origin.addListener(self.shiftOrigin)
+
+        shaders = os.path.join(os.path.dirname(os.path.abspath(__file__)), "shaders")
+        render.setShader(Shader.load(Shader.SL_GLSL, Filename.fromOsSpecific(os.path.join(shaders, "luminary.vert")),
+                                     Filename.fromOsSpecific(os.path.join(shaders, "luminary.frag"))))
+        render.setShaderInput("lightMode", self.lightMode)
+        render.setShaderInput("textureOn", self.textureOn)
+        render.setShaderInput("textureBias", self.textureBias)
+        render.setShaderInput("emission", self.createFlag(0))
+        render.setShaderInput("ambient", self.createFlag(ambient))
+        render.setShaderInput("lightPos", self.lightPos)
+        render.setShaderInput("atlasRegion", LVecBase4f(0, 0, 1, 1))
+        render.setShaderInput("logDepthCoef", self.createFlag(2.0 / log(far + 1.0, 2)))
+
+        sun.model.setShaderInput("emission", self.sunEmission)
+
+        # Himmelskoerper, deren Textur nicht getogglet wird, bekommen einen eigenen, konstanten Schalter
+        textureAlwaysOn = self.createFlag(1)
+        for luminary in luminaries.values():
+            if not luminary.textureToggle:
+                luminary.model.setShaderInput("textureOn", textureAlwaysOn)
+
+    def createFlag(self, value):
+
+        """ Erstellt ein geteiltes Array mit einem Wert, welches als Shader-Input gebunden werden kann
+
+        :param value: Startwert
+        :return: das geteilte Array
+        """
+
+        flag = PTAFloat.emptyArray(1)
+        flag[0] = value
+        return flag
+
+    def shiftOrigin(self, delta):
+
+        """ Setzt die Punktlichtquelle neu, wenn der Ursprung der Szene verschoben wurde
+
+        :param delta: Verschiebung des Ursprungs
+        """
+
+        self.lightPos[0] = LVecBase3f(*self.origin.toScene((0, 0, 0)))
+
+    def setLight(self, on):
+
+        """ Schaltet zwischen der Punktlichtquelle und dem Umgebungslicht um. Beim Umgebungslicht leuchtet die
+        Sonne schwaecher.
+
+        :param on: True fuer die Punktlichtquelle, False fuer das Umgebungslicht
+        """
+
+        self.lightMode[0] = 1 if on else 0
+        self.sunEmission[0] = 1 if on else self.ambient
+
+    def setTexture(self, on):
+
+        """ Schaltet die Texturen aller togglebaren Himmelskoerper ein oder aus
+
+        :param on: True wenn die Texturen angezeigt werden sollen
+        """
+
+        self.textureOn[0] = 1 if on else 0
+
+    def setTextureBias(self, bias):
+
+        """ Verringert die Aufloesung aller Texturen, indem kleinere Mipmap-Stufen gelesen werden. Jede Stufe
+        halbiert die Aufloesung.
+
+        :param bias: Anzahl der Stufen, 0 fuer die volle Aufloesung
+        """
+
+        self.textureBias[0] = bias
@@ -0,0 +1,122 @@
+from panda3d.core import PNMImage, PerlinNoise2, Texture, TexturePool, Filename
+from TextureAtlas import *
+import hashlib
+import os
+
+
+class ProceduralTexture(object):
+
+    """ Erzeugt Texturen fuer kuenstliche Himmelskoerper aus Rauschen. Jede erzeugte Textur wird komprimiert
+    (DXT1) als .txo-Datei im Cache abgelegt und beim naechsten Start direkt von dort geladen. Der Dateiname
+    enthaelt einen Hash der Parameter, eine geaenderte Textur wird also neu erzeugt.
+
+    Mehrere Varianten koennen mit getAtlas in einen gemeinsamen Atlas gepackt werden. Dann werden die Varianten
+    unkomprimiert gepackt und nur der fertige Atlas komprimiert abgelegt.
+
+    :ivar string cacheDir: Verzeichnis, in dem die Texturen abgelegt werden
+    :ivar int size: Groesse der erzeugten Texturen in Pixel
+
+    """
+
+    #: Anzahl der Oktaven des Rauschens
+    OCTAVES = 3
+
+    def __init__(self, cacheDir=None, size=128):
+
+        """ Initialisiert den Generator
+
+        :param cacheDir: Verzeichnis, in dem die Texturen abgelegt werden, ohne Angabe cache neben diesem Modul
+        :param size: Groesse der erzeugten Texturen in Pixel
+        """
+
+        self.cacheDir = cacheDir or os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+        self.size = size
+
+    def getCachePath(self, name, seed, dark, bright, scale):
+
+        """ Gibt den Pfad zurueck, unter dem die Textur mit diesen Parametern abgelegt wird
+
+        :param name: Name der Textur
+        :param seed: Startwert des Rauschens
+        :param dark: Farbe (r, g, b) der dunklen Stellen
+        :param bright: Farbe (r, g, b) der hellen Stellen
+        :param scale: Groesse der Strukturen im Verhaeltnis zur Textur
+        :return: Pfad zur .txo-Datei
+        """
+
+        key = repr((seed, tuple(dark), tuple(bright), scale, self.size, self.OCTAVES)).encode("utf-8")
+        return os.path.join(self.cacheDir, "%s_%s.txo" % (name, hashlib.md5(key).hexdigest()[:12]))
+
+    def generateImage(self, seed, dark, bright, scale):
+
+        """ Erzeugt das Bild der Textur, indem mehrere Oktaven Perlin-Rauschen zwischen zwei Farben gemischt werden
+
+        :param seed: Startwert des Rauschens
+        :param dark: Farbe (r, g, b) der dunklen Stellen
+        :param bright: Farbe (r, g, b) der hellen Stellen
+        :param scale: Groesse der Strukturen im Verhaeltnis zur Textur
+        :return: das erzeugte Bild
+        """
+
+        octaves = []
+        for octave in range(self.OCTAVES):
+            period = self.size * scale / (2 ** octave)
+            octaves.append((PerlinNoise2(period, period, 256, seed + octave), 0.5 ** octave))
+        total = sum(weight for noise, weight in octaves)
+
+        image = PNMImage(self.size, self.size, 3)
+        for y in range(self.size):
+            for x in range(self.size):
+                value = sum(noise.noise(x, y) * weight for noise, weight in octaves) / total
+                t = min(1.0, max(0.0, 0.5 + 0.5 * value))
+                image.setXel(x, y, *[d + (b - d) * t for d, b in zip(dark, bright)])
+        return image
+
+    def getTexture(self, name, seed, dark, bright, scale=0.25):
+
+        """ Gibt die Textur zu den Parametern zurueck. Liegt sie im Cache, wird sie von dort geladen, sonst wird sie
+        erzeugt, komprimiert und im Cache abgelegt.
+
+        :param name: Name der Textur
+        :param seed: Startwert des Rauschens
+        :param dark: Farbe (r, g, b) der dunklen Stellen
+        :param bright: Farbe (r, g, b) der hellen Stellen
+        :param scale: Groesse der Strukturen im Verhaeltnis zur Textur
+        :return: die Textur
+        """
+
+        path = self.getCachePath(name, seed, dark, bright, scale)
+        if os.path.exists(path):
+            return TexturePool.loadTexture(Filename.fromOsSpecific(path))
+
+        texture = Texture(name)
+        texture.load(self.generateImage(seed, dark, bright, scale))
+        # Ohne Kompressionsbibliothek wird die Textur unkomprimiert abgelegt
+        texture.compressRamImage(Texture.CMDxt1)
+
+        if not os.path.isdir(self.cacheDir):
+            os.makedirs(self.cacheDir)
+        texture.write(Filename.fromOsSpecific(path))
+        return texture
+
+    def getAtlas(self, name, variants):
+
+        """ Gibt einen Atlas mit allen Varianten zurueck. Liegt er im Cache, werden Textur und Bereiche von dort
+        geladen, sonst werden die Bilder der Varianten erzeugt, gepackt und der Atlas komprimiert abgelegt.
+
+        :param name: Name des Atlas
+        :param variants: Liste der Varianten als (Name, Startwert, dunkle Farbe, helle Farbe, Groesse der Strukturen)
+        :return: der Atlas
+        """
+
+        atlas = TextureAtlas()
+        key = repr([(variant, seed, tuple(dark), tuple(bright), scale) for variant, seed, dark, bright, scale in variants]
+                   + [self.size, self.OCTAVES, atlas.cellSize, atlas.maxMipLevel]).encode("utf-8")
+        path = os.path.join(self.cacheDir, "%s_%s.txo" % (name, hashlib.md5(key).hexdigest()[:12]))
+        if atlas.load(path):
+            return atlas
+
+        for variant, seed, dark, bright, scale in variants:
+            atlas.addImage(variant, self.generateImage(seed, dark, bright, scale))
+        atlas.save(path)
+        return atlas
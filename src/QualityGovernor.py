@@ -0,0 +1,218 @@
+from direct.task.Task import Task
+from collections import deque
+import sys
+
+
+class QualityGovernor(object):
+
+    """ Passt die Qualitaet der Darstellung an, damit eine vorgegebene Bildrate gehalten wird. Dazu werden die
+    Frame-Zeiten der letzten window Frames gemessen und ihr 90. Perzentil mit der Zeit verglichen, die ein Frame
+    bei der Zielbildrate dauern darf.
+
+    Die Qualitaet ist in Stufen eingeteilt (siehe LEVELS). Jede Stufe legt fest, ab welcher scheinbaren Groesse
+    Himmelskoerper ausgeblendet werden, wie selten entfernte Himmelskoerper gesetzt werden, um wie viele
+    Mipmap-Stufen die Aufloesung der Texturen verringert wird und mit welchem Anteil der Fensteraufloesung die
+    Szene gerendert wird. Die Aufloesung entlastet als einzige Einstellung die Fragment-Shader, wenn die GPU und
+    nicht die Anzahl der Himmelskoerper die Bildrate begrenzt.
+
+    Damit die Qualitaet nicht hin- und herspringt, gibt es eine Hysterese: verringert wird erst, wenn das
+    Perzentil um tolerance ueber dem Budget liegt, erhoeht erst, wenn es unter headroom mal dem Budget liegt und die
+    letzte Aenderung mindestens upgradeDelay Sekunden her ist. Ausgewertet wird jeweils ein volles Fenster, danach
+    beginnt ein neues. Jede Auswertung wird mit ihren Messwerten, dem Budget und der Begruendung in decisions
+    abgelegt und in log geschrieben, auch wenn die Stufe bleibt (z.B. weil die Hysterese eine Erhoehung blockiert).
+
+    Die Frame-Zeiten werden mit der echten Uhr gemessen, damit der Governor auch bei fester Bildrate (Szenario)
+    die tatsaechliche Last sieht.
+
+    :ivar Engine engine: Dienste der Engine
+    :ivar RuntimeHandler runtime: setzt die Himmelskoerper mit der gewaehlten Genauigkeit
+    :ivar MaterialHandler material: setzt die Aufloesung der Texturen
+    :ivar float targetFps: Bildrate, die gehalten werden soll
+    :ivar float tolerance: Anteil, um den das Budget ueberschritten werden darf, bevor die Qualitaet sinkt
+    :ivar float headroom: Anteil des Budgets, unter dem die Qualitaet wieder steigt
+    :ivar float upgradeDelay: Sekunden, die seit der letzten Aenderung vergangen sein muessen, bevor die Qualitaet
+        steigt
+    :ivar deque frameTimes: gemessene Dauer der letzten Frames in Sekunden
+    :ivar int level: aktuelle Stufe, 0 ist die hoechste Qualitaet
+    :ivar float lastClock: Zeitpunkt des letzten Frames, None vor dem ersten Frame
+    :ivar float lastChange: Zeitpunkt der letzten Aenderung
+    :ivar list decisions: alle bisherigen Auswertungen als Dictionary
+    :ivar log: Datei, in die jede Auswertung geschrieben wird, None fuer keine Ausgabe
+
+    """
+
+    #: Einstellungen pro Stufe, absteigend nach Qualitaet. Die Groessen sind Radius durch Abstand zur Kamera,
+    #: 0.001 entspricht bei einem 1000 Pixel breiten Fenster etwa einem Pixel. renderScale ist der Anteil der
+    #: Fensteraufloesung pro Achse
+    LEVELS = [
+        {"lodSize": 0, "distantSize": 0, "distantInterval": 1, "textureBias": 0, "renderScale": 1.0},
+        {"lodSize": 0.0005, "distantSize": 0.005, "distantInterval": 2, "textureBias": 0, "renderScale": 1.0},
+        {"lodSize": 0.001, "distantSize": 0.01, "distantInterval": 4, "textureBias": 1, "renderScale": 0.85},
+        {"lodSize": 0.002, "distantSize": 0.02, "distantInterval": 8, "textureBias": 2, "renderScale": 0.7},
+        {"lodSize": 0.004, "distantSize": 0.05, "distantInterval": 16, "textureBias": 3, "renderScale": 0.5},
+    ]
+
+    def __init__(self, engine, runtime, material, targetFps=60, window=60, tolerance=0.1, headroom=0.7,
+                 upgradeDelay=5.0, log=sys.stderr):
+
+        """ Initialisiert den Governor mit der hoechsten Qualitaet, ohne ihn zu starten
+
+        :param engine: Dienste der Engine
+        :param runtime: setzt die Himmelskoerper mit der gewaehlten Genauigkeit
+        :param material: setzt die Aufloesung der Texturen
+        :param targetFps: Bildrate, die gehalten werden soll
+        :param window: Anzahl der Frames, ueber die gemessen wird
+        :param tolerance: Anteil, um den das Budget ueberschritten werden darf, bevor die Qualitaet sinkt
+        :param headroom: Anteil des Budgets, unter dem die Qualitaet wieder steigt
+        :param upgradeDelay: Sekunden, die seit der letzten Aenderung vergangen sein muessen, bevor die Qualitaet
+            steigt
+        :param log: Datei, in die jede Auswertung geschrieben wird, None fuer keine Ausgabe
+        """
+
+        self.engine = engine
+        self.runtime = runtime
+        self.material = material
+        self.targetFps = float(targetFps)
+        self.tolerance = tolerance
+        self.headroom = headroom
+        self.upgradeDelay = upgradeDelay
+        self.frameTimes = deque(maxlen=window)
+        self.level = 0
+        self.lastClock = None
+        self.lastChange = 0.0
+        self.decisions = []
+        self.log = log
+
+    def start(self):
+
+        """ Stellt die hoechste Qualitaet ein und startet die Messung in jedem Frame
+
+        """
+
+        self.apply(self.level)
+        self.engine.taskMgr.add(self.govern, "quality-task", sort=60)
+
+    def stop(self):
+
+        """ Beendet die Messung. Die zuletzt gewaehlte Qualitaet bleibt eingestellt.
+
+        """
+
+        self.engine.taskMgr.remove("quality-task")
+
+    def getBudget(self):
+
+        """ Gibt die Zeit zurueck, die ein Frame bei der Zielbildrate dauern darf
+
+        :return: Dauer in Sekunden
+        """
+
+        return 1.0 / self.targetFps
+
+    def getStatistics(self):
+
+        """ Berechnet die Statistik der gemessenen Frame-Zeiten in Millisekunden
+
+        :return: Dictionary mit Mittelwert und 90. Perzentil der Frame-Zeiten
+        """
+
+        times = sorted(self.frameTimes)
+        return {
+            "mean_ms": 1000.0 * sum(times) / len(times),
+            "p90_ms": 1000.0 * times[min(len(times) - 1, int(0.9 * len(times)))],
+        }
+
+    def govern(self, task):
+
+        """ Misst die Dauer des letzten Frames. Sobald ein volles Fenster gemessen wurde, wird es ausgewertet,
+        protokolliert und ein neues Fenster begonnen. Die Qualitaet aendert sich, wenn die Hysterese es erlaubt.
+
+        :param task: Gibt an, welche Funktion diese Methode uebernehmen soll
+        """
+
+        now = self.engine.clock.getRealTime()
+        if self.lastClock is not None:
+            self.frameTimes.append(now - self.lastClock)
+        self.lastClock = now
+
+        if len(self.frameTimes) == self.frameTimes.maxlen:
+            statistics = self.getStatistics()
+            level, reason = self.decide(statistics, now)
+            self.logDecision(level, reason, statistics, now)
+            self.frameTimes.clear()
+            if level != self.level:
+                self.setLevel(level, now)
+        return Task.cont
+
+    def decide(self, statistics, now):
+
+        """ Entscheidet anhand der Statistik ueber die naechste Stufe. Auch wenn die Stufe bleibt, wird begruendet,
+        warum (innerhalb der Hysterese, Erhoehung durch upgradeDelay blockiert oder keine Stufe mehr uebrig).
+
+        :param statistics: Statistik der Frame-Zeiten (siehe getStatistics)
+        :param now: aktuelle Zeit in Sekunden
+        :return: die naechste Stufe und eine Begruendung
+        """
+
+        budget = 1000.0 * self.getBudget()
+        p90 = statistics["p90_ms"]
+        upper = budget * (1 + self.tolerance)
+        lower = budget * self.headroom
+        if p90 > upper:
+            if self.level < len(self.LEVELS) - 1:
+                return self.level + 1, "p90 %.2f ms > %.2f ms" % (p90, upper)
+            return self.level, "blocked: p90 %.2f ms > %.2f ms at lowest quality" % (p90, upper)
+        if p90 < lower:
+            if self.level == 0:
+                return self.level, "hold: p90 %.2f ms < %.2f ms at highest quality" % (p90, lower)
+            wait = self.upgradeDelay - (now - self.lastChange)
+            if wait > 0:
+                return self.level, "blocked: p90 %.2f ms < %.2f ms, upgrade in %.1f s" % (p90, lower, wait)
+            return self.level - 1, "p90 %.2f ms < %.2f ms" % (p90, lower)
+        return self.level, "hold: %.2f ms <= p90 %.2f ms <= %.2f ms" % (lower, p90, upper)
+
+    def logDecision(self, level, reason, statistics, now):
+
+        """ Legt eine Auswertung in decisions ab und schreibt sie mit Statistik, Budget und den Einstellungen der
+        naechsten Stufe in log
+
+        :param level: die naechste Stufe
+        :param reason: Begruendung der Entscheidung
+        :param statistics: Statistik der Frame-Zeiten (siehe getStatistics)
+        :param now: aktuelle Zeit in Sekunden
+        """
+
+        decision = {"time": now, "from": self.level, "to": level, "reason": reason,
+                    "budget_ms": 1000.0 * self.getBudget()}
+        decision.update(statistics)
+        decision.update(self.LEVELS[level])
+        self.decisions.append(decision)
+        if self.log:
+            self.log.write("quality: %.2f s level %d -> %d (%s) mean=%.2f ms p90=%.2f ms budget=%.2f ms %s\n" % (
+                now, self.level, level, reason, statistics["mean_ms"], statistics["p90_ms"], decision["budget_ms"],
+                " ".join("%s=%s" % (key, value) for key, value in sorted(self.LEVELS[level].items()))))
+            self.log.flush()
+
+    def setLevel(self, level, now):
+
+        """ Wechselt auf eine andere Stufe
+
+        :param level: die neue Stufe
+        :param now: aktuelle Zeit in Sekunden
+        """
+
+        self.level = level
+        self.lastChange = now
+        self.apply(level)
+
+    def apply(self, level):
+
+        """ Stellt die Einstellungen einer Stufe ein
+
+        :param level: die Stufe
+        """
+
+        settings = self.LEVELS[level]
+        self.runtime.setDetail(settings["lodSize"], settings["distantSize"], settings["distantInterval"])
+        self.material.setTextureBias(settings["textureBias"])
+        self.engine.setRenderScale(settings["renderScale"])
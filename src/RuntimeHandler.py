@@ -1,55 +1,100 @@
 from panda3d.core import TextNode, Vec3, Vec4
+from direct.task.Task import Task
+from Ephemeris import *
+import numpy as np
 
 class RuntimeHandler(object):
 
-    """ Stellt die sichtbaren Elemente des Solarsystems dar. Diese sind der Weltraum, die Planeten und andere Himmelskoerper
+    """ Stellt die sichtbaren Elemente des Solarsystems dar. Diese sind der Weltraum, die Planeten und andere Himmelskoerper.
+
+    Die Positionen werden von der Ephemeride in doppelter Genauigkeit berechnet und relativ zum verschiebbaren
+    Ursprung der Szene gesetzt. Alle Himmelskoerper haengen deshalb direkt an der Umgebung. Es werden nur jene
+    Himmelskoerper neu gesetzt, die sich seit dem letzten Frame bewegt haben, ausser der Ursprung wurde verschoben.
+
+    Ueber setDetail kann die Genauigkeit der Darstellung verringert werden. Massgeblich ist die scheinbare Groesse
+    eines Himmelskoerpers, also sein Radius geteilt durch den Abstand zur Kamera. Kleinere Himmelskoerper als
+    lodSize werden ausgeblendet und nicht mehr gesetzt, kleinere als distantSize nur in jedem distantInterval-ten
+    Frame. Damit nicht alle entfernten Himmelskoerper im selben Frame gesetzt werden, sind sie ueber die Frames
+    verteilt.
 
     :ivar dictionary rootList: Liste der Nodepath eines Himmelskoerper
-    :ivar dictionary orbitList: Liste der Laufbahnen eines Himmelskoerpers
-    :ivar dictionary selfRotateList: Liste der Selbstrotationen eines Himmelskoerpers
     :ivar dictionary luminaryList: Liste der Himmelskoerper
+    :ivar list bodies: Liste der Himmelskoerper in der Reihenfolge der Ephemeride
+    :ivar Ephemeris ephemeris: berechnet die Positionen aller Himmelskoerper
+    :ivar FloatingOrigin origin: Ursprung der dargestellten Szene
+    :ivar Engine engine: Dienste der Engine, None wenn nur die Hierarchie aufgebaut wird
+    :ivar float time: aktuelle Zeit der Simulation
+    :ivar float playRate: Geschwindigkeit der Simulation
+    :ivar boolean playing: gibt an, ob die Simulation laeuft
+    :ivar ndarray positions: zuletzt gesetzte absolute Positionen pro Himmelskoerper, None vor dem ersten Setzen
+    :ivar ndarray headings: zuletzt gesetzte Drehwinkel pro Himmelskoerper
+    :ivar float placedTime: Zeit der Simulation, zu der die Himmelskoerper zuletzt gesetzt wurden
+    :ivar boolean originShifted: gibt an, ob der Ursprung seit dem letzten Setzen verschoben wurde
+    :ivar float lodSize: scheinbare Groesse, unter der ein Himmelskoerper ausgeblendet wird, 0 fuer nie
+    :ivar float distantSize: scheinbare Groesse, unter der ein Himmelskoerper seltener gesetzt wird, 0 fuer nie
+    :ivar int distantInterval: Anzahl der Frames, nach denen ein entfernter Himmelskoerper gesetzt wird
+    :ivar int frame: Anzahl der bisherigen Aufrufe von placeLuminaries
+    :ivar ndarray radii: Radien in der Reihenfolge der Ephemeride, None solange sie nicht erstellt wurden
+    :ivar ndarray visible: gibt pro Himmelskoerper an, ob er eingeblendet ist, None vor dem ersten Setzen
 
     """
 
-    def __init__(self):
+    def __init__(self, origin, engine=None):
 
         """ Initialisiert die Runtime
 
+        :param origin: Ursprung der dargestellten Szene
+        :param engine: Dienste der Engine, ohne Engine kann nur die Hierarchie aufgebaut werden
         """
 
         self.rootList = {}
-        self.orbitList = {}
-        self.selfRotateList = {}
         self.luminaryList = {}
-
-
-    def addLuminary(self, render, luminary):
+        self.bodies = []
+        self.ephemeris = Ephemeris()
+        self.origin = origin
+        self.engine = engine
+        self.origin.addListener(self.shiftOrigin)
+        self.time = 0.0
+        self.playRate = 1
+        self.playing = False
+        self.positions = None
+        self.headings = None
+        self.placedTime = None
+        self.originShifted = False
+        self.lodSize = 0
+        self.distantSize = 0
+        self.distantInterval = 1
+        self.frame = 0
+        self.radii = None
+        self.visible = None
+
+
+    def addLuminary(self, render, luminary, parent=None):
 
         """ Fuegt einen neuen Himmelskoerper, der einen neuen Namen haben muss, in das Solarsystem ein.
-        Dabei kann ein Himmelskoerper aber noch "Kinder" haben. Die um diesen kreisen.
+        Dabei kann ein Himmelskoerper aber noch "Kinder" haben. Die um diesen kreisen. Ohne Umgebung wird nur die
+        Hierarchie in der Ephemeride aufgebaut und kein Modell geladen.
 
-        :param render: Gesamte Umgebung des Raumes
+        :param render: Gesamte Umgebung des Raumes oder None
         :param luminary: der hinzuzufuegende Himmelskoerper
+        :param parent: der Himmelskoerper, um den der neue Himmelskoerper kreist
         """
 
         self.luminaryList[luminary.name] = luminary
-        if luminary.name not in self.rootList:
+        self.bodies.append(luminary)
+        self.radii = None
+        self.ephemeris.addBody(luminary.name, parent.name if parent else None,
+                               luminary.initPosition if luminary.orbitRotate else 0,
+                               luminary.orbitRotate, luminary.selfRotate, luminary.eccentricity,
+                               luminary.inclination, luminary.node, luminary.periapsis, luminary.meanAnomaly)
+
+        if render is not None:
             self.rootList[luminary.name] = render.attachNewNode(luminary.name)
+            luminary.loadModel(self.engine.loader).reparentTo(self.rootList[luminary.name])
 
         if (luminary.children):
             for child in luminary.children:
-                self.rootList[child.name] = (self.rootList[luminary.name].attachNewNode(child.name))
-                self.rootList[child.name].setPos(luminary.initPosition, 0, 0)
-                self.addLuminary(render,child)
-
-        if (luminary.selfRotate):
-            self.selfRotateList[luminary.name] = luminary.model.hprInterval((luminary.selfRotate), Vec3(360, 0, 0))
-
-        if (luminary.orbitRotate):
-            luminary.model.reparentTo(self.rootList[luminary.name])
-            self.orbitList[luminary.name] = self.rootList[luminary.name].hprInterval((luminary.orbitRotate), Vec3(360, 0, 0))
-        else:
-            luminary.model.reparentTo(render)
+                self.addLuminary(render, child, luminary)
 
 
     def rotateLuminaries(self):
@@ -58,35 +103,124 @@ class RuntimeHandler(object):
 
         """
 
-        for orbit in self.orbitList:
-            self.orbitList[orbit].loop()
+        self.playing = True
+        self.placeLuminaries()
+        self.engine.taskMgr.add(self.updateLuminaries, "runtime-task", sort=10)
 
-        for selfRotate in self.selfRotateList:
-            self.selfRotateList[selfRotate].loop()
+    def updateLuminaries(self, task):
 
-    def togglePlaying(self):
+        """ Schreitet die Zeit der Simulation fort und setzt die Himmelskoerper neu, falls sich die Zeit geaendert
+        hat oder der Ursprung verschoben wurde. Wird nach der Kamera ausgefuehrt, damit eine Verschiebung des
+        Ursprungs noch im selben Frame dargestellt wird.
 
-        """ Schaltet das Solarsystem ein oder aus. Falls das System resetet wurde, wird es bei Betaetigung wieder eingeschaltet
+        :param task: Gibt an, welche Funktion diese Methode uebernehmen soll
+        """
+
+        if self.playing:
+            self.time += self.engine.clock.getDt() * self.playRate
+
+        # Bei verringerter Genauigkeit haengt die Darstellung auch von der Kamera ab
+        if self.time != self.placedTime or self.originShifted or self.lodSize or self.distantSize:
+            self.placeLuminaries()
+        return Task.cont
+
+    def placeLuminaries(self):
+
+        """ Setzt die Position und den Drehwinkel aller Himmelskoerper, die sich veraendert haben und in diesem
+        Frame an der Reihe sind. Wurde der Ursprung verschoben, werden alle Himmelskoerper gesetzt.
+
+        """
 
+        positions = self.ephemeris.getPositions(self.time, warmStart=True)
+        headings = self.ephemeris.getHeadings(self.time)
+        scenePositions = self.origin.toScene(positions)
+        due = self.updateVisibility(scenePositions)
+
+        if self.positions is None or self.originShifted:
+            # NaN ist ungleich jedem Wert, dadurch werden alle Himmelskoerper gesetzt
+            self.positions = np.full_like(positions, np.nan)
+            self.headings = np.full_like(headings, np.nan)
+            due[:] = True
+
+        moved = np.nonzero(due & np.any(positions != self.positions, axis=1))[0]
+        turned = np.nonzero(due & (headings != self.headings))[0]
+        for i in moved:
+            self.rootList[self.bodies[i].name].setPos(*scenePositions[i])
+        for i in turned:
+            self.bodies[i].model.setH(headings[i])
+
+        self.positions[moved] = positions[moved]
+        self.headings[turned] = headings[turned]
+        self.placedTime = self.time
+        self.originShifted = False
+        self.frame += 1
+
+    def updateVisibility(self, scenePositions):
+
+        """ Blendet Himmelskoerper abhaengig von ihrer scheinbaren Groesse ein oder aus und bestimmt, welche in
+        diesem Frame gesetzt werden. Gerade eingeblendete Himmelskoerper werden immer gesetzt.
+
+        :param scenePositions: Positionen aller Himmelskoerper relativ zum Ursprung der Szene
+        :return: gibt pro Himmelskoerper an, ob er in diesem Frame gesetzt wird
         """
 
-        for orbit in self.orbitList:
-            if self.orbitList[orbit].isPlaying():
-                self.orbitList[orbit].pause()
+        count = len(self.bodies)
+        if self.visible is None:
+            self.visible = np.ones(count, dtype=bool)
+        if not self.lodSize and not self.distantSize:
+            visible = np.ones(count, dtype=bool)
+            due = np.ones(count, dtype=bool)
+        else:
+            if self.radii is None:
+                self.radii = np.array(self.getRadii(), dtype=np.float64)
+            camera = self.engine.camera.getPos(self.engine.render)
+            distance = np.sqrt(np.sum((scenePositions - (camera[0], camera[1], camera[2])) ** 2, axis=1))
+            size = self.radii / np.maximum(distance, 1e-9)
+            visible = size >= self.lodSize
+            turn = (np.arange(count) + self.frame) % self.distantInterval == 0
+            due = visible & ((size >= self.distantSize) | turn | ~self.visible)
+
+        for i in np.nonzero(visible != self.visible)[0]:
+            if visible[i]:
+                self.rootList[self.bodies[i].name].show()
             else:
-                self.orbitList[orbit].resume()
+                self.rootList[self.bodies[i].name].hide()
+        self.visible = visible
+        return due
 
-            if self.orbitList[orbit].getPlayRate()==0:
-                self.orbitList[orbit].setPlayRate(1)
+    def setDetail(self, lodSize=0, distantSize=0, distantInterval=1):
 
-        for selfRotate in self.selfRotateList:
-            if self.selfRotateList[selfRotate].isPlaying():
-                self.selfRotateList[selfRotate].pause()
-            else:
-                self.selfRotateList[selfRotate].resume()
+        """ Legt fest, wie genau die Himmelskoerper dargestellt werden. Die Aenderung wirkt ab dem naechsten Frame.
+
+        :param lodSize: scheinbare Groesse, unter der ein Himmelskoerper ausgeblendet wird, 0 fuer nie
+        :param distantSize: scheinbare Groesse, unter der ein Himmelskoerper seltener gesetzt wird, 0 fuer nie
+        :param distantInterval: Anzahl der Frames, nach denen ein entfernter Himmelskoerper gesetzt wird
+        """
+
+        self.lodSize = lodSize
+        self.distantSize = distantSize
+        self.distantInterval = max(1, int(distantInterval))
+
+    def shiftOrigin(self, delta):
+
+        """ Merkt vor, dass alle Himmelskoerper neu gesetzt werden muessen, weil der Ursprung verschoben wurde
+
+        :param delta: Verschiebung des Ursprungs
+        """
+
+        self.originShifted = True
+
+    def togglePlaying(self):
+
+        """ Schaltet das Solarsystem ein oder aus. Falls das System resetet wurde, wird es bei Betaetigung wieder eingeschaltet
 
-            if self.selfRotateList[selfRotate].getPlayRate()==0:
-                self.selfRotateList[selfRotate].setPlayRate(1)
+        """
+
+        if self.playRate == 0:
+            self.playRate = 1
+            self.playing = True
+        else:
+            self.playing = not self.playing
 
     def editSpeedPlaying(self, speed):
 
@@ -96,20 +230,11 @@ class RuntimeHandler(object):
         :param int speed: Geschwindigkeit, die addiert werden soll
         """
 
-        for orbit in self.orbitList:
-            self.orbitList[orbit].resume()
-            if self.orbitList[orbit].getPlayRate() + speed == 0:
-                self.orbitList[orbit].setPlayRate(self.orbitList[orbit].getPlayRate() + 2*speed)
-                continue
-
-            self.orbitList[orbit].setPlayRate(self.orbitList[orbit].getPlayRate() + speed)
-
-        for selfRotate in self.selfRotateList:
-            self.selfRotateList[selfRotate].resume()
-            if self.selfRotateList[selfRotate].getPlayRate() + speed == 0:
-                self.selfRotateList[selfRotate].setPlayRate(self.selfRotateList[selfRotate].getPlayRate() + 2*speed)
-                continue
-            self.selfRotateList[selfRotate].setPlayRate(self.selfRotateList[selfRotate].getPlayRate() + speed)
+        self.playing = True
+        if self.playRate + speed == 0:
+            self.playRate += 2 * speed
+        else:
+            self.playRate += speed
 
     def fasterPlaying(self):
 
@@ -133,11 +258,54 @@ class RuntimeHandler(object):
 
         """
 
-        for orbit in self.orbitList:
-            self.orbitList[orbit].setPlayRate(0)
+        self.playRate = 0
+        self.time = 0.0
+
+    def setTime(self, time):
+
+        """ Springt zu einem Zeitpunkt der Simulation. Die Himmelskoerper werden im naechsten Frame neu gesetzt.
+
+        :param time: Zeitpunkt der Simulation
+        """
+
+        self.time = time
+
+    def getScenePosition(self, name):
+
+        """ Gibt die zuletzt gesetzte Position eines Himmelskoerpers in der Szene zurueck
+
+        :param name: Der Name des Himmelskoerpers
+        :return: Position relativ zum Ursprung der Szene
+        """
+
+        return self.origin.toScene(self.ephemeris.getPositions(self.time)[self.ephemeris.index[name]])
+
+    def getRadii(self):
+
+        """ Gibt den Radius aller Himmelskoerper in der Reihenfolge der Ephemeride zurueck
+
+        :return: Liste der Radien
+        """
+
+        return [luminary.scale for luminary in self.bodies]
+
+    def getPlayRate(self):
+
+        """ Gibt die aktuelle Geschwindigkeit der Simulation zurueck
+
+        :return: Geschwindigkeit der Simulation
+        """
+
+        return self.playRate
+
+    def isPlaying(self):
+
+        """ Gibt zurueck, ob die Simulation laeuft
+
+        :return: True, wenn die Simulation nicht angehalten oder zurueckgesetzt ist
+        """
 
-        for selfRotate in self.selfRotateList:
-            self.selfRotateList[selfRotate].setPlayRate(0)
+        return self.playing and self.playRate != 0
 
     def getAllLuminaries(self):
 
@@ -156,4 +324,4 @@ class RuntimeHandler(object):
         :return: Der gesuchte Himmelskoerper
         """
 
-        return self.luminaryList[name]
\ No newline at end of file
+        return self.luminaryList[name]
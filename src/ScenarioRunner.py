@@ -0,0 +1,193 @@
+from panda3d.core import ClockObject
+from direct.task.Task import Task
+import json
+import sys
+import time
+
+
+class ScenarioRunner(object):
+
+    """ Spielt ein Szenario aus zeitgesteuerten Befehlen ab und misst dabei die Dauer jedes Frames. Die Befehle
+    entsprechen den Aktionen der Tastenbelegung (z.B. "toggle", "faster", "slower", "restart", "texture",
+    "light", "bird" oder Bewegungen wie "forward") und werden ueber den InputHandler eingereiht.
+
+    Damit ein Szenario reproduzierbar ist, laeuft die Uhr waehrend des Szenarios mit einer festen Bildrate: jeder
+    Frame entspricht genau 1/fps Sekunden Simulationszeit, egal wie lange er tatsaechlich dauert. Die gemessenen
+    Frame-Zeiten sind dagegen echte Zeiten.
+
+    Ein Szenario kann aus einer Datei geladen werden. Jede Zeile enthaelt die Zeit in Sekunden, die Aktion und
+    optional einen Wert (bei Bewegungen 1 fuer gedrueckt und 0 fuer losgelassen). Die Aktion "end" beendet das
+    Szenario, Zeilen mit "#" sind Kommentare::
+
+        # Zeit  Aktion   Wert
+        0.0     faster
+        1.0     forward  1
+        2.5     forward  0
+        5.0     texture
+        10.0    end
+
+    :ivar Engine engine: Dienste der Engine
+    :ivar InputHandler input: verarbeitet die Aktionen des Szenarios
+    :ivar int fps: feste Bildrate, mit der das Szenario ablaeuft
+    :ivar list commands: Liste der Befehle (Zeit, Aktion, Wert), sortiert nach der Zeit
+    :ivar float endTime: Zeitpunkt, zu dem das Szenario endet
+    :ivar int frame: Nummer des aktuellen Frames
+    :ivar list frameTimes: gemessene Dauer der Frames in Sekunden
+    :ivar float lastClock: Zeitpunkt des letzten Frames
+    :ivar finished: Funktion, die am Ende des Szenarios aufgerufen wird
+
+    """
+
+    #: Aktion, die das Ende eines Szenarios markiert
+    END_ACTION = "end"
+
+    def __init__(self, engine, input, fps=60):
+
+        """ Initialisiert ein leeres Szenario
+
+        :param engine: Dienste der Engine
+        :param input: verarbeitet die Aktionen des Szenarios
+        :param fps: feste Bildrate, mit der das Szenario ablaeuft
+        """
+
+        self.engine = engine
+        self.input = input
+        self.fps = fps
+        self.commands = []
+        self.endTime = None
+        self.frame = 0
+        self.frameTimes = []
+        self.lastClock = None
+        self.finished = None
+
+    def addCommand(self, time, action, value=1):
+
+        """ Fuegt einen Befehl zum Szenario hinzu
+
+        :param time: Zeitpunkt in Sekunden Simulationszeit, zu dem der Befehl ausgefuehrt wird
+        :param action: Name der Aktion oder "end"
+        :param value: Wert der Aktion
+        """
+
+        if action == self.END_ACTION:
+            self.endTime = time
+            return
+        if not self.input.isKnownAction(action):
+            raise ValueError("Unbekannte Aktion '%s'" % action)
+        self.commands.append((time, action, value))
+        self.commands.sort(key=lambda command: command[0])
+
+    def loadScript(self, path):
+
+        """ Ladet ein Szenario aus einer Datei
+
+        :param path: gibt den Pfad zum Szenario an
+        """
+
+        with open(path) as script:
+            for number, line in enumerate(script, 1):
+                line = line.split("#")[0].strip()
+                if not line:
+                    continue
+                parts = line.split()
+                if len(parts) not in (2, 3):
+                    raise ValueError("%s:%d: erwartet 'Zeit Aktion [Wert]'" % (path, number))
+                value = int(parts[2]) if len(parts) == 3 else 1
+                self.addCommand(float(parts[0]), parts[1], value)
+
+    def issue(self, action, value=1):
+
+        """ Fuehrt einen Befehl sofort aus, d.h. er wird im naechsten Frame verarbeitet
+
+        :param action: Name der Aktion
+        :param value: Wert der Aktion
+        """
+
+        self.input.pushAction(action, value)
+
+    def start(self, finished=None):
+
+        """ Startet das Szenario. Die Uhr laeuft ab jetzt mit der festen Bildrate und die Mausbewegung wird
+        ignoriert, damit jeder Lauf gleich ablaeuft.
+
+        :param finished: Funktion, die am Ende des Szenarios aufgerufen wird
+        """
+
+        if self.endTime is None:
+            self.endTime = self.commands[-1][0] if self.commands else 0
+        self.finished = finished
+        self.frame = 0
+        self.frameTimes = []
+        self.lastClock = None
+
+        self.engine.clock.setMode(ClockObject.MForced)
+        self.engine.clock.setFrameRate(self.fps)
+        self.input.camera.mouseLook = False
+
+        self.engine.taskMgr.add(self.runScenario, "scenario-task", sort=-2)
+
+    def runScenario(self, task):
+
+        """ Reiht die faelligen Befehle ein und misst die Dauer des letzten Frames. Wird vor dem InputHandler
+        ausgefuehrt, damit die Befehle noch im selben Frame verarbeitet werden.
+
+        :param task: Gibt an, welche Funktion diese Methode uebernehmen soll
+        """
+
+        now = time.time()
+        if self.lastClock is not None:
+            self.frameTimes.append(now - self.lastClock)
+        self.lastClock = now
+
+        scenarioTime = float(self.frame) / self.fps
+        while self.commands and self.commands[0][0] <= scenarioTime:
+            command = self.commands.pop(0)
+            self.issue(command[1], command[2])
+
+        if scenarioTime >= self.endTime and not self.commands:
+            if self.finished:
+                self.finished(self)
+            return Task.done
+
+        self.frame += 1
+        return Task.cont
+
+    def getStatistics(self):
+
+        """ Berechnet die Statistik der gemessenen Frame-Zeiten in Millisekunden
+
+        :return: Dictionary mit Anzahl, Mittelwert, Minimum, Maximum und Perzentilen der Frame-Zeiten
+        """
+
+        times = sorted(t * 1000.0 for t in self.frameTimes)
+        if not times:
+            return {"frames": 0}
+
+        def percentile(p):
+            return times[min(len(times) - 1, int(p / 100.0 * len(times)))]
+
+        mean = sum(times) / len(times)
+        return {
+            "frames": len(times),
+            "fps": self.fps,
+            "mean_ms": mean,
+            "min_ms": times[0],
+            "max_ms": times[-1],
+            "p50_ms": percentile(50),
+            "p95_ms": percentile(95),
+            "p99_ms": percentile(99),
+        }
+
+    def writeStatistics(self, path=None):
+
+        """ Schreibt die Statistik als JSON in eine Datei oder auf die Standardausgabe
+
+        :param path: gibt den Pfad zur Datei an, ohne Pfad wird auf die Standardausgabe geschrieben
+        """
+
+        statistics = json.dumps(self.getStatistics(), indent=2, sort_keys=True)
+        if path:
+            with open(path, "w") as output:
+                output.write(statistics + "\n")
+        else:
+            sys.stdout.write(statistics + "\n")
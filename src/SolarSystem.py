@@ -1,74 +1,147 @@
-import direct.directbase.DirectStart
-from pandac.PandaModules import WindowProperties
+from panda3d.core import loadPrcFileData
+from Engine import *
 from RuntimeHandler import *
-from Luminary import *
+from LuminaryCatalog import *
 from Camera import *
 from EventHandler import *
+from ScenarioRunner import *
+from Telemetry import *
+from QualityGovernor import *
+from FloatingOrigin import *
+import argparse
+import sys
 
 class SolarSystem(DirectObject):
 
     """ Simuliert einen Ablauf eines Sonnensystems welches mittels Tastendruecken gesteuert werden kann.
 
-    :ivar int yearscale: die Dauer einer Umdrehung um den Mittelpunkt
-    :ivar int dayscale: die Dauer fuer eine Umdrehung um sich selbst
-    :ivar int orbitscale: die Groesse der Umlaufbahn
-    :ivar int sizescale: die Groesse des Himmelskoerpers
-    :ivar int skySize: die Groesse des Weltraums
+    :ivar Engine engine: Dienste der Engine, ohne Fenster z.B. eine StandInEngine
+    :ivar LuminaryCatalog catalog: definiert die Himmelskoerper sowie ihre Groessen und Geschwindigkeiten
+    :ivar FloatingOrigin origin: Ursprung der dargestellten Szene, der mit der Kamera mitwandert
     :ivar Camera camera: ermoeglicht den Umgang mit einer Kamera
     :ivar RuntimeHandler runtime: beinhaltet alle Himmelskoerper
     :ivar EventHandler eventHandler: verarbeitet Usereingaben
+    :ivar ScenarioRunner scenario: spielt ein Szenario ab, falls eines geladen wurde
+    :ivar Telemetry telemetry: stellt Kennzahlen ueber HTTP zur Verfuegung, falls gestartet
+    :ivar QualityGovernor quality: passt die Qualitaet an die Bildrate an, falls gestartet
 
     """
 
-    def __init__(self):
+    def __init__(self, engine, asteroidCount=0, realistic=False):
 
         """ Initialisiert die Kamera, die Runtime und den Eventhandler. Ladet die Planeten und startet das Programm
 
+        :param engine: Dienste der Engine
+        :param asteroidCount: die Anzahl der kuenstlichen Asteroiden im Asteroidenguertel
+        :param realistic: gibt an, ob die Umlaufbahnen im realistischen Massstab erstellt werden
         """
 
-        props = WindowProperties()
-        props.setTitle('Solarsystem')
-        base.win.requestProperties(props)
-        base.setBackgroundColor(0, 0, 0)
+        self.engine = engine
+        self.engine.setTitle('Solarsystem')
+        self.engine.setBackgroundColor(0, 0, 0)
 
-        # The global variables we used to control the speed and size of objects
-        self.yearscale = 60
-        self.dayscale = self.yearscale / 365.0 * 5
-        self.orbitscale = 10
-        self.sizescale = 0.6
-        self.skySize = 80
-
-        self.runtime = RuntimeHandler()
-        self.camera = Camera(render, self.skySize)
+        self.catalog = LuminaryCatalog(asteroidCount, self.engine.textureFactory, realistic)
+        self.origin = FloatingOrigin(self.catalog.originThreshold)
+        self.runtime = RuntimeHandler(self.origin, self.engine)
+        self.camera = Camera(self.engine, self.catalog.skySize, self.origin)
 
         self.loadLuminaries()
         self.runtime.rotateLuminaries()
 
-        self.eventHandler = EventHandler(self.runtime, self.camera, self.runtime.getLuminary('sun'))
+        self.eventHandler = EventHandler(self.engine, self.runtime, self.camera, self.runtime.getLuminary('sun'))
+        self.scenario = None
+        self.telemetry = None
+        self.quality = None
 
 
     def loadLuminaries(self):
 
-        """ Ladet definierte Himmelskoerper und stellt Assoziationen zwischen diesen dar
+        """ Ladet die Himmelskoerper des Katalogs in die Runtime
+
+        """
+
+        self.runtime.addLuminary(self.engine.render, self.catalog.createLuminaries())
+
+    def runScenario(self, scriptPath, statsPath=None, fps=60):
+
+        """ Spielt ein Szenario ab und beendet das Programm, sobald das Szenario zu Ende ist. Die Statistik der
+        Frame-Zeiten wird danach ausgegeben.
+
+        :param scriptPath: gibt den Pfad zum Szenario an
+        :param statsPath: gibt den Pfad an, in den die Statistik geschrieben wird
+        :param fps: feste Bildrate, mit der das Szenario ablaeuft
+        """
+
+        def finished(scenario):
+            scenario.writeStatistics(statsPath)
+            self.engine.exit()
+
+        self.scenario = ScenarioRunner(self.engine, self.eventHandler.input, fps)
+        self.scenario.loadScript(scriptPath)
+        self.scenario.start(finished)
 
+
+    def startTelemetry(self, port):
+
+        """ Startet den lokalen Endpunkt fuer die Kennzahlen der Simulation
+
+        :param port: Port des Endpunkts
+        """
+
+        self.telemetry = Telemetry(self.engine, self.runtime, port)
+        self.telemetry.start()
+
+    def startQualityGovernor(self, targetFps, logPath=None):
+
+        """ Startet die Anpassung der Qualitaet an eine Zielbildrate
+
+        :param targetFps: Bildrate, die gehalten werden soll
+        :param logPath: Datei, in die die Auswertungen geschrieben werden, ohne Pfad auf stderr
         """
 
-        mercury = Luminary("mercury", "models/mercury_1k_tex.jpg", "models/planet_sphere", 0.38 * self.orbitscale, 0.385 * self.sizescale, None, 59 * self.dayscale, 0.241 * self.yearscale, True)
-        venus = Luminary("venus", "models/venus_1k_tex.jpg", "models/planet_sphere", 0.72 * self.orbitscale, 0.923 * self.sizescale, None, 243 * self.dayscale, 0.615 * self.yearscale, True)
-        mars = Luminary("mars", "models/mars_1k_tex.jpg", "models/planet_sphere", 1.52 * self.orbitscale, 0.515 * self.sizescale, None, 1.03 * self.dayscale, 1.881 * self.yearscale, True)
-        moon = Luminary("moon", "models/moon_1k_tex.jpg", "models/planet_sphere", 0.1 * self.orbitscale, 0.1 * self.sizescale, None, .0749 * self.yearscale, .0749 * self.yearscale, True)
-        asteroid = Luminary("asteroid", "models/asteroid.jpg", "models/planet_sphere", 0.3 * self.orbitscale, 0.5 * self.sizescale, None, .0749 * self.yearscale, .0749 * self.yearscale, True)
-        earth = Luminary("earth", "models/earth_1k_tex.jpg", "models/planet_sphere", self.orbitscale, self.sizescale, [moon], self.dayscale, self.yearscale, True)
-        gas = Luminary("gas", "models/gas-planet.png", "models/planet_sphere", 2 * self.orbitscale, 1.5 * self.sizescale, [asteroid], 300*self.dayscale, 3*self.yearscale, True)
-        ice = Luminary("ice", "models/ice.jpg", "models/planet_sphere", 1.4 * self.orbitscale, 3 * self.sizescale, None, 0.5*self.dayscale, 4*self.yearscale, True)
-        brown = Luminary("brown", "models/brown.jpg", "models/planet_sphere", 2.5 * self.orbitscale, 0.7 * self.sizescale, None, self.dayscale, 0.5*self.yearscale, True)
-        sun = Luminary("sun", "models/sun_1k_tex.jpg", "models/planet_sphere", 0, 3 * self.sizescale, [mercury, venus, mars, earth, gas, ice, brown], 20, None, True)
+        log = open(logPath, "a") if logPath else sys.stderr
+        self.quality = QualityGovernor(self.engine, self.runtime, self.eventHandler.material, targetFps, log=log)
+        self.quality.start()
 
-        sky = Luminary("sky", "models/stars_1k_tex.jpg", "models/solar_sky_sphere", 0, self.skySize, [sun], None, None, False)
 
-        self.runtime.addLuminary(render, sky)
+def parseArguments(argv=None):
 
+    """ Liest die Kommandozeilenparameter ein
+
+    :param argv: Liste der Parameter, ohne Angabe werden jene des Programmaufrufs verwendet
+    :return: die eingelesenen Parameter
+    """
 
-# Erstellt das Solarsystem und startet dieses
-w = SolarSystem()
-run()
+    parser = argparse.ArgumentParser(description="Simuliert ein Sonnensystem")
+    parser.add_argument("--script", help="Szenario, das abgespielt wird")
+    parser.add_argument("--stats", help="Datei, in die die Statistik des Szenarios geschrieben wird")
+    parser.add_argument("--fps", type=int, default=60, help="feste Bildrate waehrend des Szenarios")
+    parser.add_argument("--telemetry", type=int, metavar="PORT", help="Kennzahlen unter http://127.0.0.1:PORT/metrics anbieten")
+    parser.add_argument("--quality", type=float, metavar="FPS", help="Qualitaet anpassen, um diese Bildrate zu halten")
+    parser.add_argument("--quality-log", help="Datei, in die die Auswertungen der Qualitaetsanpassung geschrieben werden")
+    parser.add_argument("--asteroids", type=int, default=0, help="Anzahl der kuenstlichen Asteroiden")
+    parser.add_argument("--realistic", action="store_true", help="Umlaufbahnen im realistischen Massstab")
+    parser.add_argument("--headless", action="store_true", help="ohne Fenster in einen Offscreen-Puffer rendern")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parseArguments()
+    # Mipmaps fuer alle Texturen, damit ihre Aufloesung im Shader verringert werden kann
+    loadPrcFileData("", "texture-minfilter linear-mipmap-linear")
+    if args.headless:
+        loadPrcFileData("", "window-type offscreen")
+        loadPrcFileData("", "audio-library-name null")
+
+    # Erst nach der Konfiguration importieren, da DirectStart sofort das Fenster oeffnet
+    import direct.directbase.DirectStart
+
+    # Erstellt das Solarsystem und startet dieses
+    w = SolarSystem(Engine(base), args.asteroids, args.realistic)
+    if args.telemetry:
+        w.startTelemetry(args.telemetry)
+    if args.quality:
+        w.startQualityGovernor(args.quality, args.quality_log)
+    if args.script:
+        w.runScenario(args.script, args.stats, args.fps)
+    run()
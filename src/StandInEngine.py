@@ -0,0 +1,216 @@
+from panda3d.core import NodePath, ModelNode, PerspectiveLens, Texture
+from direct.task.Task import Task
+from collections import namedtuple
+import time
+
+#: Task, wie er an die Funktion eines Tasks uebergeben wird
+StandInTask = namedtuple("StandInTask", ["name", "time", "frame"])
+
+
+class StandInEngine(object):
+
+    """ Ersatz fuer die Engine, der weder DirectStart noch ein Fenster benoetigt. Damit laesst sich die Logik der
+    Simulation (z.B. der Aufbau der Hierarchie, die Geschwindigkeit, die Begrenzung der Kamera oder das Umschalten
+    von Licht und Textur) in Millisekunden pruefen und in Micro-Benchmarks messen (siehe Benchmark).
+
+    Szenengraph und Linse sind echte Objekte von Panda3D, Positionen und Hierarchie verhalten sich also wie in der
+    Simulation. Modelle und Texturen werden nicht geladen, der Loader liefert leere Knoten bzw. Texturen, und es
+    werden keine Texturen erzeugt oder in den Cache geschrieben. Der
+    Ersatz uebernimmt selbst die Rollen von Loader, Taskmanager und Uhr: Tasks laufen erst mit step, und die Uhr
+    schreitet pro Frame um genau 1/fps Sekunden fort. Tasks eigener Task-Chains laufen ohne Thread im selben
+    Frame wie alle anderen Tasks, dadurch bleibt der Ablauf reproduzierbar.
+
+    :ivar NodePath render: Gesamte Umgebung des Raumes
+    :ivar NodePath aspect2d: Ebene fuer Texte, wird nie dargestellt
+    :ivar NodePath camera: Knoten der Kamera
+    :ivar PerspectiveLens camLens: Linse der Kamera
+    :ivar win: immer None, es gibt kein Fenster
+    :ivar float renderScale: zuletzt gesetzter Anteil der Aufloesung, wirkt sich nicht aus
+    :ivar StandInEngine loader: der Ersatz selbst
+    :ivar textureFactory: immer None, kuenstliche Himmelskoerper bekommen keine erzeugten Texturen
+    :ivar StandInEngine taskMgr: der Ersatz selbst
+    :ivar StandInEngine clock: der Ersatz selbst
+    :ivar list tasks: registrierte Tasks als Liste von [sort, Nummer, Name, Funktion, Startzeit]
+    :ivar int taskCount: Anzahl der bisher registrierten Tasks, haelt die Reihenfolge bei gleichem sort
+    :ivar float fps: Bildrate der Uhr
+    :ivar int frame: Anzahl der ausgefuehrten Frames
+    :ivar float frameTime: Zeit der Uhr im aktuellen Frame
+    :ivar float startClock: echte Zeit beim Erstellen des Ersatzes
+    :ivar boolean exited: gibt an, ob das Programm beendet wurde
+
+    """
+
+    def __init__(self, fps=60):
+
+        """ Erstellt einen leeren Szenengraphen und eine angehaltene Uhr
+
+        :param fps: Bildrate der Uhr
+        """
+
+        self.render = NodePath("render")
+        self.aspect2d = NodePath("aspect2d")
+        self.camera = NodePath("camera")
+        self.camLens = PerspectiveLens()
+        self.win = None
+        self.renderScale = 1.0
+        self.loader = self
+        self.textureFactory = None
+        self.taskMgr = self
+        self.clock = self
+        self.tasks = []
+        self.taskCount = 0
+        self.fps = float(fps)
+        self.frame = 0
+        self.frameTime = 0.0
+        self.startClock = time.time()
+        self.exited = False
+
+    def setTitle(self, title):
+
+        """ Tut nichts, es gibt kein Fenster
+
+        :param title: Titel des Fensters
+        """
+
+    def setBackgroundColor(self, r, g, b):
+
+        """ Tut nichts, es wird nichts dargestellt
+
+        :param r: Rotanteil
+        :param g: Gruenanteil
+        :param b: Blauanteil
+        """
+
+    def setRenderScale(self, scale):
+
+        """ Merkt den Anteil der Aufloesung vor, es wird nichts gerendert
+
+        :param scale: Anteil der Fensteraufloesung pro Achse
+        """
+
+        self.renderScale = scale
+
+    def disableMouse(self):
+
+        """ Tut nichts, es gibt keine Maus
+
+        """
+
+    def exit(self):
+
+        """ Merkt vor, dass das Programm beendet wurde
+
+        """
+
+        self.exited = True
+
+    def loadModel(self, path):
+
+        """ Gibt einen leeren Knoten anstelle des Modells zurueck
+
+        :param path: Pfad zum Modell
+        :return: leerer Knoten mit dem Pfad als Namen
+        """
+
+        return NodePath(ModelNode(str(path)))
+
+    def loadTexture(self, path):
+
+        """ Gibt eine leere Textur zurueck
+
+        :param path: Pfad zur Textur
+        :return: leere Textur mit dem Pfad als Namen
+        """
+
+        return Texture(str(path))
+
+    def setupTaskChain(self, name, numThreads=None):
+
+        """ Tut nichts, Tasks aller Task-Chains laufen im Hauptthread
+
+        :param name: Name der Task-Chain
+        :param numThreads: Anzahl der Threads der Task-Chain
+        """
+
+    def add(self, function, name, sort=0, taskChain=None):
+
+        """ Registriert einen Task, der ab dem naechsten Frame ausgefuehrt wird
+
+        :param function: Funktion des Tasks
+        :param name: Name des Tasks
+        :param sort: Tasks mit kleinerem sort werden zuerst ausgefuehrt
+        :param taskChain: Name der Task-Chain, wird ignoriert
+        """
+
+        self.tasks.append([sort, self.taskCount, name, function, self.frameTime])
+        self.tasks.sort(key=lambda task: task[:2])
+        self.taskCount += 1
+
+    def remove(self, name):
+
+        """ Entfernt alle Tasks mit diesem Namen
+
+        :param name: Name des Tasks
+        """
+
+        self.tasks = [task for task in self.tasks if task[2] != name]
+
+    def step(self, frames=1):
+
+        """ Fuehrt Frames aus. In jedem Frame schreitet die Uhr fort und alle Tasks werden nach sort ausgefuehrt.
+        Tasks, die Task.done zurueckgeben, werden entfernt.
+
+        :param frames: Anzahl der Frames
+        """
+
+        for _ in range(frames):
+            self.frame += 1
+            self.frameTime += self.getDt()
+            for task in list(self.tasks):
+                if task not in self.tasks:
+                    continue
+                if task[3](StandInTask(task[2], self.frameTime - task[4], self.frame)) == Task.done:
+                    self.tasks.remove(task)
+
+    def getDt(self):
+
+        """ Gibt die Dauer eines Frames zurueck
+
+        :return: Dauer in Sekunden
+        """
+
+        return 1.0 / self.fps
+
+    def getFrameTime(self):
+
+        """ Gibt die Zeit der Uhr im aktuellen Frame zurueck
+
+        :return: Zeit in Sekunden
+        """
+
+        return self.frameTime
+
+    def getRealTime(self):
+
+        """ Gibt die echte Zeit seit dem Erstellen zurueck
+
+        :return: Zeit in Sekunden
+        """
+
+        return time.time() - self.startClock
+
+    def setMode(self, mode):
+
+        """ Tut nichts, die Uhr laeuft immer mit fester Bildrate (ClockObject.MForced)
+
+        :param mode: Modus der Uhr
+        """
+
+    def setFrameRate(self, fps):
+
+        """ Setzt die Bildrate der Uhr
+
+        :param fps: Bildrate
+        """
+
+        self.fps = float(fps)
@@ -0,0 +1,188 @@
+from panda3d.core import TexturePool
+from direct.task.Task import Task
+import json
+import threading
+import time
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+
+class Telemetry(object):
+
+    """ Stellt Kennzahlen der laufenden Simulation ueber einen lokalen HTTP-Endpunkt zur Verfuegung. Unter
+    "/metrics" werden sie im Textformat von Prometheus, unter "/metrics.json" als JSON ausgeliefert.
+
+    Die Kennzahlen werden im Task der Simulation gesammelt und als fertiges Dictionary abgelegt. Der Server laeuft
+    in einem eigenen Thread und liest nur dieses Dictionary, er greift also nie auf den Szenengraphen zu und
+    blockiert den Task nicht. Aufwendige Kennzahlen (Geometrien und Texturspeicher) werden nur alle interval
+    Sekunden neu berechnet. Die Zeit, die das Sammeln kostet, wird selbst als Kennzahl ausgegeben.
+
+    :ivar Engine engine: Dienste der Engine
+    :ivar RuntimeHandler runtime: beinhaltet alle Himmelskoerper
+    :ivar string host: Adresse, an die der Server gebunden wird
+    :ivar int port: Port des Servers
+    :ivar float interval: Abstand in Sekunden, in dem aufwendige Kennzahlen berechnet werden
+    :ivar dictionary metrics: die zuletzt gesammelten Kennzahlen
+    :ivar dictionary sceneMetrics: die zuletzt berechneten aufwendigen Kennzahlen
+    :ivar float lastSceneUpdate: Zeitpunkt, zu dem die aufwendigen Kennzahlen zuletzt berechnet wurden
+    :ivar float collectTotal: gesamte Zeit in Sekunden, die das Sammeln bisher gekostet hat
+    :ivar float lastClock: echte Zeit des letzten Frames, None vor dem ersten Frame
+    :ivar HTTPServer server: der laufende Server
+
+    """
+
+    #: Beschreibung und Typ der Kennzahlen fuer das Prometheus-Format
+    DESCRIPTIONS = {
+        "frame_time_seconds": ("Echte Dauer des letzten Frames", "gauge"),
+        "body_count": ("Anzahl der Himmelskoerper", "gauge"),
+        "scene_geoms": ("Anzahl der eingeblendeten Geometrien im Szenengraphen", "gauge"),
+        "texture_memory_bytes": ("Geschaetzter Speicher aller geladenen Texturen", "gauge"),
+        "speed_multiplier": ("Geschwindigkeit der Simulation", "gauge"),
+        "paused": ("1 wenn die Simulation angehalten ist", "gauge"),
+        "telemetry_collect_seconds": ("Dauer des letzten Sammelns der Kennzahlen", "gauge"),
+        "telemetry_collect_seconds_total": ("Gesamte Dauer des Sammelns der Kennzahlen", "counter"),
+    }
+
+    #: Praefix aller Kennzahlen
+    PREFIX = "solarsystem_"
+
+    def __init__(self, engine, runtime, port=9100, host="127.0.0.1", interval=1.0):
+
+        """ Initialisiert die Telemetrie, ohne den Server zu starten
+
+        :param engine: Dienste der Engine
+        :param runtime: beinhaltet alle Himmelskoerper
+        :param port: Port des Servers
+        :param host: Adresse, an die der Server gebunden wird
+        :param interval: Abstand in Sekunden, in dem aufwendige Kennzahlen berechnet werden
+        """
+
+        self.engine = engine
+        self.runtime = runtime
+        self.host = host
+        self.port = port
+        self.interval = interval
+        self.metrics = {}
+        self.sceneMetrics = {"scene_geoms": 0, "texture_memory_bytes": 0}
+        self.lastSceneUpdate = None
+        self.collectTotal = 0.0
+        self.lastClock = None
+        self.server = None
+
+    def start(self):
+
+        """ Startet den Server in einem eigenen Thread und das Sammeln der Kennzahlen in jedem Frame
+
+        """
+
+        telemetry = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body = telemetry.toPrometheus()
+                    contentType = "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body = json.dumps(telemetry.metrics, sort_keys=True)
+                    contentType = "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                body = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", contentType)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = HTTPServer((self.host, self.port), Handler)
+        thread = threading.Thread(target=self.server.serve_forever, name="telemetry")
+        thread.daemon = True
+        thread.start()
+
+        self.engine.taskMgr.add(self.collect, "telemetry-task", sort=50)
+
+    def stop(self):
+
+        """ Beendet den Server und das Sammeln der Kennzahlen
+
+        """
+
+        self.engine.taskMgr.remove("telemetry-task")
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def collect(self, task):
+
+        """ Sammelt die Kennzahlen des aktuellen Frames. Das Dictionary wird jedes Mal neu erstellt und erst dann
+        ersetzt, damit der Server nie ein halb befuelltes Dictionary liest.
+
+        :param task: Gibt an, welche Funktion diese Methode uebernehmen soll
+        """
+
+        start = time.time()
+        if self.lastSceneUpdate is None or task.time - self.lastSceneUpdate >= self.interval:
+            self.sceneMetrics = self.collectSceneMetrics()
+            self.lastSceneUpdate = task.time
+
+        # Echte Zeit statt getDt, da die Uhr waehrend eines Szenarios mit fester Bildrate laeuft
+        now = self.engine.clock.getRealTime()
+        frameTime = now - self.lastClock if self.lastClock is not None else 0.0
+        self.lastClock = now
+
+        metrics = {
+            "frame_time_seconds": frameTime,
+            "body_count": len(self.runtime.getAllLuminaries()),
+            "speed_multiplier": self.runtime.getPlayRate(),
+            "paused": 0 if self.runtime.isPlaying() else 1,
+        }
+        metrics.update(self.sceneMetrics)
+
+        elapsed = time.time() - start
+        self.collectTotal += elapsed
+        metrics["telemetry_collect_seconds"] = elapsed
+        metrics["telemetry_collect_seconds_total"] = self.collectTotal
+        self.metrics = metrics
+        return Task.cont
+
+    def collectSceneMetrics(self):
+
+        """ Berechnet die aufwendigen Kennzahlen, fuer die der Szenengraph und alle Texturen durchsucht werden
+
+        :return: Dictionary mit der Anzahl der eingeblendeten Geometrien und dem Texturspeicher
+        """
+
+        # Ausgeblendete Himmelskoerper (z.B. durch den QualityGovernor) werden nicht gezeichnet
+        geomNodes = self.engine.render.findAllMatches("**/+GeomNode")
+        geoms = sum(geomNodes.getPath(i).node().getNumGeoms() for i in range(geomNodes.getNumPaths())
+                    if not geomNodes.getPath(i).isHidden())
+
+        textures = TexturePool.findAllTextures()
+        textureMemory = sum(textures.getTexture(i).estimateTextureMemory() for i in range(textures.getNumTextures()))
+
+        return {"scene_geoms": geoms, "texture_memory_bytes": textureMemory}
+
+    def toPrometheus(self):
+
+        """ Gibt die zuletzt gesammelten Kennzahlen im Textformat von Prometheus zurueck
+
+        :return: die Kennzahlen als Text
+        """
+
+        metrics = self.metrics
+        lines = []
+        for name in sorted(metrics):
+            description, metricType = self.DESCRIPTIONS[name]
+            lines.append("# HELP %s%s %s" % (self.PREFIX, name, description))
+            lines.append("# TYPE %s%s %s" % (self.PREFIX, name, metricType))
+            lines.append("%s%s %s" % (self.PREFIX, name, repr(float(metrics[name]))))
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,192 @@
+from panda3d.core import PNMImage, Texture, TexturePool, SamplerState, Filename, LVecBase4f
+from math import ceil, sqrt
+import json
+import os
+
+
+class TextureAtlas(object):
+
+    """ Packt die Texturen vieler kleiner Himmelskoerper in eine gemeinsame Textur. Jeder Himmelskoerper bekommt
+    einen Bereich der Textur, der im Shader als Verschiebung und Skalierung der Texturkoordinaten angewendet wird.
+    Dadurch muss fuer beliebig viele Himmelskoerper nur eine Textur gebunden werden.
+
+    Auf Mipmap-Stufe n umfasst ein Texel 2^n Pixel. Damit benachbarte Felder auch auf der kleinsten verwendeten
+    Stufe nicht ineinander laufen, ist der Rand 2^maxMipLevel Pixel breit und die Textur wird nie unter diese Stufe
+    verkleinert, auch nicht durch eine Verschiebung der Stufe im Shader.
+
+    Der fertige Atlas kann mit save komprimiert (DXT1) samt seinen Bereichen abgelegt und mit load wieder geladen
+    werden, ohne die Bilder erneut zu erzeugen.
+
+    :ivar int cellSize: Groesse eines Feldes der Textur in Pixel
+    :ivar int maxMipLevel: kleinste Mipmap-Stufe, die verwendet wird
+    :ivar int padding: Rand eines Feldes in Pixel, der ein Ueberlaufen benachbarter Felder verhindert
+    :ivar list images: Liste der Namen und Bilder, die gepackt werden
+    :ivar dictionary regions: Bereiche der Felder (u, v, Breite, Hoehe) zu jedem Namen
+    :ivar Texture texture: die gepackte Textur, None solange sie nicht erstellt wurde
+
+    """
+
+    def __init__(self, cellSize=128, maxMipLevel=3):
+
+        """ Initialisiert einen leeren Atlas
+
+        :param cellSize: Groesse eines Feldes der Textur in Pixel, muss ein Vielfaches von 2^maxMipLevel sein
+        :param maxMipLevel: kleinste Mipmap-Stufe, die verwendet wird
+        """
+
+        self.cellSize = cellSize
+        self.maxMipLevel = maxMipLevel
+        self.padding = 2 ** maxMipLevel
+        self.images = []
+        self.regions = {}
+        self.texture = None
+
+    def addImage(self, name, source):
+
+        """ Fuegt ein Bild zum Atlas hinzu. Das Bild wird erst beim Erstellen des Atlas gepackt.
+
+        :param name: Name, unter dem der Bereich abgefragt wird
+        :param source: Pfad zum Bild, ein PNMImage oder eine Texture
+        """
+
+        if isinstance(source, PNMImage):
+            image = source
+        elif isinstance(source, Texture):
+            image = PNMImage()
+            source.store(image)
+        else:
+            image = PNMImage(Filename(source))
+        self.images.append((name, image))
+        self.texture = None
+
+    def build(self):
+
+        """ Packt alle Bilder in einem Raster in die gemeinsame Textur. Die Seitenlaenge wird auf eine Zweierpotenz
+        aufgerundet. Jedes Feld wird zuerst vollstaendig mit dem skalierten Bild gefuellt und danach das Bild
+        innerhalb des Randes eingefuegt, damit der Rand die Farben des Bildes hat.
+
+        :return: die gepackte Textur
+        """
+
+        columns = max(1, int(ceil(sqrt(len(self.images)))))
+        size = 1
+        while size < columns * self.cellSize:
+            size *= 2
+        inner = self.cellSize - 2 * self.padding
+
+        atlas = PNMImage(size, size, 3)
+        cell = PNMImage(self.cellSize, self.cellSize, 3)
+        content = PNMImage(inner, inner, 3)
+        self.regions = {}
+        for index, (name, image) in enumerate(self.images):
+            x = (index % columns) * self.cellSize
+            y = (index // columns) * self.cellSize
+            cell.quickFilterFrom(image)
+            content.quickFilterFrom(image)
+            atlas.copySubImage(cell, x, y)
+            atlas.copySubImage(content, x + self.padding, y + self.padding)
+
+            # PNMImage zaehlt die Zeilen von oben, Texturkoordinaten von unten
+            self.regions[name] = LVecBase4f(float(x + self.padding) / size,
+                                            1.0 - float(y + self.padding + inner) / size,
+                                            float(inner) / size,
+                                            float(inner) / size)
+
+        self.texture = Texture("atlas")
+        self.texture.load(atlas)
+        self.setSampler()
+        return self.texture
+
+    def setSampler(self):
+
+        """ Setzt die Filter der Textur und begrenzt die Mipmap-Stufen auf maxMipLevel. Die Stufen lassen sich nur
+        ueber einen SamplerState begrenzen, der Standard-Sampler der Textur ist unveraenderlich und wird ersetzt.
+
+        """
+
+        sampler = SamplerState()
+        sampler.setWrapU(SamplerState.WMClamp)
+        sampler.setWrapV(SamplerState.WMClamp)
+        sampler.setMinfilter(SamplerState.FTLinearMipmapLinear)
+        sampler.setMagfilter(SamplerState.FTLinear)
+        sampler.setMaxLod(self.maxMipLevel)
+        self.texture.setDefaultSampler(sampler)
+
+    def save(self, path):
+
+        """ Komprimiert den Atlas einschliesslich der Mipmaps und legt ihn als .txo-Datei ab. Die Bereiche werden
+        daneben als JSON-Datei abgelegt. Die komprimierte Textur wird auch selbst weiterverwendet. Ohne
+        Kompressionsbibliothek wird der Atlas unkomprimiert abgelegt.
+
+        :param path: Pfad zur .txo-Datei
+        """
+
+        texture = self.getTexture()
+        texture.generateRamMipmapImages()
+        texture.compressRamImage(Texture.CMDxt1)
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        texture.write(Filename.fromOsSpecific(path))
+        with open(self.getRegionPath(path), "w") as output:
+            json.dump(dict((name, list(region)) for name, region in self.regions.items()), output, sort_keys=True)
+
+    def load(self, path):
+
+        """ Ladet einen mit save abgelegten Atlas
+
+        :param path: Pfad zur .txo-Datei
+        :return: True, wenn der Atlas geladen wurde, False wenn er nicht abgelegt ist
+        """
+
+        if not os.path.exists(path) or not os.path.exists(self.getRegionPath(path)):
+            return False
+        with open(self.getRegionPath(path)) as regions:
+            self.regions = dict((name, LVecBase4f(*region)) for name, region in json.load(regions).items())
+        self.images = []
+        self.texture = TexturePool.loadTexture(Filename.fromOsSpecific(path))
+        self.setSampler()
+        return True
+
+    def getRegionPath(self, path):
+
+        """ Gibt den Pfad der Bereiche zu einem abgelegten Atlas zurueck
+
+        :param path: Pfad zur .txo-Datei
+        :return: Pfad zur JSON-Datei
+        """
+
+        return os.path.splitext(path)[0] + ".json"
+
+    def hasRegion(self, name):
+
+        """ Ueberprueft, ob ein Bild mit diesem Namen im Atlas liegt
+
+        :param name: Name des Bildes
+        :return: True, wenn das Bild hinzugefuegt wurde
+        """
+
+        return name in self.regions or any(imageName == name for imageName, image in self.images)
+
+    def getTexture(self):
+
+        """ Gibt die gepackte Textur zurueck und erstellt sie, falls seit dem letzten Hinzufuegen noetig
+
+        :return: die gepackte Textur
+        """
+
+        if self.texture is None:
+            self.build()
+        return self.texture
+
+    def getRegion(self, name):
+
+        """ Gibt den Bereich eines Bildes im Atlas zurueck
+
+        :param name: Name des Bildes
+        :return: Verschiebung (u, v) und Groesse (Breite, Hoehe) des Bereichs in Texturkoordinaten
+        """
+
+        self.getTexture()
+        return self.regions[name]
@@ -0,0 +1,29 @@
+#version 120
+
+// Gemeinsamer Fragment-Shader aller Himmelskoerper. Licht und Textur werden
+// ausschliesslich ueber Shader-Inputs gesteuert.
+
+uniform sampler2D p3d_Texture0;
+
+uniform float lightMode;  // 1 = Punktlicht, 0 = Umgebungslicht
+uniform float textureOn;  // 1 = Textur, 0 = einfarbig
+uniform float textureBias;  // Verschiebung der Mipmap-Stufe (Texturaufloesung)
+uniform float emission;   // Eigenleuchten (Sonne)
+uniform float ambient;    // Staerke des Umgebungslichts
+uniform vec3 lightPos;    // Position der Punktlichtquelle
+uniform float logDepthCoef;  // 2 / log2(far + 1) fuer die logarithmische Tiefe
+
+varying vec3 worldPos;
+varying vec3 worldNormal;
+varying vec2 texcoord;
+varying float logDepth;
+
+void main() {
+    vec4 color = mix(vec4(1.0), texture2D(p3d_Texture0, texcoord, textureBias), textureOn);
+    vec3 toLight = normalize(lightPos - worldPos);
+    float diffuse = max(dot(normalize(worldNormal), toLight), 0.0);
+    float light = emission + mix(ambient, diffuse, lightMode);
+    gl_FragColor = vec4(color.rgb * min(light, 1.0), color.a);
+    // Logarithmische Tiefe, damit nahe und sehr weit entfernte Himmelskoerper gleichzeitig genau sortiert werden
+    gl_FragDepth = log2(logDepth) * logDepthCoef * 0.5;
+}
@@ -0,0 +1,24 @@
+#version 120
+
+// Gemeinsamer Vertex-Shader aller Himmelskoerper
+
+uniform mat4 p3d_ModelViewProjectionMatrix;
+uniform mat4 trans_model_to_world;
+uniform vec4 atlasRegion;  // Verschiebung (xy) und Groesse (zw) des Bereichs im Texturatlas
+
+attribute vec4 p3d_Vertex;
+attribute vec3 p3d_Normal;
+attribute vec2 p3d_MultiTexCoord0;
+
+varying vec3 worldPos;
+varying vec3 worldNormal;
+varying vec2 texcoord;
+varying float logDepth;
+
+void main() {
+    gl_Position = p3d_ModelViewProjectionMatrix * p3d_Vertex;
+    logDepth = 1.0 + gl_Position.w;
+    worldPos = (trans_model_to_world * p3d_Vertex).xyz;
+    worldNormal = mat3(trans_model_to_world) * p3d_Normal;
+    texcoord = atlasRegion.xy + p3d_MultiTexCoord0 * atlasRegion.zw;
+}
@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+# Die Module liegen flach in src und importieren sich gegenseitig ueber ihren Dateinamen
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+
+@pytest.fixture
+def system():
+
+    """ Baut das Solarsystem mit einer StandInEngine ohne Fenster auf
+
+    :return: das Solarsystem
+    """
+
+    pytest.importorskip("panda3d")
+    from SolarSystem import SolarSystem
+    from StandInEngine import StandInEngine
+
+    return SolarSystem(StandInEngine())
@@ -0,0 +1,50 @@
+import csv
+
+import numpy as np
+import pytest
+
+pytest.importorskip("panda3d")
+
+from EphemerisExport import EphemerisExport
+
+
+def testSampleCountIncludesEnd():
+    export = EphemerisExport(workers=1)
+    assert export.getSampleCount(0, 1, 0.25) == 5
+    assert export.getSampleCount(0, 0.3, 0.1) == 4
+    assert export.getSampleCount(2, 2, 1) == 1
+    with pytest.raises(ValueError):
+        export.getSampleCount(0, 1, 0)
+    with pytest.raises(ValueError):
+        export.getSampleCount(1, 0, 0.25)
+
+
+def testParallelExportMatchesSerialExportInOrder(tmp_path):
+    start, end, step = 0.0, 2.0, 0.05
+    serial = EphemerisExport(workers=1, chunkSize=7, reportInterval=1e9)
+    parallel = EphemerisExport(workers=2, chunkSize=7, window=1, reportInterval=1e9)
+    total = serial.getSampleCount(start, end, step)
+    assert total > serial.chunkSize
+
+    assert serial.export(str(tmp_path / "serial.npy"), start, end, step) == total
+    assert parallel.export(str(tmp_path / "parallel.npy"), start, end, step) == total
+
+    expected = np.load(str(tmp_path / "serial.npy"))
+    actual = np.load(str(tmp_path / "parallel.npy"))
+    assert actual.dtype == expected.dtype
+    assert len(actual) == total
+    np.testing.assert_array_equal(actual, expected)
+    np.testing.assert_array_equal(actual["time"], start + step * np.arange(total))
+    assert actual["time"][-1] == pytest.approx(end)
+
+
+def testCsvHasOneRowPerSampleAndBody(tmp_path):
+    export = EphemerisExport(workers=1, chunkSize=3, reportInterval=1e9)
+    path = str(tmp_path / "ephemeris.csv")
+    samples = export.export(path, 0, 1, 0.25)
+
+    with open(path) as source:
+        rows = list(csv.reader(source))
+    assert rows[0] == ["time", "body", "x", "y", "z"]
+    assert len(rows) - 1 == len(export.ephemeris.names) * samples
+    assert [row[1] for row in rows[1:len(export.ephemeris.names) + 1]] == export.ephemeris.names
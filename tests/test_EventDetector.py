@@ -0,0 +1,98 @@
+import numpy as np
+
+from Ephemeris import Ephemeris
+from EventDetector import EventDetector
+
+
+def createEphemeris(asteroids=0):
+
+    """ Baut eine kleine Hierarchie mit Sonne, zwei Planeten, einem Mond und optional Asteroiden auf
+
+    :return: Ephemeride und Radien der Himmelskoerper
+    """
+
+    ephemeris = Ephemeris()
+    radii = [80, 1.8, 0.6, 0.06, 0.3]
+    ephemeris.addBody("sky", None, 0, 0, 0)
+    ephemeris.addBody("sun", "sky", 0, 0, 20)
+    ephemeris.addBody("earth", "sun", 10, 60, 1, eccentricity=0.017, meanAnomaly=10)
+    ephemeris.addBody("moon", "earth", 1, 4.5, 4.5, eccentricity=0.055, inclination=5.1)
+    ephemeris.addBody("mars", "sun", 15.2, 113, 1, eccentricity=0.093, inclination=1.85, meanAnomaly=19.4)
+    rnd = np.random.RandomState(0)
+    for i in range(asteroids):
+        distance = rnd.uniform(1.7, 1.9)
+        ephemeris.addBody("belt-%d" % i, "sun", distance * 10, distance ** 1.5 * 60, 1,
+                          eccentricity=rnd.uniform(0, 0.2), inclination=rnd.uniform(0, 10),
+                          node=rnd.uniform(0, 360), periapsis=rnd.uniform(0, 360), meanAnomaly=rnd.uniform(0, 360))
+        radii.append(0.03)
+    return ephemeris, radii
+
+
+def testBodyPositionsMatchFullHierarchy():
+    ephemeris, radii = createEphemeris(5)
+    times = np.linspace(0, 100, 11)
+    positions = ephemeris.getPositions(times)
+    for body in range(len(ephemeris)):
+        np.testing.assert_allclose(ephemeris.getBodyPositions(times, body), positions[:, body], atol=1e-9)
+
+
+def testMinimizeRefinesAllIntervalsTogether():
+    ephemeris, radii = createEphemeris()
+    detector = EventDetector(ephemeris, radii)
+    centers = np.array([0.3, 1.7, -2.0])
+    calls = []
+
+    def function(t):
+        calls.append(t.shape)
+        return (t - centers) ** 2 + centers
+
+    t, value = detector.minimize(function, centers - 1, centers + 0.5)
+    np.testing.assert_allclose(t, centers, atol=1e-9)
+    np.testing.assert_allclose(value, centers, atol=1e-12)
+    assert set(calls) == {(3,)}
+
+
+def testCloseApproachMatchesDenseSampling():
+    ephemeris, radii = createEphemeris()
+    detector = EventDetector(ephemeris, radii)
+    events = detector.findCloseApproaches(0, 120, 8.0)
+    assert events
+    for event in events:
+        first, second = (ephemeris.index[name] for name in event.bodies)
+        times = np.linspace(event.time - 0.5, event.time + 0.5, 20001)
+        positions = ephemeris.getPositions(times)
+        distances = np.linalg.norm(positions[:, first] - positions[:, second], axis=-1)
+        assert abs(times[np.argmin(distances)] - event.time) < 1e-3
+        assert abs(distances.min() - event.value) < 1e-6
+
+
+def testEclipseBeginsAtShadowBoundary():
+    ephemeris, radii = createEphemeris()
+    detector = EventDetector(ephemeris, radii)
+    eclipses = detector.findEclipses(0, 30, "sun")
+    # Zu Beginn der Suche liegt der Mond bereits im Schatten
+    assert eclipses[0].time == 0
+    eclipses = eclipses[1:]
+    assert eclipses
+    for event in eclipses:
+        assert event.bodies == ("earth", "moon")
+        assert 0 < event.value < 4.5
+        before, after = event.time - 1e-6, event.time + 1e-6
+        positions = ephemeris.getPositions(np.array([before, after]))
+        sun, earth, moon = positions[:, 1], positions[:, 2], positions[:, 3]
+        distance = detector.getShadowDistance(sun, earth, moon, radii[2])
+        assert distance[0] > 0 > distance[1]
+
+
+def testSearchReportsOnlyLaterEventsAfterEachWindow():
+    ephemeris, radii = createEphemeris(20)
+    detector = EventDetector(ephemeris, radii, windowSize=16)
+    found = []
+    searched = 0
+    for events, until in detector.searchEvents(0, 60, "sun", 1.0, 2.0):
+        assert all(event.time >= searched for event in events)
+        assert until >= searched
+        searched = until
+        found += events
+    assert searched == 60
+    assert sorted(found) == sorted(detector.findEvents(0, 60, "sun", 1.0, 2.0))
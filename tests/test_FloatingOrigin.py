@@ -0,0 +1,39 @@
+import numpy as np
+
+from FloatingOrigin import FloatingOrigin
+
+
+def testRecenterKeepsOriginWithinThreshold():
+    origin = FloatingOrigin(10)
+    shifts = []
+    origin.addListener(shifts.append)
+
+    assert not origin.recenter(6, 8, 0)
+    assert origin.recenter(6, 8, 0.1)
+    np.testing.assert_allclose(origin.origin, (6, 8, 0.1))
+    np.testing.assert_allclose(shifts[0], (6, 8, 0.1))
+
+
+def testSceneAndWorldPositionsAreInverse():
+    origin = FloatingOrigin(10)
+    origin.shift(np.array([1e9, -2e9, 3.5]))
+
+    position = origin.toWorld(0.25, 0.5, -0.75)
+    np.testing.assert_allclose(origin.toScene(position), (0.25, 0.5, -0.75))
+    assert position[0] == 1e9 + 0.25
+
+
+def testCameraRebasesOriginWhileFlying(system):
+    engine = system.engine
+    threshold = system.catalog.originThreshold
+    assert threshold < system.catalog.skySize
+
+    system.camera.setMove("forward", 1)
+    for _ in range(120):
+        engine.step()
+        camera = engine.camera.getPos()
+        assert np.linalg.norm(tuple(camera)) <= threshold + system.camera.speed * engine.getDt()
+
+    assert np.linalg.norm(system.origin.origin) > 0
+    world = system.origin.toWorld(*engine.camera.getPos())
+    assert np.linalg.norm(world) <= system.catalog.skySize
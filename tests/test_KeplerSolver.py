@@ -0,0 +1,117 @@
+import time
+
+import numpy as np
+
+from KeplerSolver import KeplerSolver
+
+
+def solveReference(mean, eccentricity, iterations=200):
+
+    """ Loest die Kepler-Gleichung langsam, aber sicher mit dem Bisektionsverfahren
+
+    :param mean: mittlere Anomalien im Bogenmass
+    :param eccentricity: Exzentrizitaeten zwischen 0 und 1
+    :param iterations: Anzahl der Halbierungen
+    :return: exzentrische Anomalien im Bereich von -pi bis pi
+    """
+
+    solver = KeplerSolver()
+    mean = solver.normalize(np.asarray(mean, dtype=np.float64))
+    eccentricity = np.broadcast_to(np.asarray(eccentricity, dtype=np.float64), mean.shape)
+    # E - M = e * sin(E) liegt immer zwischen -e und e
+    low, high = mean - eccentricity, mean + eccentricity
+    for _ in range(iterations):
+        middle = 0.5 * (low + high)
+        below = middle - eccentricity * np.sin(middle) < mean
+        low = np.where(below, middle, low)
+        high = np.where(below, high, middle)
+    return solver.normalize(0.5 * (low + high))
+
+
+def getError(eccentric, mean, eccentricity):
+
+    """ Vergleicht eine Loesung mit dem Referenzverfahren
+
+    :param eccentric: zu pruefende exzentrische Anomalien
+    :param mean: mittlere Anomalien im Bogenmass
+    :param eccentricity: Exzentrizitaeten zwischen 0 und 1
+    :return: groesste Abweichung der exzentrischen Anomalie
+    """
+
+    solver = KeplerSolver()
+    return np.max(np.abs(solver.normalize(eccentric - solveReference(mean, eccentricity))))
+
+
+def getFrames(count=600, bodies=200, maxEccentricity=0.2, fps=60, seed=0):
+
+    """ Erzeugt mittlere Anomalien fuer aufeinanderfolgende Frames wie im Katalog, vom Mond (4.5 s pro Umlauf) bis
+    zu den aeusseren Planeten
+
+    :return: Exzentrizitaeten und Liste der mittleren Anomalien pro Frame
+    """
+
+    rnd = np.random.RandomState(seed)
+    eccentricity = rnd.uniform(0, maxEccentricity, bodies)
+    start = rnd.uniform(-np.pi, np.pi, bodies)
+    periods = rnd.uniform(4.5, 240, bodies)
+    return eccentricity, [start + 2 * np.pi * frame / float(fps) / periods for frame in range(count)]
+
+
+def testColdStartMatchesReference():
+    mean, eccentricity = np.meshgrid(np.linspace(-np.pi, np.pi, 241), np.linspace(0, 0.99, 100, endpoint=False))
+    solver = KeplerSolver()
+    assert getError(solver.solve(mean, eccentricity), mean, eccentricity) < 1e-9
+
+
+def testHighEccentricityNearPi():
+    edge = np.pi - np.array([0, 1e-12, 1e-9, 1e-6, 1e-3, 0.1])
+    mean, eccentricity = np.meshgrid(np.concatenate([edge, -edge, edge + 2 * np.pi]), np.linspace(0.8, 0.99, 20))
+    solver = KeplerSolver()
+    eccentric = solver.solve(mean, eccentricity)
+    assert getError(eccentric, mean, eccentricity) < 1e-9
+    assert np.all(np.abs(eccentric) <= np.pi)
+
+
+def testWarmStartMatchesReference():
+    eccentricity, frames = getFrames(count=120, maxEccentricity=0.99)
+    solver = KeplerSolver()
+    for mean in frames:
+        eccentric = solver.solve(mean, eccentricity, warmStart=True)
+    assert getError(eccentric, frames[-1], eccentricity) < 1e-9
+
+
+def testWarmStartNeedsAtMostTwoIterationsPerFrame():
+    eccentricity, frames = getFrames(maxEccentricity=0.7)
+    solver = KeplerSolver()
+    solver.solve(frames[0], eccentricity, warmStart=True)
+    iterations = []
+    for mean in frames[1:]:
+        solver.solve(mean, eccentricity, warmStart=True)
+        iterations.append(solver.iterations)
+    assert max(iterations) <= 2
+
+
+def testWarmStartFallsBackAfterJump():
+    eccentricity, frames = getFrames(count=2)
+    solver = KeplerSolver()
+    solver.solve(frames[0], eccentricity, warmStart=True)
+    jumped = frames[1] + 2.0
+    assert getError(solver.solve(jumped, eccentricity, warmStart=True), jumped, eccentricity) < 1e-9
+
+
+def testWarmStartIsFasterThanColdStart():
+    eccentricity, frames = getFrames(count=300, bodies=1000, maxEccentricity=0.99)
+
+    def run(warmStart):
+        solver = KeplerSolver()
+        start = time.perf_counter()
+        iterations = 0
+        for mean in frames:
+            solver.solve(mean, eccentricity, warmStart)
+            iterations += solver.iterations
+        return time.perf_counter() - start, iterations
+
+    cold = min(run(False) for _ in range(3))
+    warm = min(run(True) for _ in range(3))
+    assert warm[1] < cold[1] / 2
+    assert warm[0] < cold[0]
@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+
+def testAddLuminaryBuildsSceneAndEphemeris(system):
+    runtime = system.runtime
+    luminaries = runtime.getAllLuminaries()
+    assert len(luminaries) == len(runtime.ephemeris)
+    for name, luminary in luminaries.items():
+        assert luminary.model is not None
+        assert runtime.rootList[name].getParent() == system.engine.render
+
+    ephemeris = runtime.ephemeris
+    parents = ephemeris.getArrays()["parents"]
+    assert parents[ephemeris.index["moon"]] == ephemeris.index["earth"]
+    assert parents[ephemeris.index["earth"]] == ephemeris.index["sun"]
+    assert parents[ephemeris.index["sky"]] == -1
+
+
+def testAddLuminaryWithoutRenderLoadsNoModels(system):
+    from FloatingOrigin import FloatingOrigin
+    from RuntimeHandler import RuntimeHandler
+
+    runtime = RuntimeHandler(FloatingOrigin())
+    runtime.addLuminary(None, system.catalog.createLuminaries())
+    assert len(runtime.ephemeris) == len(system.runtime.ephemeris)
+    assert all(luminary.model is None for luminary in runtime.getAllLuminaries().values())
+    assert not runtime.rootList
+
+
+def testAsteroidBeltUsesNoGeneratedTextures(tmp_path, monkeypatch):
+    pytest.importorskip("panda3d")
+    from SolarSystem import SolarSystem
+    from StandInEngine import StandInEngine
+
+    # Tastenbelegung und Shader werden unabhaengig vom Arbeitsverzeichnis gefunden
+    monkeypatch.chdir(tmp_path)
+    system = SolarSystem(StandInEngine(), 16)
+    belt = [luminary for name, luminary in system.runtime.getAllLuminaries().items() if name.startswith("belt-")]
+    assert len(belt) == 16
+    assert all(luminary.atlas is None for luminary in belt)
+    assert not list(tmp_path.iterdir())
+
+
+def testEditSpeedPlayingSkipsZero(system):
+    runtime = system.runtime
+    assert runtime.getPlayRate() == 1
+
+    runtime.editSpeedPlaying(1)
+    assert runtime.getPlayRate() == 2
+    runtime.editSpeedPlaying(-1)
+    runtime.editSpeedPlaying(-1)
+    assert runtime.getPlayRate() == -1
+    assert runtime.isPlaying()
+
+    time = runtime.time
+    system.engine.step(6)
+    assert runtime.time == pytest.approx(time - 6 * system.engine.getDt())
+
+
+def testCheckAreaKeepsCameraInsideSky(system):
+    camera = system.camera
+    engine = system.engine
+    engine.camera.setPos(*system.origin.toScene((1, 2, 3)))
+    camera.checkArea(camera.size)
+    inside = tuple(engine.camera.getPos())
+
+    engine.camera.setPos(*system.origin.toScene((camera.size + 1, 0, 0)))
+    camera.checkArea(camera.size)
+    np.testing.assert_allclose(tuple(engine.camera.getPos()), inside, atol=1e-5)
+
+
+def testTogglePlayingPausesAndResumes(system):
+    runtime = system.runtime
+    runtime.togglePlaying()
+    assert not runtime.isPlaying()
+    time = runtime.time
+    system.engine.step(3)
+    assert runtime.time == time
+
+    runtime.togglePlaying()
+    system.engine.step(3)
+    assert runtime.time > time
+
+
+def testTogglePlayingAfterRestartStartsAtNormalSpeed(system):
+    runtime = system.runtime
+    runtime.restartSimulation()
+    assert runtime.getPlayRate() == 0 and runtime.time == 0
+    runtime.togglePlaying()
+    assert runtime.getPlayRate() == 1 and runtime.isPlaying()
+
+
+def testToggleTextureAndLightSwitchShaderInputs(system):
+    eventHandler = system.eventHandler
+    material = eventHandler.material
+
+    eventHandler.toggleTexture()
+    assert material.textureOn[0] == 0
+    eventHandler.toggleTexture()
+    assert material.textureOn[0] == 1
+
+    eventHandler.toggleLight()
+    assert material.lightMode[0] == 0
+    assert material.sunEmission[0] == pytest.approx(material.ambient)
+    eventHandler.toggleLight()
+    assert material.lightMode[0] == 1
+    assert material.sunEmission[0] == 1
@@ -0,0 +1,76 @@
+import os
+
+import pytest
+
+pytest.importorskip("panda3d")
+
+from panda3d.core import PNMImage
+
+from ProceduralTexture import ProceduralTexture
+from TextureAtlas import TextureAtlas
+
+
+def createAtlas(count=5, cellSize=32, maxMipLevel=2):
+
+    """ Erzeugt einen Atlas aus einfarbigen Bildern
+
+    :param count: Anzahl der Bilder
+    :param cellSize: Seitenlaenge der Felder
+    :param maxMipLevel: hoechste verwendete Mipmap-Stufe
+    :return: der gepackte Atlas
+    """
+
+    atlas = TextureAtlas(cellSize, maxMipLevel)
+    for index in range(count):
+        image = PNMImage(16, 16, 3)
+        image.fill(index / float(count), 0.5, 1.0 - index / float(count))
+        atlas.addImage("image%d" % index, image)
+    atlas.build()
+    return atlas
+
+
+def testRegionsLieWithinTextureAndDoNotOverlap():
+    atlas = createAtlas()
+    regions = [tuple(atlas.getRegion("image%d" % index)) for index in range(5)]
+
+    for u, v, width, height in regions:
+        assert 0.0 <= u and u + width <= 1.0
+        assert 0.0 <= v and v + height <= 1.0
+    for index, (u, v, width, height) in enumerate(regions):
+        for otherU, otherV, otherWidth, otherHeight in regions[index + 1:]:
+            assert u + width <= otherU or otherU + otherWidth <= u or \
+                v + height <= otherV or otherV + otherHeight <= v
+
+
+def testSamplerLimitsMipLevel():
+    atlas = createAtlas(maxMipLevel=2)
+    assert atlas.getTexture().getDefaultSampler().getMaxLod() == 2
+
+
+def testSavedAtlasLoadsSameRegions(tmp_path):
+    atlas = createAtlas()
+    path = str(tmp_path / "atlas.txo")
+    atlas.save(path)
+
+    loaded = TextureAtlas(atlas.cellSize, atlas.maxMipLevel)
+    assert loaded.load(path)
+    assert sorted(loaded.regions) == sorted(atlas.regions)
+    for name, region in atlas.regions.items():
+        assert tuple(loaded.getRegion(name)) == pytest.approx(tuple(region))
+    assert loaded.getTexture().getDefaultSampler().getMaxLod() == atlas.maxMipLevel
+
+
+def testProceduralAtlasIsLoadedFromCache(tmp_path):
+    variants = [("grey", 1, (0.2, 0.2, 0.2), (0.6, 0.6, 0.6), 0.25),
+                ("brown", 2, (0.3, 0.2, 0.1), (0.7, 0.5, 0.3), 0.5)]
+    factory = ProceduralTexture(cacheDir=str(tmp_path), size=16)
+
+    generated = factory.getAtlas("belt", variants)
+    assert len(generated.images) == 2
+    assert any(fileName.endswith(".txo") for fileName in os.listdir(str(tmp_path)))
+
+    cached = ProceduralTexture(cacheDir=str(tmp_path), size=16).getAtlas("belt", variants)
+    assert cached.images == []
+    assert sorted(cached.regions) == sorted(generated.regions)
+    for name, region in generated.regions.items():
+        assert tuple(cached.getRegion(name)) == pytest.approx(tuple(region))